@@ -8,9 +8,8 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
 import os
-from database import get_db, User
+from database import ReadSessionLocal, User
 
 # Security configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production-use-env-variable")
@@ -66,12 +65,17 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
             detail="Invalid authentication credentials"
         )
 
-def get_current_user(
-    token_data: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
-):
-    """Get current authenticated user"""
-    user = db.query(User).filter(User.id == token_data["user_id"]).first()
+def get_current_user(token_data: dict = Depends(verify_token)):
+    """
+    Get current authenticated user.
+    Own short read session, closed before the endpoint runs: a Depends(get_db) session
+    would keep the (single) writer connection for the whole request, uploads included.
+    """
+    db = ReadSessionLocal()
+    try:
+        user = db.query(User).filter(User.id == token_data["user_id"]).first()
+    finally:
+        db.close()
     
     if not user:
         raise HTTPException(
@@ -0,0 +1,106 @@
+"""
+Benchmark: tail latency of fast requests while slow DB requests are in flight
+The same two endpoints (a slow SQL query and a product lookup) declared as
+`async def` (before: sync Session on the event loop) and as plain `def`
+(after: FastAPI threadpool, the rule enforced by blocking_routes.py)
+
+Usage: python benchmarks/bench_concurrency.py [--slow 4] [--fast 100] [--slow-rows 100000]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from common import use_temp_database, seed_products, latency_line
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from database import get_db, Product
+from blocking_routes import blocking_async_routes
+
+SLOW_SQL = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < :n) SELECT count(*) FROM c"
+)
+
+
+def make_app(threadpool: bool, slow_rows: int) -> FastAPI:
+    """Slow + fast endpoint, `def` when threadpool else `async def`"""
+    app = FastAPI()
+
+    def slow(db: Session = Depends(get_db)):
+        return {"count": db.execute(SLOW_SQL, {"n": slow_rows}).scalar()}
+
+    def fast(product_id: str, db: Session = Depends(get_db)):
+        return db.query(Product).filter(Product.id == product_id).first().to_dict()
+
+    if not threadpool:
+        sync_slow, sync_fast = slow, fast
+
+        async def slow(db: Session = Depends(get_db)):
+            return sync_slow(db)
+
+        async def fast(product_id: str, db: Session = Depends(get_db)):
+            return sync_fast(product_id, db)
+
+    app.get("/slow")(slow)
+    app.get("/products/{product_id}")(fast)
+    return app
+
+
+async def run(app: FastAPI, slow_workers: int, fast_requests: int, products: int) -> tuple:
+    """(fast latencies ms, slow latencies ms) with `slow_workers` slow requests always in flight"""
+    transport = httpx.ASGITransport(app=app)
+    fast_latencies, slow_latencies = [], []
+    done = False
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def slow_worker():
+            while not done:
+                start = time.perf_counter()
+                await client.get("/slow")
+                slow_latencies.append((time.perf_counter() - start) * 1000)
+
+        async def fast_client(n: int):
+            for i in range(n):
+                start = time.perf_counter()
+                response = await client.get(f"/products/watch-{i % products:06d}")
+                response.raise_for_status()
+                fast_latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.005)
+
+        workers = [asyncio.create_task(slow_worker()) for _ in range(slow_workers)]
+        await asyncio.sleep(0.05)
+        await asyncio.gather(*[fast_client(fast_requests // 4) for _ in range(4)])
+        done = True
+        await asyncio.gather(*workers)
+    return fast_latencies, slow_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--slow", type=int, default=4, help="slow requests in flight")
+    parser.add_argument("--fast", type=int, default=100, help="fast requests measured")
+    parser.add_argument("--slow-rows", type=int, default=100_000, help="size of the slow query")
+    args = parser.parse_args()
+
+    path = use_temp_database()
+    try:
+        seed_products(args.products)
+        print(f"{args.slow} slow requests in flight, {args.fast} product lookups")
+        for label, threadpool in (("async def (before)", False), ("def + threadpool (after)", True)):
+            app = make_app(threadpool, args.slow_rows)
+            assert bool(blocking_async_routes(app)) != threadpool
+            fast, slow = asyncio.run(run(app, args.slow, args.fast, args.products))
+            print(label)
+            print(latency_line("fast: GET /products/{id}", fast))
+            print(latency_line("slow: GET /slow", slow))
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: /api/products/filters (seven GROUP BY queries)
+vs /api/products/facets (one facet index pass, disjunctive counts)
+
+Usage: python benchmarks/bench_facets.py [--products 5000] [--repeat 50]
+"""
+import argparse
+import asyncio
+import os
+
+from common import use_temp_database, seed_products, timeit
+
+import database
+from facet_index import facet_index
+from routes.products import get_available_filters, get_facet_counts
+
+FACET_PARAMS = dict(
+    search=None, collection=None, min_price=None, max_price=None, brand=None, gender=None,
+    min_diameter=None, max_diameter=None, strap_material=None, movement=None,
+    case_material=None, dial_color=None, water_resistance=None, features=None,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    path = use_temp_database()
+    try:
+        seed_products(args.products)
+        db = database.SessionLocal()
+        facet_index.build(db)
+
+        cases = [
+            ("no selection", {}),
+            ("movement=automatic", {"movement": "automatic"}),
+            ("brand+gender+price", {"brand": "Orient", "gender": "male", "max_price": 15_000_000}),
+            ("search=Sports", {"search": "Sports"}),
+        ]
+
+        old = timeit(lambda: asyncio.run(get_available_filters(db)), args.repeat)
+        print(f"{args.products} products, mean of {args.repeat} runs")
+        print(f"{'seven GROUP BY queries':<40}{old:>10.2f} ms  (ignores selection)")
+        for label, params in cases:
+            kwargs = dict(FACET_PARAMS, **params, db=db)
+            new = timeit(lambda: asyncio.run(get_facet_counts(**kwargs)), args.repeat)
+            print(f"{'facet index: ' + label:<40}{new:>10.2f} ms  x{old / new:.1f}")
+        db.close()
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
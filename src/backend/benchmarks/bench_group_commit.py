@@ -0,0 +1,115 @@
+"""
+Benchmark: concurrent order inserts
+one transaction + commit per request (before) vs the group-commit writer
+from write_queue.py (after), on the production SQLite profile
+
+Usage: python benchmarks/bench_group_commit.py [--clients 32] [--seconds 5] [--synchronous FULL]
+"""
+import argparse
+import itertools
+import json
+import os
+import threading
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--clients", type=int, default=32)
+parser.add_argument("--seconds", type=float, default=5)
+parser.add_argument("--synchronous", default="", help="override SQLITE_SYNCHRONOUS (e.g. FULL)")
+args = parser.parse_args()
+if args.synchronous:
+    # Read by database.py at import time
+    os.environ["SQLITE_SYNCHRONOUS"] = args.synchronous
+
+from common import use_temp_database, latency_line
+
+import database
+from database import Order
+from write_queue import GroupCommitWriter
+
+_order_numbers = itertools.count()
+
+
+def new_order() -> Order:
+    return Order(
+        order_number=f"BENCH-{next(_order_numbers):08d}",
+        customer_data=json.dumps({"fullName": "Bench"}),
+        items=json.dumps([{"productId": "watch-000001", "quantity": 1, "price": 1000}]),
+        subtotal=1000, total=1000,
+    )
+
+
+def insert_per_request():
+    db = database.SessionLocal()
+    try:
+        order = new_order()
+        db.add(order)
+        db.commit()
+        return order.id
+    finally:
+        db.close()
+
+
+def insert_grouped(writer: GroupCommitWriter):
+    def job(db):
+        order = new_order()
+        db.add(order)
+        db.flush()
+        return order.id
+    return writer.run(job)
+
+
+def run(op, clients: int, seconds: float) -> dict:
+    """Insert latencies (ms) and error count"""
+    stats = {"latencies": [], "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                op()
+            except Exception:
+                with lock:
+                    stats["errors"] += 1
+                continue
+            with lock:
+                stats["latencies"].append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return stats
+
+
+def main():
+    paths = []
+    try:
+        path = use_temp_database()
+        paths.append(path)
+        before = run(insert_per_request, args.clients, args.seconds)
+
+        path = use_temp_database()
+        paths.append(path)
+        writer = GroupCommitWriter(session_factory=database.SessionLocal)
+        after = run(lambda: insert_grouped(writer), args.clients, args.seconds)
+
+        print(f"{args.clients} clients, {args.seconds:g}s each, "
+              f"synchronous={os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')}")
+        for label, stats in (("commit per request (before)", before), ("group commit (after)", after)):
+            samples = stats["latencies"] or [0.0]
+            print(label)
+            print(latency_line(f"orders: {len(stats['latencies']) / args.seconds:>7.0f}/s", samples)
+                  + f"  errors {stats['errors']}")
+    finally:
+        for path in paths:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: response encoding for /api/products (limit=100) and /api/products/feed payloads
+stdlib JSONResponse vs FastJSONResponse (orjson) vs spliced pre-encoded bytes (product_cache)
+
+Usage: python benchmarks/bench_json.py [--products 2000] [--repeat 50]
+"""
+import argparse
+import os
+
+from common import use_temp_database, seed_products, timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import database
+from database import Product
+from fast_json import FastJSONResponse, BACKEND
+from product_cache import product_cache, product_json, product_feed_json, splice_array, encode_json
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    path = use_temp_database()
+    try:
+        seed_products(args.products)
+        db = database.SessionLocal()
+        page = db.query(Product).limit(100).all()
+        feed = db.query(Product).filter(Product.in_stock == True).all()
+        pagination = {"page": 1, "limit": 100, "total": args.products, "totalPages": args.products // 100}
+
+        payloads = {
+            "/api/products?limit=100": (
+                page, lambda: {"data": [p.to_dict() for p in page], "pagination": pagination}, product_json),
+            f"/api/products/feed ({len(feed)} items)": (
+                feed, lambda: {"meta": {"total": len(feed)}, "products": [p.to_feed_dict() for p in feed]},
+                product_feed_json),
+        }
+
+        print(f"encoder backend: {BACKEND}, mean of {args.repeat} runs")
+        for label, (rows, build, cached) in payloads.items():
+            before = timeit(lambda: JSONResponse(jsonable_encoder(build())).body, args.repeat)
+            after = timeit(lambda: FastJSONResponse(jsonable_encoder(build())).body, args.repeat)
+            direct = timeit(lambda: encode_json(build()), args.repeat)
+            for p in rows:
+                cached(p)  # warm the cache
+            spliced = timeit(lambda: splice_array(cached(p) for p in rows), args.repeat)
+
+            print(label)
+            print(f"  {'JSONResponse (stdlib json)':<42}{before:>9.2f} ms")
+            print(f"  {'FastJSONResponse':<42}{after:>9.2f} ms  x{before / after:.1f}")
+            print(f"  {'to_dict + fast_json.dumps (no encoder)':<42}{direct:>9.2f} ms  x{before / direct:.1f}")
+            print(f"  {'spliced cached bytes':<42}{spliced:>9.2f} ms  x{before / spliced:.1f}")
+            product_cache.clear()
+        db.close()
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: parallel readers and writers on SQLite
+default engine (rollback journal, one pool for everything) vs the production
+profile from database.py (WAL + pragmas, single-writer engine, read-only pool)
+
+Usage: python benchmarks/bench_sqlite.py [--readers 8] [--writers 4] [--seconds 5]
+"""
+import argparse
+import itertools
+import json
+import os
+import threading
+import time
+
+from common import use_temp_database, seed_products, latency_line
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import database
+from database import Product, Order
+
+_order_numbers = itertools.count()
+
+
+def read_once(session_factory):
+    db = session_factory()
+    try:
+        db.query(Product).filter(Product.in_stock == True) \
+            .order_by(Product.price.desc(), Product.id.desc()).limit(24).all()
+    finally:
+        db.close()
+
+
+def write_once(session_factory):
+    db = session_factory()
+    try:
+        db.add(Order(
+            order_number=f"BENCH-{next(_order_numbers):08d}",
+            customer_data=json.dumps({"fullName": "Bench"}),
+            items=json.dumps([{"productId": "watch-000001", "quantity": 1, "price": 1000}]),
+            subtotal=1000, total=1000,
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def run(read_factory, write_factory, readers: int, writers: int, seconds: float) -> dict:
+    """Latencies (ms) and error counts per operation kind"""
+    stats = {"read": [], "write": [], "read errors": 0, "write errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(kind, op, factory):
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                op(factory)
+            except Exception:
+                with lock:
+                    stats[f"{kind} errors"] += 1
+                continue
+            with lock:
+                stats[kind].append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=worker, args=("read", read_once, read_factory)) for _ in range(readers)]
+    threads += [threading.Thread(target=worker, args=("write", write_once, write_factory)) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    paths = []
+    try:
+        # Before: a plain engine, default journal mode, reads and writes share it
+        path = use_temp_database()
+        paths.append(path)
+        seed_products(args.products)
+        plain = sessionmaker(bind=create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False}))
+        before = run(plain, plain, args.readers, args.writers, args.seconds)
+
+        # After: database.py engines (WAL profile, writer + read-only pool)
+        path = use_temp_database()
+        paths.append(path)
+        seed_products(args.products)
+        after = run(database.ReadSessionLocal, database.SessionLocal, args.readers, args.writers, args.seconds)
+
+        print(f"{args.readers} readers + {args.writers} writers, {args.seconds:g}s each")
+        for label, stats in (("default engine (before)", before), ("WAL profile + read pool (after)", after)):
+            print(label)
+            for kind in ("read", "write"):
+                samples = stats[kind] or [0.0]
+                print(latency_line(f"{kind}s: {len(stats[kind]) / args.seconds:>7.0f}/s", samples)
+                      + f"  errors {stats[kind + ' errors']}")
+    finally:
+        for path in paths:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
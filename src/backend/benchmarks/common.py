@@ -0,0 +1,96 @@
+"""
+Shared helpers for the benchmark scripts
+Each benchmark runs against a throwaway SQLite database seeded with fake products
+"""
+import os
+import sys
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+from database import Base, Product
+
+COLLECTIONS = ["SPORTS", "CLASSIC", "CONTEMPORARY", "STAR", "BAMBINO", "KAMASU"]
+BRANDS = ["Orient", "Orient Star"]
+GENDERS = ["male", "female", "unisex"]
+STRAPS = ["steel", "leather", "rubber", "titanium"]
+MOVEMENTS = ["automatic", "mechanical", "quartz"]
+CASES = ["steel", "titanium", "gold"]
+DIALS = ["black", "blue", "white", "green", "silver"]
+WATER = ["30m", "50m", "100m", "200m"]
+FEATURES = ["Сапфировое стекло", "Автоподзавод", "Подсветка", "Хронограф", "Календарь", "Запас хода"]
+
+
+def use_temp_database(prefix: str = "orient_bench_") -> str:
+    """Point the database engines / session factories at a fresh SQLite file and create the tables"""
+    fd, path = tempfile.mkstemp(prefix=prefix, suffix=".db")
+    os.close(fd)
+    database.configure_engines(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=database.engine)
+    return path
+
+
+def seed_products(count: int, seed: int = 42):
+    """Insert `count` random products"""
+    rnd = random.Random(seed)
+    started = datetime(2023, 1, 1)
+    db = database.SessionLocal()
+    try:
+        for i in range(count):
+            db.add(Product(
+                id=f"watch-{i:06d}",
+                name=f"Orient {rnd.choice(COLLECTIONS).title()} {i}",
+                collection=rnd.choice(COLLECTIONS),
+                price=float(rnd.randrange(1_000_000, 30_000_000, 50_000)),
+                image=f"/uploads/watch-{i}.jpg",
+                images=json.dumps([f"/uploads/watch-{i}-{n}.jpg" for n in range(3)]),
+                description="Японские механические часы. " * 10,
+                features=json.dumps(rnd.sample(FEATURES, rnd.randint(0, 4)), ensure_ascii=False),
+                specs=json.dumps({"Стекло": "Сапфировое", "Калибр": "F6922"}, ensure_ascii=False),
+                in_stock=rnd.random() > 0.1,
+                stock_quantity=rnd.randint(0, 20),
+                sku=f"RA-{i:06d}",
+                is_featured=rnd.random() > 0.9,
+                brand=rnd.choice(BRANDS),
+                gender=rnd.choice(GENDERS),
+                case_diameter=rnd.choice([36.0, 38.5, 40.0, 41.7, 43.5]),
+                strap_material=rnd.choice(STRAPS),
+                movement=rnd.choice(MOVEMENTS),
+                case_material=rnd.choice(CASES),
+                dial_color=rnd.choice(DIALS),
+                water_resistance=rnd.choice(WATER),
+                seo_title=f"Orient {i}",
+                seo_description="Купить часы Orient в Ташкенте",
+                created_at=started + timedelta(minutes=i),
+            ))
+            if i % 1000 == 999:
+                db.commit()
+        db.commit()
+    finally:
+        db.close()
+
+
+def timeit(fn, repeat: int) -> float:
+    """Mean wall time of fn() in milliseconds"""
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+def latency_line(label: str, samples: list) -> str:
+    """p50 / p95 / p99 / max of latencies in milliseconds"""
+    return (f"  {label:<34}p50 {percentile(samples, 50):>8.1f}  p95 {percentile(samples, 95):>8.1f}"
+            f"  p99 {percentile(samples, 99):>8.1f}  max {max(samples):>8.1f} ms")
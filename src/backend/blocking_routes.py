@@ -0,0 +1,32 @@
+"""
+Rule: endpoints that take the synchronous DB session are plain `def`
+FastAPI runs `def` endpoints in its threadpool; an `async def` endpoint runs on
+the event loop, so one slow query or SQLite lock wait there stalls every request
+"""
+import inspect
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+from database import get_db, get_read_db
+
+
+def blocking_async_routes(app: FastAPI) -> list:
+    """'METHODS path' of `async def` endpoints with a direct Depends(get_db / get_read_db)"""
+    found = []
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or not inspect.iscoroutinefunction(route.endpoint):
+            continue
+        # Dependencies of dependencies (require_admin -> get_db) are sync and run in the threadpool anyway
+        if any(dep.call in (get_db, get_read_db) for dep in route.dependant.dependencies):
+            found.append(f"{','.join(sorted(route.methods))} {route.path}")
+    return found
+
+
+def check_blocking_routes(app: FastAPI):
+    """Refuse to start with an `async def` endpoint that blocks the event loop on the DB"""
+    found = blocking_async_routes(app)
+    if found:
+        raise RuntimeError(
+            "async def endpoints using the sync DB session (declare them with plain def): "
+            + "; ".join(found)
+        )
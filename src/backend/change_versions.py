@@ -0,0 +1,185 @@
+"""
+Per-table change versions
+Every ORM write to a tracked table bumps its row in table_versions inside the
+same transaction, so all workers see a new version as soon as the write commits.
+version_watcher keeps an in-memory copy of the table for the request path.
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import event, select, update, bindparam
+from sqlalchemy.orm import Session
+
+import database
+from database import engine, SessionLocal, ReadSessionLocal, TableVersion
+
+# Server databases: how often version_watcher re-reads table_versions (SQLite checks every call)
+VERSION_POLL_MS = float(os.getenv("VERSION_POLL_MS", "1000"))
+
+# Tables behind the public catalog / content / settings endpoints
+TRACKED_TABLES = {
+    "products",
+    "product_features",
+    "collections",
+    "filter_options",
+    "settings",
+    "content_site_logo",
+    "content_hero",
+    "content_promo_banner",
+    "content_heritage",
+    "content_history_events",
+    "content_boutique",
+    "content_policies",
+}
+
+
+def bump_versions(connection, tables):
+    """Increment the versions of the given tables on `connection`"""
+    tables = sorted(set(tables) & TRACKED_TABLES)
+    if not tables:
+        return
+    connection.execute(
+        update(TableVersion)
+        .where(TableVersion.table_name.in_(bindparam("tables", expanding=True)))
+        .values(version=TableVersion.version + 1, changed_at=datetime.utcnow()),
+        {"tables": tables}
+    )
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _bump_after_flush(session: Session, flush_context):
+    changed = [*session.new, *session.deleted,
+               *(obj for obj in session.dirty if session.is_modified(obj))]
+    tables = {obj.__table__.name for obj in changed}
+    if tables & TRACKED_TABLES:
+        session.info["versions_bumped"] = True
+    bump_versions(session.connection(), tables)
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _bump_after_bulk(orm_execute_state):
+    # query(...).update() / .delete() skip the flush
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.local_table.name not in TRACKED_TABLES:
+        return
+    result = orm_execute_state.invoke_statement()
+    bump_versions(orm_execute_state.session.connection(), [mapper.local_table.name])
+    orm_execute_state.session.info["versions_bumped"] = True
+    return result
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _refresh_after_commit(session: Session):
+    # This worker sees its own writes right away, other workers on their next check
+    if session.info.pop("versions_bumped", False):
+        version_watcher.mark_stale()
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_after_rollback(session: Session):
+    session.info.pop("versions_bumped", None)
+
+
+def init_table_versions(bind=None):
+    """Create the missing table_versions rows"""
+    bind = bind or engine
+    with bind.begin() as conn:
+        existing = set(conn.execute(select(TableVersion.table_name)).scalars())
+        missing = TRACKED_TABLES - existing
+        if missing:
+            conn.execute(TableVersion.__table__.insert(), [
+                {"table_name": name, "version": 1, "changed_at": datetime.utcnow()}
+                for name in sorted(missing)
+            ])
+
+
+def current_versions(db: Session, tables) -> list:
+    """[(table_name, version, changed_at)] for the given tables, sorted by name"""
+    return db.execute(
+        select(TableVersion.table_name, TableVersion.version, TableVersion.changed_at)
+        .where(TableVersion.table_name.in_(sorted(tables)))
+        .order_by(TableVersion.table_name)
+    ).all()
+
+
+class VersionWatcher:
+    """
+    In-memory copy of table_versions, so cached responses and ETags need no query.
+    SQLite: PRAGMA data_version on a dedicated connection changes whenever any other
+    connection (any worker) commits, and only then is the table re-read.
+    Server databases: re-read at most every VERSION_POLL_MS, and right after a commit
+    in this worker that bumped a version.
+    """
+
+    def __init__(self, poll_ms: float = VERSION_POLL_MS):
+        self.poll = poll_ms / 1000
+        self._lock = threading.Lock()
+        self._versions = {}  # table_name -> (version, changed_at), replaced as a whole
+        self._stale = True
+        self._checked_at = 0.0
+        self._engine = None  # read engine the watch connection belongs to
+        self._connection = None  # SQLite only
+        self._data_version = None
+
+    def mark_stale(self):
+        self._stale = True
+
+    def _open(self, engine):
+        if self._connection is not None:
+            self._connection.close()
+        # Detached: a DBAPI connection of its own, not kept from the read pool
+        self._connection = engine.raw_connection()
+        self._connection.detach()
+        self._engine = engine
+        self._data_version = None
+
+    def _changed(self) -> bool:
+        """Whether table_versions may have changed since the last read (call with the lock held)"""
+        engine = database.read_engine
+        if engine.dialect.name != "sqlite":
+            return self._stale or time.monotonic() - self._checked_at >= self.poll
+        if self._engine is not engine:
+            self._open(engine)
+        cursor = self._connection.cursor()
+        try:
+            cursor.execute("PRAGMA data_version")
+            data_version = cursor.fetchone()[0]
+        finally:
+            cursor.close()
+        changed = self._stale or data_version != self._data_version
+        self._data_version = data_version
+        return changed
+
+    def _refresh(self):
+        # Cleared first: a commit marking it stale during the read gets another refresh
+        self._stale = False
+        db = ReadSessionLocal()
+        try:
+            rows = current_versions(db, TRACKED_TABLES)
+        except Exception:
+            self._stale = True
+            raise
+        finally:
+            db.close()
+        self._versions = {name: (version, changed_at) for name, version, changed_at in rows}
+        self._checked_at = time.monotonic()
+
+    def versions(self, tables) -> list:
+        """[(table_name, version, changed_at)] like current_versions, from memory"""
+        with self._lock:
+            if self._changed():
+                self._refresh()
+            versions = self._versions
+        return [(name, *versions[name]) for name in sorted(tables) if name in versions]
+
+    def version(self, table: str):
+        """Current version of one table, None if it has no table_versions row"""
+        for _, version, _ in self.versions([table]):
+            return version
+        return None
+
+
+version_watcher = VersionWatcher()
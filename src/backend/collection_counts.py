@@ -0,0 +1,113 @@
+"""
+Collection product counts
+collections.product_count is kept by triggers on products (insert / delete /
+collection_id change) and on collections (insert), so every write path,
+including imports and bulk SQL, updates it in the same transaction
+"""
+from sqlalchemy import text
+
+from database import engine
+from migration_utils import has_column
+
+RECOUNT = "(SELECT count(*) FROM products WHERE products.collection_id = {id})"
+
+SQLITE_TRIGGERS = [
+    # Replaced on rebuild (CREATE TRIGGER has no OR REPLACE in SQLite)
+    "DROP TRIGGER IF EXISTS products_count_ai",
+    "DROP TRIGGER IF EXISTS products_count_ad",
+    "DROP TRIGGER IF EXISTS products_count_au",
+    "DROP TRIGGER IF EXISTS collections_count_ai",
+    "DROP TRIGGER IF EXISTS collections_count_au",
+    """
+    CREATE TRIGGER products_count_ai AFTER INSERT ON products BEGIN
+        UPDATE collections SET product_count = product_count + 1 WHERE id = new.collection_id;
+    END
+    """,
+    """
+    CREATE TRIGGER products_count_ad AFTER DELETE ON products BEGIN
+        UPDATE collections SET product_count = product_count - 1 WHERE id = old.collection_id;
+    END
+    """,
+    """
+    CREATE TRIGGER products_count_au AFTER UPDATE OF collection_id ON products
+    WHEN old.collection_id IS NOT new.collection_id BEGIN
+        UPDATE collections SET product_count = product_count - 1 WHERE id = old.collection_id;
+        UPDATE collections SET product_count = product_count + 1 WHERE id = new.collection_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER collections_count_ai AFTER INSERT ON collections BEGIN
+        UPDATE collections SET product_count = {RECOUNT.format(id="new.id")} WHERE id = new.id;
+    END
+    """,
+]
+
+POSTGRES_TRIGGERS = [
+    """
+    CREATE OR REPLACE FUNCTION products_count_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            UPDATE collections SET product_count = product_count - 1 WHERE id = OLD.collection_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE collections SET product_count = product_count + 1 WHERE id = NEW.collection_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS products_count_aiud ON products",
+    """
+    CREATE TRIGGER products_count_aiud AFTER INSERT OR DELETE OR UPDATE OF collection_id ON products
+    FOR EACH ROW EXECUTE FUNCTION products_count_sync()
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION collections_count_sync() RETURNS trigger AS $$
+    BEGIN
+        NEW.product_count := {RECOUNT.format(id="NEW.id")};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS collections_count_biu ON collections",
+    """
+    CREATE TRIGGER collections_count_biu BEFORE INSERT ON collections
+    FOR EACH ROW EXECUTE FUNCTION collections_count_sync()
+    """,
+]
+
+TRIGGERS = {
+    "sqlite": SQLITE_TRIGGERS,
+    "postgresql": POSTGRES_TRIGGERS,
+}
+
+
+def recount_collections(conn):
+    """Recompute every collection's count (one statement)"""
+    conn.execute(text(f"UPDATE collections SET product_count = {RECOUNT.format(id='collections.id')}"))
+
+
+def init_collection_counts(bind=None, rebuild: bool = False):
+    """Create the count triggers and recompute the counts (skipped if the triggers exist, unless rebuild=True)"""
+    bind = bind or engine
+    statements = TRIGGERS.get(bind.dialect.name)
+    if statements is None:
+        raise RuntimeError(f"No product count triggers for {bind.dialect.name}")
+    if not (has_column("collections", "product_count", bind) and has_column("products", "collection_id", bind)):
+        print("⚠️ collections.product_count / products.collection_id missing, run: python migrate.py")
+        return
+
+    with bind.begin() as conn:
+        if bind.dialect.name == "sqlite":
+            exists = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'products_count_ai'"
+            )).first()
+        else:
+            exists = conn.execute(text(
+                "SELECT 1 FROM pg_trigger WHERE tgname = 'products_count_aiud'"
+            )).first()
+        if exists and not rebuild:
+            return
+        for statement in statements:
+            conn.execute(text(statement))
+        recount_collections(conn)
@@ -0,0 +1,57 @@
+"""
+Product -> collection link
+products.collection_id references collections.id; products.collection keeps the
+collection name for display, export and the catalog name filter, and follows
+renames. The id is filled from the name on every ORM flush, so the product
+routes and the Excel import need no extra code.
+"""
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, Collection, Product
+
+
+@event.listens_for(SessionLocal, "before_flush")
+def _link_products(session: Session, flush_context, instances):
+    # Collections added in the same flush are not in the table yet
+    ids = {obj.name: obj.id for obj in session.new if isinstance(obj, Collection)}
+    for obj in [*session.new, *session.dirty]:
+        if not isinstance(obj, Product):
+            continue
+        if obj not in session.new and not inspect(obj).attrs.collection.history.has_changes():
+            continue
+        if obj.collection not in ids:
+            # Names are unique in the model, older tables may still hold duplicates: lowest id wins
+            ids[obj.collection] = session.query(Collection.id).filter(Collection.name == obj.collection) \
+                .order_by(Collection.id).limit(1).scalar()
+        obj.collection_id = ids[obj.collection]
+
+
+def link_orphan_products(db: Session, collection: Collection):
+    """Attach products that already carry this collection's name (new collection, caller commits)"""
+    db.execute(
+        update(Product)
+        .where(Product.collection == collection.name, Product.collection_id.is_(None))
+        .values(collection_id=collection.id)
+    )
+
+
+def rename_collection_products(db: Session, collection: Collection):
+    """Copy a renamed collection's name to its products (caller commits)"""
+    db.execute(
+        update(Product)
+        .where(Product.collection_id == collection.id)
+        .values(collection=collection.name)
+    )
+
+
+def unlink_collection_products(db: Session, collection: Collection):
+    """
+    Detach products from a collection about to be deleted (SQLite does not enforce
+    ON DELETE SET NULL) and clear its name, so catalog filters and facets drop it
+    """
+    db.execute(
+        update(Product)
+        .where(Product.collection_id == collection.id)
+        .values(collection_id=None, collection="")
+    )
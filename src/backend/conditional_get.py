@@ -0,0 +1,97 @@
+"""
+Conditional GET for the public catalog / content / settings endpoints
+ETag and Last-Modified come from the table change versions (change_versions.py),
+so a matching If-None-Match is answered with 304 before the route runs; the versions
+are read from version_watcher's in-memory copy
+"""
+import hashlib
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import timezone
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from change_versions import version_watcher
+from content_cache import HOMEPAGE_TABLES
+
+CONTENT_TABLES = ["content_site_logo", "content_hero", "content_promo_banner", "content_heritage",
+                  "content_history_events", "content_boutique", "content_policies"]
+
+# Paths that handle conditional requests themselves
+CONDITIONAL_EXCLUDED = {"/api/products/feed"}
+
+# Public path prefix -> tables its responses are built from (first match wins)
+CONDITIONAL_ROUTES = [
+    ("/api/content/homepage", HOMEPAGE_TABLES),
+    ("/api/products", ["products", "product_features", "collections", "filter_options"]),
+    ("/api/collections", ["collections", "products"]),
+    ("/api/content", [*CONTENT_TABLES, "products"]),
+    ("/api/settings", ["settings", "filter_options"]),
+]
+
+
+def route_tables(path: str):
+    """Tables behind a public path, None if the path is not cached"""
+    if path in CONDITIONAL_EXCLUDED:
+        return None
+    for prefix, tables in CONDITIONAL_ROUTES:
+        if path == prefix or path.startswith(prefix + "/"):
+            return tables
+    return None
+
+
+def build_validators(request: Request, versions: list):
+    """(ETag, Last-Modified datetime) for a request URL and its table versions"""
+    digest = hashlib.sha1(request.url.path.encode())
+    digest.update(request.url.query.encode())
+    for name, version, _ in versions:
+        digest.update(f"|{name}:{version}".encode())
+    etag = f'W/"{digest.hexdigest()[:20]}"'
+
+    changed = [changed_at for _, _, changed_at in versions if changed_at]
+    last_modified = max(changed).replace(microsecond=0, tzinfo=timezone.utc) if changed else None
+    return etag, last_modified
+
+
+def is_not_modified(request: Request, etag: str, last_modified) -> bool:
+    """RFC 9110: If-None-Match wins, If-Modified-Since only without it"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        # Weak comparison: W/"x" matches "x"
+        return "*" in tags or etag.removeprefix("W/") in [t.removeprefix("W/") for t in tags]
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            return last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class ConditionalGetMiddleware(BaseHTTPMiddleware):
+    """ETag / Last-Modified / 304 for GET and HEAD on CONDITIONAL_ROUTES"""
+
+    async def dispatch(self, request: Request, call_next):
+        tables = route_tables(request.url.path) if request.method in ("GET", "HEAD") else None
+        if tables is None:
+            return await call_next(request)
+
+        # Versions are read before the route runs: a write racing with it only makes the tag older
+        versions = await run_in_threadpool(version_watcher.versions, tables)
+        etag, last_modified = build_validators(request, versions)
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if last_modified is not None:
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+        if is_not_modified(request, etag, last_modified):
+            return Response(status_code=304, headers=headers)
+
+        response = await call_next(request)
+        if response.status_code == 200:
+            for name, value in headers.items():
+                response.headers.setdefault(name, value)
+        return response
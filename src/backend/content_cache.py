@@ -0,0 +1,59 @@
+"""
+In-memory snapshots of the public content / settings responses
+The singleton rows (id == 1) behind /api/content/* and /api/settings/*, and the
+aggregated GET /api/content/homepage, are kept as encoded JSON and rebuilt only
+when one of their source tables has a new version. Versions come from
+version_watcher (change_versions.py), so an unchanged response is served without
+a database session, and a write committed by any worker is picked up on its next check.
+"""
+import threading
+
+from database import ReadSessionLocal
+from change_versions import version_watcher
+from fast_json import dumps as encode_json
+
+HOMEPAGE_TABLES = [
+    "content_site_logo",
+    "content_hero",
+    "content_promo_banner",
+    "content_heritage",
+    "settings",
+    "collections",
+    "products",  # featured watches, collection counts
+]
+
+
+class VersionedSnapshot:
+    """JSON bytes of build(db), rebuilt when the versions of `tables` change"""
+
+    def __init__(self, tables: list, build):
+        self.tables = tables
+        self.build = build
+        self._lock = threading.Lock()
+        self._snapshot = None  # (versions, JSON bytes), replaced as a whole
+
+    def _read_versions(self) -> tuple:
+        return tuple((name, version) for name, version, _ in version_watcher.versions(self.tables))
+
+    def get(self) -> bytes:
+        versions = self._read_versions()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot[0] == versions:
+            return snapshot[1]
+
+        # One rebuild at a time; requests that waited reuse its result
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot[0] == versions:
+                return snapshot[1]
+            # Built after reading the versions: a write racing with the build is picked up by the next request
+            db = ReadSessionLocal()
+            try:
+                data = encode_json(self.build(db))
+            finally:
+                db.close()
+            self._snapshot = (versions, data)
+        return data
+
+    def invalidate(self):
+        self._snapshot = None
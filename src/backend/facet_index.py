@@ -0,0 +1,276 @@
+"""
+In-memory facet index for the product catalog
+One bitmap per facet value, filter combinations are answered with AND/OR
+"""
+import threading
+from sqlalchemy.orm import Session
+
+from database import Product
+from change_versions import version_watcher
+
+# Facets indexed as bitmaps (attribute name on Product)
+FACETS = [
+    "brand",
+    "gender",
+    "strap_material",
+    "movement",
+    "case_material",
+    "dial_color",
+    "water_resistance",
+    "collection",
+]
+
+# Columns kept per slot for range filters and sorting
+ROW_COLUMNS = [Product.id, Product.price, Product.case_diameter, Product.name,
+               Product.created_at, Product.is_featured]
+
+
+# Catalog sorts: ORDER BY columns (id is the tiebreaker) and direction
+CATALOG_SORTS = {
+    "price-asc": ([Product.price, Product.id], False),
+    "price-desc": ([Product.price, Product.id], True),
+    "newest": ([Product.created_at, Product.id], True),
+    "name": ([Product.name, Product.id], False),
+    "popular": ([Product.is_featured, Product.created_at, Product.id], True),
+}
+
+
+def catalog_sort(sort: str):
+    """(columns, descending) for a sort name, unknown names fall back to popular"""
+    return CATALOG_SORTS.get(sort, CATALOG_SORTS["popular"])
+
+
+def _nulls_first(value):
+    """Sort key that mirrors SQLite ordering: NULL is smaller than any value"""
+    return (value is not None, value if value is not None else 0)
+
+
+def _sort_key(positions: list):
+    return lambda row: tuple(_nulls_first(row[i]) for i in positions)
+
+
+# Same sorts over the index row tuples
+_ROW_POSITIONS = {c.key: i for i, c in enumerate(ROW_COLUMNS)}
+SORT_KEYS = {
+    name: ([_ROW_POSITIONS[c.key] for c in columns], descending)
+    for name, (columns, descending) in CATALOG_SORTS.items()
+}
+
+
+def iter_bits(bitmap: int):
+    """Yield slot numbers of the set bits, lowest first"""
+    for slot, bit in enumerate(reversed(bin(bitmap)[2:])):
+        if bit == "1":
+            yield slot
+
+
+class FacetIndex:
+    """
+    Process-local bitmap index over the products table.
+
+    Bitmaps are plain Python ints (bit N = slot N), which keeps AND/OR/popcount
+    in C. Slots of deleted products are recycled.
+
+    The index remembers the "products" table version it was built from and is
+    rebuilt by ensure() once the table moves on, so writes made by other workers
+    (or outside the app) show up too. upsert() / remove() keep this worker's own
+    writes visible in between.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._version = None    # products table version of the last build
+        self._generation = 0    # bumped by every change, see build()
+        self._slots = {}      # product id -> slot
+        self._free = []       # recycled slots
+        self._rows = []       # slot -> row tuple (see ROW_COLUMNS) or None
+        self._values = []     # slot -> {facet: value}
+        self._bitmaps = {facet: {} for facet in FACETS}
+        self._all = 0
+
+    # --- Maintenance ---
+
+    def build(self, db: Session):
+        """Rebuild the whole index from the products table"""
+        with self._lock:
+            generation = self._generation
+        # Version before the rows: a write racing with the query leaves the index behind, not ahead
+        version = version_watcher.version("products")
+        rows = db.query(*ROW_COLUMNS, *[getattr(Product, f) for f in FACETS]).all()
+
+        with self._lock:
+            self._slots = {}
+            self._free = []
+            self._rows = []
+            self._values = []
+            self._bitmaps = {facet: {} for facet in FACETS}
+            self._all = 0
+            for row in rows:
+                self._insert(tuple(row[:len(ROW_COLUMNS)]),
+                             dict(zip(FACETS, row[len(ROW_COLUMNS):])))
+            self._version = version
+            # Invalidated or written to while the rows were read: usable for this
+            # request, but the next ensure() builds again
+            self._built = self._generation == generation
+            self._generation += 1
+
+    def ensure(self, db: Session):
+        """Build the index on first use, after invalidate() or after a products write anywhere"""
+        if not self._built or self._version != version_watcher.version("products"):
+            self.build(db)
+
+    def invalidate(self):
+        """Drop the index, the next request rebuilds it (bulk writes)"""
+        with self._lock:
+            self._built = False
+            self._generation += 1
+
+    def upsert(self, product: Product):
+        """Add or refresh a single product after create/update"""
+        with self._lock:
+            self._generation += 1
+            if not self._built:
+                return
+            self._remove(product.id)
+            row = tuple(getattr(product, c.key) for c in ROW_COLUMNS)
+            self._insert(row, {f: getattr(product, f) for f in FACETS})
+
+    def remove(self, product_id: str):
+        """Drop a single product after delete"""
+        with self._lock:
+            self._generation += 1
+            if self._built:
+                self._remove(product_id)
+
+    def _insert(self, row: tuple, values: dict):
+        slot = self._free.pop() if self._free else len(self._rows)
+        if slot == len(self._rows):
+            self._rows.append(None)
+            self._values.append(None)
+        bit = 1 << slot
+
+        self._slots[row[0]] = slot
+        self._rows[slot] = row
+        self._values[slot] = values
+        self._all |= bit
+        for facet, value in values.items():
+            if value is None:
+                continue
+            bitmaps = self._bitmaps[facet]
+            bitmaps[value] = bitmaps.get(value, 0) | bit
+
+    def _remove(self, product_id: str):
+        slot = self._slots.pop(product_id, None)
+        if slot is None:
+            return
+        mask = ~(1 << slot)
+        for facet, value in self._values[slot].items():
+            bitmaps = self._bitmaps[facet]
+            if value in bitmaps:
+                bitmaps[value] &= mask
+                if not bitmaps[value]:
+                    del bitmaps[value]
+        self._all &= mask
+        self._rows[slot] = None
+        self._values[slot] = None
+        self._free.append(slot)
+
+    # --- Queries ---
+
+    def match(self, selection: dict, min_price=None, max_price=None,
+              min_diameter=None, max_diameter=None) -> int:
+        """
+        Bitmap of products matching the selection.
+        selection: {facet: [values]} - values of one facet are OR-ed, facets are AND-ed.
+        Range bounds behave like the SQL comparisons (NULL never matches).
+        """
+        with self._lock:
+            result = self._all
+            for facet, values in selection.items():
+                result &= self.facet_bitmap(facet, values)
+                if not result:
+                    return 0
+
+            if min_price is None and max_price is None and min_diameter is None and max_diameter is None:
+                return result
+
+            rows = self._rows
+            for slot in iter_bits(result):
+                price, diameter = rows[slot][1], rows[slot][2]
+                if (min_price is not None and (price is None or price < min_price)) or \
+                   (max_price is not None and (price is None or price > max_price)) or \
+                   (min_diameter is not None and (diameter is None or diameter < min_diameter)) or \
+                   (max_diameter is not None and (diameter is None or diameter > max_diameter)):
+                    result &= ~(1 << slot)
+            return result
+
+    def facet_bitmap(self, facet: str, values) -> int:
+        """OR of the bitmaps of the given values of one facet"""
+        bitmaps = self._bitmaps[facet]
+        bitmap = 0
+        for value in values:
+            bitmap |= bitmaps.get(value, 0)
+        return bitmap
+
+    def facet_counts(self, base: int, selection: dict, facets) -> dict:
+        """
+        Disjunctive counts: each facet is counted over `base` narrowed by every
+        *other* facet's selection, so picking a value does not zero out its siblings.
+        Returns {facet: {value: count}}; selected values are kept even at zero.
+        """
+        with self._lock:
+            selected = {facet: self.facet_bitmap(facet, values) for facet, values in selection.items()}
+            counts = {}
+            for facet in facets:
+                mask = base
+                for other, bitmap in selected.items():
+                    if other != facet:
+                        mask &= bitmap
+                chosen = selection.get(facet, ())
+                counts[facet] = {
+                    value: count
+                    for value, count in (
+                        (value, (bitmap & mask).bit_count())
+                        for value, bitmap in self._bitmaps[facet].items()
+                    )
+                    if count or value in chosen
+                }
+            return counts
+
+    def bitmap_of_ids(self, product_ids) -> int:
+        """Bitmap of the given product ids (unknown ids are ignored)"""
+        with self._lock:
+            bitmap = 0
+            for product_id in product_ids:
+                slot = self._slots.get(product_id)
+                if slot is not None:
+                    bitmap |= 1 << slot
+            return bitmap
+
+    def sorted_ids(self, bitmap: int, sort: str, after: list = None) -> list:
+        """
+        Product ids of the bitmap in the same order as the SQL ORDER BY.
+        after: sort key values of a cursor (see pagination.py), only later rows are returned.
+        """
+        positions, descending = SORT_KEYS.get(sort, SORT_KEYS["popular"])
+        key = _sort_key(positions)
+        with self._lock:
+            rows = [self._rows[slot] for slot in iter_bits(bitmap)]
+
+        if after is not None:
+            bound = tuple(_nulls_first(v) for v in after)
+            rows = [r for r in rows if (key(r) < bound if descending else key(r) > bound)]
+        rows.sort(key=key, reverse=descending)
+        return [row[0] for row in rows]
+
+    def sort_values(self, product_id: str, sort: str) -> list:
+        """Sort key values of one product (what a cursor stores)"""
+        positions, _ = SORT_KEYS.get(sort, SORT_KEYS["popular"])
+        with self._lock:
+            row = self._rows[self._slots[product_id]]
+        return [row[i] for i in positions]
+
+
+# Shared instance used by the product routes
+facet_index = FacetIndex()
@@ -0,0 +1,40 @@
+"""
+Fast JSON encoding for API responses
+orjson when installed, stdlib json (same output shape) otherwise
+"""
+import json
+from datetime import date, datetime
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    BACKEND = "orjson"
+
+    def dumps(data) -> bytes:
+        """UTF-8 JSON bytes (Cyrillic is not escaped, datetimes as ISO 8601)"""
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+else:
+    BACKEND = "json"
+
+    def dumps(data) -> bytes:
+        """UTF-8 JSON bytes (Cyrillic is not escaped, datetimes as ISO 8601)"""
+        return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+                          default=_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class of the app (see main.py)"""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -0,0 +1,142 @@
+"""
+On-the-fly resized uploads: GET /img/{w}x{h}/{fmt}/{filename}
+A resize is rendered once in the image process pool (image_variants.py) and kept in
+IMAGE_CACHE_DIR. The cache is a size-capped LRU on disk: hits touch the file's mtime,
+and when the directory grows past IMAGE_CACHE_MAX_MB the least recently used files
+are deleted. Concurrent requests for the same resize in a worker share one render;
+workers write through a temp file + rename, so they never see partial files.
+Only the sizes in IMAGE_SIZES are rendered: the endpoint is public, and arbitrary
+sizes would let anyone keep the pool busy and flush the cache.
+"""
+import asyncio
+import os
+import threading
+
+from starlette.concurrency import run_in_threadpool
+
+from image_variants import UPLOAD_DIR, IMAGE_ERRORS, get_pool, render_resized
+
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", "image_cache")
+IMAGE_CACHE_MAX_BYTES = int(float(os.getenv("IMAGE_CACHE_MAX_MB", "512")) * 1024 * 1024)
+# {w}x{h} the frontend asks for (resizedVariant callers, src/components/VariantSources.tsx)
+IMAGE_SIZES = os.getenv("IMAGE_SIZES", "600x0,800x0,1000x0,1200x0")
+
+# Eviction frees a bit more than needed so it does not run on every new file
+EVICT_TO = 0.9
+
+
+class ImageCache:
+    """Resized copies of uploads on disk, least recently used evicted first"""
+
+    def __init__(self, directory: str = IMAGE_CACHE_DIR, max_bytes: int = IMAGE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None  # bytes in the directory, scanned on first use
+        self._pending = {}  # cache path -> future of the render in progress
+
+    def path(self, filename: str, width: int, height: int, fmt: str) -> str:
+        stem = os.path.splitext(filename)[0]
+        return os.path.join(self.directory, f"{width}x{height}", f"{stem}.{fmt}")
+
+    async def get(self, filename: str, width: int, height: int, fmt: str) -> str:
+        """Path of the resized file, rendered on the first request"""
+        target = self.path(filename, width, height, fmt)
+        try:
+            await run_in_threadpool(os.utime, target)  # hit: mark as recently used
+            return target
+        except FileNotFoundError:
+            pass
+
+        pending = self._pending.get(target)
+        if pending is None:
+            pending = asyncio.ensure_future(self._render(filename, target, width, height, fmt))
+            self._pending[target] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(target, None))
+        # shield: a client disconnecting does not cancel the render the others wait for
+        await asyncio.shield(pending)
+        return target
+
+    async def open(self, filename: str, width: int, height: int, fmt: str):
+        """
+        (file, stat) of the resized file, open for reading. Holding the handle keeps the
+        bytes readable if the file is evicted meanwhile; one evicted between get() and
+        the open is rendered again. FileNotFoundError if it keeps disappearing.
+        """
+        for _ in range(2):
+            target = await self.get(filename, width, height, fmt)
+            try:
+                file = await run_in_threadpool(open, target, "rb")
+            except FileNotFoundError:
+                continue
+            return file, os.fstat(file.fileno())
+        raise FileNotFoundError(filename)
+
+    async def _render(self, filename: str, target: str, width: int, height: int, fmt: str):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        source = os.path.join(UPLOAD_DIR, filename)
+        loop = asyncio.get_running_loop()
+        try:
+            size = await loop.run_in_executor(get_pool(), render_resized, source, target, (width, height), fmt)
+        except IMAGE_ERRORS as e:
+            raise ValueError("Invalid or corrupted image file") from e
+        await loop.run_in_executor(None, self._added, size)
+
+    def _added(self, size: int):
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self) -> list:
+        """[(mtime, size, path)] of the cached files"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".tmp"):  # being written
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:  # evicted by another worker
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        # Rescan: other workers add and evict files in the same directory
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        limit = self.max_bytes * EVICT_TO
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
+
+
+image_cache = ImageCache()
+
+
+def parse_size(size: str) -> tuple:
+    """'600x400' -> (600, 400); 0 leaves that side free. ValueError if malformed"""
+    width, sep, height = size.partition("x")
+    if not sep or not width.isdigit() or not height.isdigit():
+        raise ValueError("Size must be {width}x{height}")
+    width, height = int(width), int(height)
+    if not (width or height):
+        raise ValueError("Width or height must be set")
+    return width, height
+
+
+ALLOWED_SIZES = {parse_size(size.strip()) for size in IMAGE_SIZES.split(",") if size.strip()}
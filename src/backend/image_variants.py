@@ -0,0 +1,225 @@
+"""
+Image derivatives for uploads
+Every uploaded image gets a fixed set of resized variants (VARIANTS) in WebP,
+AVIF (when Pillow supports it) and a JPEG fallback. Encoding runs in a process
+pool, one task per variant, so an upload does not hold up the event loop.
+
+Layout next to the original uploads/<path>/<stem>.<ext> (upload_stream.stored_name):
+    uploads/<path>/<stem>/<variant>.<format>
+    uploads/<path>/<stem>/variants.json   (the variant map, file names relative to uploads/)
+
+Rows that reference uploads keep the map of their images in an image_variants
+column: {original URL: {variant: {"width", "height", <format>: URL}}}.
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+try:
+    from PIL import Image, ImageOps, UnidentifiedImageError, features
+except ImportError:  # optional dependency, uploads are stored without variants
+    Image = None
+
+# What a file that is not a (decodable) image raises in the pool
+IMAGE_ERRORS = (UnidentifiedImageError, Image.DecompressionBombError, OSError) if Image else (OSError,)
+
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+
+# name -> bounding box (width, height); images are scaled down to fit, never up
+VARIANTS = {
+    "thumbnail": (200, 200),
+    "card": (600, 600),
+    "detail": (1400, 1400),
+    "hero-desktop": (1920, 1080),
+    "hero-mobile": (828, 1792),
+}
+
+QUALITY = {"webp": 80, "avif": 55, "jpeg": 82}
+
+MANIFEST = "variants.json"
+
+
+def available_formats() -> list:
+    """Output formats this Pillow build can write, smallest first"""
+    if Image is None:
+        return []
+    formats = ["webp"] if features.check("webp") else []
+    if features.check("avif"):
+        formats.insert(0, "avif")
+    return [*formats, "jpeg"]
+
+
+def _fit(image, box: tuple):
+    """Upright copy of `image` scaled down into `box` ((w, h), 0 = any), in RGB or RGBA"""
+    image = ImageOps.exif_transpose(image)
+    width, height = box
+    image.thumbnail((width or image.width, height or image.height), Image.LANCZOS)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+    return image
+
+
+def _save(image, path: str, fmt: str):
+    if fmt == "jpeg":
+        # No alpha in JPEG: flatten onto white
+        if image.mode == "RGBA":
+            flat = Image.new("RGB", image.size, (255, 255, 255))
+            flat.paste(image, mask=image.getchannel("A"))
+            image = flat
+        image.save(path, "JPEG", quality=QUALITY[fmt], optimize=True, progressive=True)
+    else:
+        image.save(path, fmt.upper(), quality=QUALITY[fmt])
+
+
+def _save_atomic(image, path: str, fmt: str):
+    """
+    _save through a temp file in the same directory and a rename: a crash or a concurrent
+    render of the same file never leaves a truncated one under the final (immutable) name.
+    The temp name is hidden, so /uploads does not serve it.
+    """
+    directory, name = os.path.split(path)
+    temp = os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+    try:
+        _save(image, temp, fmt)
+        os.replace(temp, path)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+
+def render_variant(source: str, target_dir: str, prefix: str, name: str, box: tuple, formats: list) -> dict:
+    """Resize `source` into `box` and write one file per format, named `prefix`/... (runs in the pool)"""
+    with Image.open(source) as image:
+        image = _fit(image, box)
+        variant = {"width": image.width, "height": image.height}
+        for fmt in formats:
+            _save_atomic(image, os.path.join(target_dir, f"{name}.{fmt}"), fmt)
+            variant[fmt] = f"{prefix}/{name}.{fmt}"
+        return variant
+
+
+def render_resized(source: str, target: str, box: tuple, fmt: str) -> int:
+    """Write `source` scaled into `box` as `fmt` to `target` atomically, returns its size (runs in the pool)"""
+    with Image.open(source) as image:
+        _save_atomic(_fit(image, box), target, fmt)
+    return os.path.getsize(target)
+
+
+_pool = None
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # Not plain fork: the app has open DB connections and threads. Workers are forked
+        # from a clean fork server that has this module (and Pillow) imported already
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        _pool = ProcessPoolExecutor(max_workers=IMAGE_WORKERS, mp_context=context)
+    return _pool
+
+
+def shutdown_image_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def generate_variants(source: str) -> dict:
+    """
+    Write all variants of an uploaded file (under UPLOAD_DIR) and its manifest, returns
+    the variant map (file names relative to UPLOAD_DIR). Empty when Pillow is not installed.
+    A file that already has a manifest (same content uploaded before) keeps its variants.
+    Raises ValueError if the file is not a readable image.
+    """
+    formats = available_formats()
+    if not formats:
+        return {}
+
+    target_dir = os.path.splitext(source)[0]
+    manifest = os.path.join(target_dir, MANIFEST)
+    try:
+        with open(manifest, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+    os.makedirs(target_dir, exist_ok=True)
+    prefix = os.path.relpath(target_dir, UPLOAD_DIR).replace(os.sep, "/")
+
+    loop = asyncio.get_running_loop()
+    pool = get_pool()
+    try:
+        results = await asyncio.gather(*(
+            loop.run_in_executor(pool, render_variant, source, target_dir, prefix, name, box, formats)
+            for name, box in VARIANTS.items()
+        ))
+    except IMAGE_ERRORS as e:
+        remove_variants(source)
+        raise ValueError("Invalid or corrupted image file") from e
+
+    variants = dict(zip(VARIANTS, results))
+    # Written last and atomically: a manifest means the variants are complete
+    temp = f"{manifest}.{os.getpid()}.tmp"
+    with open(temp, "w", encoding="utf-8") as f:
+        json.dump(variants, f)
+    os.replace(temp, manifest)
+    return variants
+
+
+def remove_variants(source: str):
+    """Delete the variants directory of an upload"""
+    target_dir = os.path.splitext(source)[0]
+    if not os.path.isdir(target_dir):
+        return
+    for name in os.listdir(target_dir):
+        os.remove(os.path.join(target_dir, name))
+    os.rmdir(target_dir)
+
+
+def is_upload_path(filename: str) -> bool:
+    """`filename` (relative to /uploads/) names a file inside UPLOAD_DIR, not hidden or outside it"""
+    return bool(filename) and all(part and not part.startswith(".") for part in filename.split("/"))
+
+
+def variant_urls(base_url: str, variants: dict) -> dict:
+    """Variant map with file names turned into URLs under base_url (.../uploads)"""
+    return {
+        name: {key: f"{base_url}/{value}" if isinstance(value, str) else value for key, value in variant.items()}
+        for name, variant in variants.items()
+    }
+
+
+def upload_variants(url: str) -> dict:
+    """Variant map (URLs) of an image URL served from /uploads, {} for other or older images"""
+    parts = urlsplit(url or "")
+    prefix, sep, filename = parts.path.partition("/uploads/")
+    if not sep or not is_upload_path(filename):
+        return {}
+    manifest = os.path.join(UPLOAD_DIR, *os.path.splitext(filename)[0].split("/"), MANIFEST)
+    try:
+        with open(manifest, encoding="utf-8") as f:
+            variants = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    base_url = parts._replace(path=prefix + "/uploads", query="", fragment="").geturl()
+    return variant_urls(base_url, variants)
+
+
+def collect_variants(urls, supplied: dict = None) -> dict:
+    """
+    image_variants value for a row showing `urls`: the variants sent by the client
+    when given, otherwise those recorded at upload; images without variants are left out
+    """
+    supplied = supplied or {}
+    result = {}
+    for url in dict.fromkeys(u for u in urls if u):
+        variants = supplied.get(url) or upload_variants(url)
+        if variants:
+            result[url] = variants
+    return result
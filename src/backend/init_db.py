@@ -5,6 +5,7 @@ Run this script once to set up the database
 from database import init_db, SessionLocal, User, Product, Collection
 from database import ContentHero, ContentPromoBanner, ContentHeritage
 from auth import get_password_hash
+import collection_links  # fills Product.collection_id on flush
 import json
 
 def create_default_data():
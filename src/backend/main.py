@@ -9,21 +9,29 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # 3. Теперь остальные импорты (FastAPI и ваши модули)
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 # Ваши модули (теперь они увидят переменные окружения при инициализации)
 from database import init_db
-from routes import admin, products, collections, orders, content, upload, bookings, products_export, settings, payme, promocodes
-
-# Initialize database
-init_db()
+from fast_json import FastJSONResponse
+from search_index import init_search_index
+from collection_counts import init_collection_counts
+from product_features import init_product_features
+from change_versions import init_table_versions
+from conditional_get import ConditionalGetMiddleware
+from product_feed import init_static_feed
+from blocking_routes import check_blocking_routes
+from migrate import warn_pending_migrations
+from image_variants import shutdown_image_pool
+from routes import admin, products, collections, orders, content, upload, images, bookings, products_export, settings, payme, promocodes
 
 app = FastAPI(
     title="Orient Watch API",
     description="API for Orient Watch e-commerce platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # CORS - Get allowed origins from environment variable
@@ -36,6 +44,9 @@ allowed_origins = [origin.strip() for origin in cors_origins.split(",")]
 
 print(f"🌐 CORS enabled for origins: {allowed_origins}")
 
+# ETag / 304 for public catalog and content (inside CORS, so 304s carry CORS headers too)
+app.add_middleware(ConditionalGetMiddleware)
+
 # CORS middleware - MUST be added before routes
 app.add_middleware(
     CORSMiddleware,
@@ -55,15 +66,45 @@ app.include_router(collections.router)
 app.include_router(orders.router)
 app.include_router(content.router)
 app.include_router(upload.router)
+app.include_router(images.router)
 app.include_router(bookings.router)
 app.include_router(settings.router)
 app.include_router(payme.router)
 app.include_router(promocodes.router)
+
+# Endpoints with a DB session must be plain def (they run in the threadpool, not on the event loop)
+check_blocking_routes(app)
+
+# Initialize database
+# In a startup hook, not at import: image pool workers (image_variants.py) import the
+# main module again, and must not re-run schema setup, migrations checks or the feed build
+@app.on_event("startup")
+def initialize_database():
+    init_db()
+    init_search_index()
+    init_collection_counts()
+    init_product_features()
+    init_table_versions()
+    init_static_feed()
+    warn_pending_migrations()
+
+# Threadpool for def endpoints (anyio default: 40 threads)
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "0"))
+
+@app.on_event("startup")
+async def configure_threadpool():
+    if THREADPOOL_SIZE:
+        to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
+@app.on_event("shutdown")
+def stop_image_pool():
+    shutdown_image_pool()
+
 # Mount uploads directory AFTER routes
 upload_dir = os.getenv("UPLOAD_DIR", "uploads")
 if not os.path.exists(upload_dir):
     os.makedirs(upload_dir)
-app.mount("/uploads", StaticFiles(directory=upload_dir), name="uploads")
+app.mount("/uploads", images.UploadStaticFiles(directory=upload_dir), name="uploads")
 
 @app.get("/")
 def read_root():
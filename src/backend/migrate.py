@@ -0,0 +1,232 @@
+"""
+Versioned migrations
+migrations/mNNNN_<name>.py modules run in order and are recorded in schema_version.
+Data backfills go through MigrationContext.backfill: keyset chunks, one commit per
+chunk and the last key saved with it, so a large backfill runs next to live traffic
+and an interrupted run continues where it stopped.
+
+Usage: python migrate.py [--status] [--to N] [--batch-size 500] [--pause-ms 50]
+"""
+import argparse
+import importlib
+import os
+import pkgutil
+import re
+import time
+from datetime import datetime
+
+from sqlalchemy import func
+
+import database
+import change_versions  # registers the listeners: data migrations bump table_versions too
+import collection_links  # and products written by migrations get their collection_id
+from database import SessionLocal, SchemaVersion
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "500"))
+# Pause between chunks so request writes get the (single) writer connection in between
+MIGRATION_PAUSE_MS = float(os.getenv("MIGRATION_PAUSE_MS", "50"))
+
+_MODULE_NAME = re.compile(r"^m(\d{4})_(\w+)$")
+
+
+class Migration:
+    def __init__(self, version: int, name: str, module):
+        self.version = version
+        self.name = name
+        self.module = module
+
+    @property
+    def description(self) -> str:
+        return (self.module.__doc__ or self.name).strip().splitlines()[0]
+
+
+def discover_migrations() -> list:
+    """All migrations/mNNNN_*.py modules, ordered by version"""
+    migrations = []
+    for info in pkgutil.iter_modules([MIGRATIONS_DIR]):
+        match = _MODULE_NAME.match(info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"migrations.{info.name}")
+        migrations.append(Migration(int(match.group(1)), match.group(2), module))
+    migrations.sort(key=lambda m: m.version)
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions in {MIGRATIONS_DIR}")
+    return migrations
+
+
+def applied_versions(bind=None) -> set:
+    bind = bind or database.engine
+    SchemaVersion.__table__.create(bind=bind, checkfirst=True)
+    db = SessionLocal(bind=bind)
+    try:
+        rows = db.query(SchemaVersion.version).filter(SchemaVersion.applied_at.isnot(None))
+        return {row.version for row in rows}
+    finally:
+        db.close()
+
+
+def pending_migrations(bind=None) -> list:
+    applied = applied_versions(bind)
+    return [m for m in discover_migrations() if m.version not in applied]
+
+
+class MigrationContext:
+    """What a migration's upgrade(ctx) gets: the engine and the chunked backfill helper"""
+
+    def __init__(self, migration: Migration, bind, batch_size: int = MIGRATION_BATCH_SIZE,
+                 pause_ms: float = MIGRATION_PAUSE_MS):
+        self.migration = migration
+        self.bind = bind
+        self.batch_size = batch_size
+        self.pause = pause_ms / 1000
+
+    def session(self):
+        # SessionLocal so the change_versions listeners see data changes (ETags move on)
+        return SessionLocal(bind=self.bind)
+
+    def backfill(self, key, columns, apply, where=None) -> int:
+        """
+        Call apply(db, rows) for rows of `columns` in `key` order, batch_size rows per
+        transaction; `key` must be unique (primary key). One backfill per migration:
+        the resume point is stored in its schema_version row. Returns rows processed in this run.
+        """
+        version = self.migration.version
+        db = self.session()
+        try:
+            state = db.get(SchemaVersion, version)
+            cursor = key.type.python_type(state.cursor) if state.cursor is not None else None
+            total_query = db.query(func.count(key))
+            if where is not None:
+                total_query = total_query.filter(where)
+            total = total_query.scalar()
+            done = state.rows_done or 0
+        finally:
+            db.close()
+
+        if cursor is not None:
+            print(f"   resuming after {key.key}={cursor!r} ({done} rows done)")
+
+        processed = 0
+        while True:
+            db = self.session()
+            try:
+                query = db.query(*columns, key.label("_migration_key"))
+                if where is not None:
+                    query = query.filter(where)
+                if cursor is not None:
+                    query = query.filter(key > cursor)
+                rows = query.order_by(key).limit(self.batch_size).all()
+                if not rows:
+                    return processed
+
+                apply(db, rows)
+                cursor = rows[-1]._migration_key
+                done += len(rows)
+                db.query(SchemaVersion).filter(SchemaVersion.version == version).update(
+                    {"cursor": str(cursor), "rows_done": done}, synchronize_session=False
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+            processed += len(rows)
+            percent = f" ({min(done, total) * 100 // total}%)" if total else ""
+            print(f"   {done}/{total} rows{percent}")
+            if self.pause:
+                time.sleep(self.pause)
+
+
+def _start(migration: Migration, bind):
+    """schema_version row for a migration about to run (kept if it is a resumed run)"""
+    db = SessionLocal(bind=bind)
+    try:
+        if db.get(SchemaVersion, migration.version) is None:
+            db.add(SchemaVersion(version=migration.version, name=migration.name))
+            db.commit()
+    finally:
+        db.close()
+
+
+def _finish(migration: Migration, bind):
+    db = SessionLocal(bind=bind)
+    try:
+        db.query(SchemaVersion).filter(SchemaVersion.version == migration.version).update(
+            {"applied_at": datetime.utcnow()}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_migrations(bind=None, target: int = None, batch_size: int = MIGRATION_BATCH_SIZE,
+                   pause_ms: float = MIGRATION_PAUSE_MS) -> list:
+    """Apply pending migrations up to `target` (all by default), returns the versions applied"""
+    bind = bind or database.engine
+    applied = []
+    for migration in pending_migrations(bind):
+        if target is not None and migration.version > target:
+            break
+        print(f"🔄 {migration.version:04d} {migration.name}: {migration.description}")
+        started = time.perf_counter()
+        _start(migration, bind)
+        migration.module.upgrade(MigrationContext(migration, bind, batch_size, pause_ms))
+        _finish(migration, bind)
+        applied.append(migration.version)
+        print(f"✅ {migration.version:04d} done in {time.perf_counter() - started:.1f}s")
+    return applied
+
+
+def print_status(bind=None):
+    bind = bind or database.engine
+    SchemaVersion.__table__.create(bind=bind, checkfirst=True)
+    db = SessionLocal(bind=bind)
+    try:
+        rows = {row.version: row for row in db.query(SchemaVersion)}
+    finally:
+        db.close()
+    for migration in discover_migrations():
+        row = rows.get(migration.version)
+        if row is None:
+            state = "pending"
+        elif row.applied_at is None:
+            state = f"in progress ({row.rows_done or 0} rows, after {row.cursor!r})"
+        else:
+            state = f"applied {row.applied_at:%Y-%m-%d %H:%M}"
+        print(f"{migration.version:04d} {migration.name:<32} {state}")
+
+
+def warn_pending_migrations():
+    """Startup hint, migrations themselves are never run by the app"""
+    try:
+        pending = pending_migrations()
+    except Exception as e:
+        print(f"⚠️ Could not check migrations: {e}")
+        return
+    if pending:
+        print(f"⚠️ {len(pending)} pending migration(s), run: python migrate.py")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply database migrations")
+    parser.add_argument("--status", action="store_true", help="list migrations and their state")
+    parser.add_argument("--to", type=int, help="stop after this version")
+    parser.add_argument("--batch-size", type=int, default=MIGRATION_BATCH_SIZE)
+    parser.add_argument("--pause-ms", type=float, default=MIGRATION_PAUSE_MS)
+    args = parser.parse_args()
+
+    if args.status:
+        print_status()
+        return
+    applied = run_migrations(target=args.to, batch_size=args.batch_size, pause_ms=args.pause_ms)
+    print(f"\n✅ {len(applied)} migration(s) applied" if applied else "✅ Database is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Helpers for migrations/ (see migrate.py) that work on SQLite and PostgreSQL
+Each change runs in its own transaction (a failed statement aborts the whole
+transaction on PostgreSQL) and is skipped when the schema already has it
+"""
+from sqlalchemy import inspect, text
+
+from database import engine
+
+
+def has_column(table: str, column: str, bind=None) -> bool:
+    return column in {c["name"] for c in inspect(bind or engine).get_columns(table)}
+
+
+def add_column(table: str, column: str, definition: str, bind=None) -> bool:
+    """
+    ALTER TABLE ... ADD COLUMN unless it exists, e.g. add_column("products", "brand", "VARCHAR DEFAULT 'Orient'").
+    Returns True if the column was added.
+    """
+    bind = bind or engine
+    if has_column(table, column, bind):
+        print(f"ℹ️  {table}.{column} already exists")
+        return False
+    with bind.begin() as conn:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {definition}"))
+    print(f"✅ Added {table}.{column}")
+    return True
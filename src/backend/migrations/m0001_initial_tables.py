@@ -0,0 +1,9 @@
+"""
+Create missing tables (bookings, settings, boutique, history, policies, logo, promocodes, transactions, ...)
+Replaces migrate_bookings / migrate_logo / migrate_promocodes / migrate_transactions
+"""
+from database import Base
+
+
+def upgrade(ctx):
+    Base.metadata.create_all(bind=ctx.bind)
@@ -0,0 +1,18 @@
+"""
+Extended filter and SEO / Open Graph columns on products
+Replaces migrate_extended_filters / migrate_seo_fields
+"""
+from migration_utils import add_column
+
+
+def upgrade(ctx):
+    add_column("products", "brand", "VARCHAR DEFAULT 'Orient'", bind=ctx.bind)
+    add_column("products", "gender", "VARCHAR", bind=ctx.bind)
+    add_column("products", "case_diameter", "FLOAT", bind=ctx.bind)
+    add_column("products", "strap_material", "VARCHAR", bind=ctx.bind)
+
+    add_column("products", "seo_title", "VARCHAR", bind=ctx.bind)
+    add_column("products", "seo_description", "TEXT", bind=ctx.bind)
+    add_column("products", "seo_keywords", "VARCHAR", bind=ctx.bind)
+    add_column("products", "fb_title", "VARCHAR", bind=ctx.bind)
+    add_column("products", "fb_description", "TEXT", bind=ctx.bind)
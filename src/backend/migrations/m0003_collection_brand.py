@@ -0,0 +1,9 @@
+"""
+Brand on collections
+Replaces migrate_collection_brand
+"""
+from migration_utils import add_column
+
+
+def upgrade(ctx):
+    add_column("collections", "brand", "VARCHAR DEFAULT 'Orient'", bind=ctx.bind)
@@ -0,0 +1,17 @@
+"""
+Favicon, hero mobile image and button colors, boutique opening hours
+Replaces migrate_favicon / migrate_hero_mobile / migrate_hero_colors / fix_boutique_table
+"""
+from migration_utils import add_column
+
+
+def upgrade(ctx):
+    add_column("content_site_logo", "favicon_url", "VARCHAR DEFAULT ''", bind=ctx.bind)
+
+    add_column("content_hero", "mobile_image", "VARCHAR DEFAULT ''", bind=ctx.bind)
+    add_column("content_hero", "button_text_color", "VARCHAR DEFAULT '#FFFFFF'", bind=ctx.bind)
+    add_column("content_hero", "button_bg_color", "VARCHAR DEFAULT 'transparent'", bind=ctx.bind)
+    add_column("content_hero", "button_hover_text_color", "VARCHAR DEFAULT '#000000'", bind=ctx.bind)
+    add_column("content_hero", "button_hover_bg_color", "VARCHAR DEFAULT '#FFFFFF'", bind=ctx.bind)
+
+    add_column("content_boutique", "info_hours", "VARCHAR DEFAULT 'Пн-Вс: 10:00 - 22:00'", bind=ctx.bind)
@@ -0,0 +1,105 @@
+"""
+Default settings, boutique page, history events and policy pages (only where missing)
+Replaces migrate_settings / migrate_boutique / migrate_history / migrate_policies
+"""
+import json
+
+from database import Settings, ContentBoutique, ContentHistoryEvent, ContentPolicy
+
+DEFAULT_SERVICES = [
+    {"id": "1", "title": "Персональная консультация", "description": "Помощь в выборе идеальных часов"},
+    {"id": "2", "title": "Сервисное обслуживание", "description": "Ремонт и обслуживание ваших часов"},
+]
+
+DEFAULT_HISTORY = [
+    {
+        "year": "1950",
+        "title": "ОСНОВАНИЕ",
+        "description": "Orient Watch Company была основана в Токио с миссией создавать доступные, но качественные механические часы для японского рынка. С самого начала компания фокусировалась на собственном производстве механизмов.",
+        "image": "https://images.unsplash.com/photo-1509048191080-d2984bad6ae5?w=800&q=80",
+    },
+    {
+        "year": "1970",
+        "title": "ТЕХНОЛОГИЧЕСКИЙ ПРОРЫВ",
+        "description": "Запуск собственного автоматического механизма Orient 46 серии, который стал основой для многих будущих моделей. Этот механизм отличался надежностью и точностью хода.",
+        "image": "https://images.unsplash.com/photo-1587836374828-4dbafa94cf0e?w=800&q=80",
+    },
+    {
+        "year": "1990",
+        "title": "МИРОВОЕ ПРИЗНАНИЕ",
+        "description": "Orient выходит на международный рынок и получает признание за качество своих механических часов. Запуск культовой коллекции Bambino, которая становится символом доступной элегантности.",
+        "image": "https://images.unsplash.com/photo-1524805444758-089113d48a6d?w=800&q=80",
+    },
+    {
+        "year": "2009",
+        "title": "НОВАЯ ЭРА",
+        "description": "Orient присоединяется к Seiko Epson Corporation, получая доступ к передовым технологиям, сохраняя при этом свою уникальную идентичность и независимость в дизайне.",
+        "image": "https://images.unsplash.com/photo-1522312346375-d1a52e2b99b3?w=800&q=80",
+    },
+    {
+        "year": "2025",
+        "title": "СОВРЕМЕННОСТЬ",
+        "description": "Сегодня Orient продолжает традиции японского часового мастерства, создавая механические часы высочайшего качества. Каждая модель сочетает проверенные временем технологии с современным дизайном.",
+        "image": "https://images.unsplash.com/photo-1614164185128-e4ec99c436d7?w=800&q=80",
+    },
+]
+
+DEFAULT_POLICIES = [
+    {"slug": "privacy", "title": "Политика конфиденциальности",
+     "content": "<p>Здесь будет текст политики конфиденциальности...</p>"},
+    {"slug": "warranty", "title": "Гарантия качества",
+     "content": "<p>Информация о гарантийном обслуживании...</p>"},
+    {"slug": "return", "title": "Возврат и обмен",
+     "content": "<p>Условия возврата товара...</p>"},
+    {"slug": "delivery", "title": "Доставка и оплата",
+     "content": "<p>Информация о доставке...</p>"},
+]
+
+
+def upgrade(ctx):
+    db = ctx.session()
+    try:
+        if not db.query(Settings).filter(Settings.id == 1).first():
+            print("   creating default settings")
+            db.add(Settings(
+                id=1,
+                site_name="Orient Watch",
+                site_email="info@orient.uz",
+                site_phone="+998 71 123 45 67",
+                site_address="Ташкент, Узбекистан",
+                free_shipping_threshold=100000,
+                standard_shipping_cost=50000,
+                express_shipping_cost=100000,
+                currency_code="UZS",
+                currency_symbol="₽",
+                facebook_url="https://facebook.com/orient",
+                instagram_url="https://instagram.com/orient",
+                twitter_url="https://twitter.com/orient"
+            ))
+
+        if not db.query(ContentBoutique).filter(ContentBoutique.id == 1).first():
+            print("   creating default boutique content")
+            db.add(ContentBoutique(
+                id=1,
+                hero_title="ФЛАГМАНСКИЙ БУТИК",
+                hero_description="Погрузитесь в мир японского часового искусства в центре города.",
+                hero_image="https://images.unsplash.com/photo-1441986300917-64674bd600d8?w=1200&q=80",
+                info_heading="Атмосфера",
+                info_hours="Пн-Вс: 10:00 - 22:00",
+                info_text="Наш бутик — это пространство, где время замедляет свой ход...",
+                services=json.dumps(DEFAULT_SERVICES)
+            ))
+
+        if db.query(ContentHistoryEvent).count() == 0:
+            print("   creating default history events")
+            db.add_all(ContentHistoryEvent(order=i, **event) for i, event in enumerate(DEFAULT_HISTORY, 1))
+
+        existing = {slug for (slug,) in db.query(ContentPolicy.slug)}
+        for policy in DEFAULT_POLICIES:
+            if policy["slug"] not in existing:
+                print(f"   creating policy {policy['slug']}")
+                db.add(ContentPolicy(**policy))
+
+        db.commit()
+    finally:
+        db.close()
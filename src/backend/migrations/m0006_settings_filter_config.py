@@ -0,0 +1,30 @@
+"""
+filter_config on settings with the default price ranges
+Replaces migrate_filter_config
+"""
+import json
+
+from database import Settings
+from migration_utils import add_column
+
+DEFAULT_FILTER_CONFIG = {
+    "priceRanges": [
+        {"id": "1", "label": "До 1 000 000 сум", "min": 0, "max": 1000000},
+        {"id": "2", "label": "1 000 000 - 3 000 000 сум", "min": 1000000, "max": 3000000},
+        {"id": "3", "label": "От 3 000 000 сум", "min": 3000000, "max": 0}
+    ]
+}
+
+
+def upgrade(ctx):
+    add_column("settings", "filter_config", "TEXT", bind=ctx.bind)
+
+    db = ctx.session()
+    try:
+        settings = db.query(Settings).filter(Settings.id == 1).first()
+        if settings and not settings.filter_config:
+            settings.filter_config = json.dumps(DEFAULT_FILTER_CONFIG, ensure_ascii=False)
+            db.commit()
+            print("   default filter configuration set")
+    finally:
+        db.close()
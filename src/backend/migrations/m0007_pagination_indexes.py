@@ -0,0 +1,22 @@
+"""
+Composite indexes for keyset (cursor) pagination
+Replaces migrate_sort_indexes
+"""
+from sqlalchemy import text
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_products_price_id ON products (price, id)",
+    "CREATE INDEX IF NOT EXISTS ix_products_name_id ON products (name, id)",
+    "CREATE INDEX IF NOT EXISTS ix_products_created_at_id ON products (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_products_popular ON products (is_featured, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_orders_created_at_id ON orders (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_orders_status_created_at_id ON orders (status, created_at, id)",
+]
+
+
+def upgrade(ctx):
+    for statement in INDEXES:
+        with ctx.bind.begin() as conn:
+            conn.execute(text(statement))
+    with ctx.bind.begin() as conn:
+        conn.execute(text("ANALYZE"))
@@ -0,0 +1,10 @@
+"""
+Backfill product_features from products.features
+Replaces migrate_product_features
+"""
+from database import Product
+from product_features import sync_features_batch
+
+
+def upgrade(ctx):
+    ctx.backfill(Product.id, [Product.id, Product.features], sync_features_batch)
@@ -0,0 +1,12 @@
+"""
+products_fts full-text index and its sync triggers (SQLite only)
+Replaces migrate_fts
+"""
+from search_index import init_search_index
+
+
+def upgrade(ctx):
+    if ctx.bind.dialect.name != "sqlite":
+        print(f"ℹ️  {ctx.bind.dialect.name}: FTS5 is SQLite only, search uses the LIKE fallback")
+        return
+    init_search_index(bind=ctx.bind, rebuild=True)
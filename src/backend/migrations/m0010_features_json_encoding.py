@@ -0,0 +1,36 @@
+"""
+Re-save features / specs JSON with readable Cyrillic (ensure_ascii=False)
+Replaces fix_features_encoding
+"""
+import json
+
+from database import Product
+
+
+def _reencoded(raw):
+    """Same JSON without \\u escapes, None if unchanged or not JSON"""
+    if not raw:
+        return None
+    try:
+        fixed = json.dumps(json.loads(raw), ensure_ascii=False)
+    except ValueError:
+        return None
+    return fixed if fixed != raw else None
+
+
+def fix_batch(db, rows):
+    for row in rows:
+        changes = {}
+        features, specs = _reencoded(row.features), _reencoded(row.specs)
+        if features is not None:
+            changes["features"] = features
+        if specs is not None:
+            changes["specs"] = specs
+        if changes:
+            db.query(Product).filter(Product.id == row.id).update(changes, synchronize_session=False)
+
+
+def upgrade(ctx):
+    # Only rows with an escape sequence can change
+    escaped = Product.features.contains("\\u", autoescape=True) | Product.specs.contains("\\u", autoescape=True)
+    ctx.backfill(Product.id, [Product.id, Product.features, Product.specs], fix_batch, where=escaped)
@@ -0,0 +1,11 @@
+"""
+collections.product_count, maintained by triggers
+Replaces the per-collection COUNT(*) of the collections endpoints
+"""
+from collection_counts import init_collection_counts
+from migration_utils import add_column
+
+
+def upgrade(ctx):
+    add_column("collections", "product_count", "INTEGER NOT NULL DEFAULT 0", bind=ctx.bind)
+    init_collection_counts(bind=ctx.bind, rebuild=True)
@@ -0,0 +1,46 @@
+"""
+products.collection_id (FK to collections.id) with a backfill from the collection name
+Collection pages and counts move from name matching to the id
+"""
+from sqlalchemy import text, update
+
+from database import Collection, Product
+from collection_counts import init_collection_counts
+from migration_utils import add_column
+
+
+def upgrade(ctx):
+    add_column("products", "collection_id", "VARCHAR REFERENCES collections(id) ON DELETE SET NULL", bind=ctx.bind)
+
+    db = ctx.session()
+    try:
+        ids = {name: id for id, name in db.query(Collection.id, Collection.name)}
+    finally:
+        db.close()
+
+    def link(db, rows):
+        by_collection = {}
+        for row in rows:
+            if row.collection in ids:
+                by_collection.setdefault(ids[row.collection], []).append(row.id)
+        for collection_id, product_ids in by_collection.items():
+            db.execute(
+                update(Product)
+                .where(Product.id.in_(product_ids))
+                # updated_at is kept: the product itself did not change
+                .values(collection_id=collection_id, updated_at=Product.updated_at)
+            )
+
+    ctx.backfill(Product.id, [Product.id, Product.collection], link, where=Product.collection_id.is_(None))
+
+    index = "ix_products_collection_popular ON products (collection_id, is_featured, created_at, id)"
+    if ctx.bind.dialect.name == "postgresql":
+        # Without blocking writes; CONCURRENTLY cannot run inside a transaction
+        with ctx.bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index}"))
+    else:
+        with ctx.bind.begin() as conn:
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index}"))
+
+    # Counts switch from the name to collection_id
+    init_collection_counts(bind=ctx.bind, rebuild=True)
@@ -0,0 +1,11 @@
+"""
+image_variants columns: resized upload variants per image URL (see image_variants.py)
+Images uploaded before this version have no variants and keep being served as is
+"""
+from migration_utils import add_column
+
+
+def upgrade(ctx):
+    add_column("products", "image_variants", "TEXT", bind=ctx.bind)
+    add_column("content_hero", "image_variants", "TEXT DEFAULT '{}'", bind=ctx.bind)
+    add_column("content_boutique", "image_variants", "TEXT DEFAULT '{}'", bind=ctx.bind)
@@ -0,0 +1,178 @@
+"""
+Move uploads to content-addressed names: uploads/<uuid>.<ext> -> uploads/ab/cd/<hash>.<ext>
+Identical files become one. URLs in products, collections and content rows are rewritten.
+
+Runs next to live traffic and can be re-run after an interruption:
+1. the old -> new name plan is computed once and saved in UPLOAD_DIR/.rehash.json
+2. files and variant directories are hard-linked (copied if linking fails) to the new names
+3. rows are rewritten; every URL still resolves meanwhile
+4. the static product feed is rebuilt with the new URLs
+5. the old names are deleted
+"""
+import json
+import os
+import re
+import shutil
+
+from database import (
+    Product, Collection, ContentBoutique, ContentHero, ContentHistoryEvent,
+    ContentPolicy, ContentSiteLogo,
+)
+from image_variants import UPLOAD_DIR, MANIFEST
+from product_cache import product_cache
+from product_feed import write_static_feeds
+from routes.upload import ALLOWED_EXTENSIONS
+from upload_stream import file_digest, stored_name
+
+PLAN_FILE = os.path.join(UPLOAD_DIR, ".rehash.json")
+
+# First path segment after /uploads/: an upload (<uuid>.jpg) or its variants directory (<uuid>/...)
+UPLOAD_REF = re.compile(r"/uploads/([^/\"'?#\s<>]+)")
+
+# Columns holding upload URLs (plain, inside JSON or inside HTML)
+CONTENT_COLUMNS = {
+    Collection: ["image", "description"],
+    ContentBoutique: ["hero_image", "info_image", "gallery", "image_variants"],
+    ContentHero: ["image", "mobile_image", "image_variants"],
+    ContentHistoryEvent: ["image"],
+    ContentPolicy: ["content"],
+    ContentSiteLogo: ["logo_url", "logo_dark_url"],
+}
+PRODUCT_COLUMNS = ["image", "images", "image_variants", "description"]
+
+
+def load_plan() -> dict:
+    """{old file name: new file name} of the files at the top of UPLOAD_DIR"""
+    try:
+        with open(PLAN_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        pass
+    if not os.path.isdir(UPLOAD_DIR):
+        return {}
+    plan = {}
+    for name in sorted(os.listdir(UPLOAD_DIR)):
+        path = os.path.join(UPLOAD_DIR, name)
+        ext = os.path.splitext(name)[1].lower()
+        if name.startswith(".") or ext not in ALLOWED_EXTENSIONS or not os.path.isfile(path):
+            continue
+        plan[name] = stored_name(file_digest(path), ext)
+    temp = f"{PLAN_FILE}.tmp"
+    with open(temp, "w", encoding="utf-8") as f:
+        json.dump(plan, f)
+    os.replace(temp, PLAN_FILE)
+    return plan
+
+
+def _link(source: str, target: str):
+    if os.path.exists(target):
+        return
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def link_files(plan: dict):
+    """Make every planned file (and its variants) available under the new name"""
+    for old, new in plan.items():
+        source = os.path.join(UPLOAD_DIR, old)
+        if os.path.exists(source):
+            _link(source, os.path.join(UPLOAD_DIR, new))
+
+        old_stem, new_stem = os.path.splitext(old)[0], os.path.splitext(new)[0]
+        old_dir, new_dir = os.path.join(UPLOAD_DIR, old_stem), os.path.join(UPLOAD_DIR, new_stem)
+        if not os.path.isdir(old_dir) or os.path.exists(os.path.join(new_dir, MANIFEST)):
+            continue
+        for name in os.listdir(old_dir):
+            if name != MANIFEST:
+                _link(os.path.join(old_dir, name), os.path.join(new_dir, name))
+        # Manifest last (its presence means the variants are complete), with the new names
+        try:
+            with open(os.path.join(old_dir, MANIFEST), encoding="utf-8") as f:
+                variants = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for variant in variants.values():
+            for key, value in variant.items():
+                if isinstance(value, str) and value.startswith(old_stem + "/"):
+                    variant[key] = new_stem + value[len(old_stem):]
+        with open(os.path.join(new_dir, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(variants, f)
+
+
+def renames(plan: dict) -> dict:
+    """Old -> new first path segment: file names and variant directory names"""
+    result = {os.path.splitext(old)[0]: os.path.splitext(new)[0] for old, new in plan.items()}
+    result.update(plan)
+    return result
+
+
+def rewrite(value, names: dict):
+    """`value` with upload URLs renamed, None if it has none"""
+    if not value:
+        return None
+    fixed = UPLOAD_REF.sub(lambda m: "/uploads/" + names.get(m.group(1), m.group(1)), value)
+    return fixed if fixed != value else None
+
+
+def rewrite_rows(db, model, columns: list, names: dict, rows):
+    for row in rows:
+        changes = {}
+        for column in columns:
+            fixed = rewrite(getattr(row, column), names)
+            if fixed is not None:
+                changes[column] = fixed
+        if changes:
+            db.query(model).filter(model.id == row.id).update(changes, synchronize_session=False)
+
+
+def remove_old(plan: dict):
+    for old in plan:
+        path = os.path.join(UPLOAD_DIR, old)
+        if os.path.exists(path):
+            os.remove(path)
+        old_dir = os.path.join(UPLOAD_DIR, os.path.splitext(old)[0])
+        if os.path.isdir(old_dir):
+            shutil.rmtree(old_dir)
+
+
+def upgrade(ctx):
+    plan = load_plan()
+    if not plan:
+        print("ℹ️  No uploads to move")
+    else:
+        print(f"   {len(plan)} uploads -> {len(set(plan.values()))} distinct files")
+    link_files(plan)
+
+    if plan:
+        names = renames(plan)
+        columns = [getattr(Product, column) for column in PRODUCT_COLUMNS]
+        referencing = columns[0].contains("/uploads/")
+        for column in columns[1:]:
+            referencing = referencing | column.contains("/uploads/")
+        ctx.backfill(
+            Product.id, [Product.id, *columns],
+            lambda db, rows: rewrite_rows(db, Product, PRODUCT_COLUMNS, names, rows),
+            where=referencing,
+        )
+
+        db = ctx.session()
+        try:
+            for model, model_columns in CONTENT_COLUMNS.items():
+                rows = db.query(model.id, *(getattr(model, column) for column in model_columns)).all()
+                rewrite_rows(db, model, model_columns, names, rows)
+            db.commit()
+        finally:
+            db.close()
+
+        # The pre-rendered feed still has the old URLs: replaced before they stop resolving.
+        # Content snapshots follow table versions (bumped by the writes above); cached
+        # product JSON is dropped in case this runs inside the app process
+        write_static_feeds()
+        product_cache.clear()
+
+    remove_old(plan)
+    if os.path.exists(PLAN_FILE):
+        os.remove(PLAN_FILE)
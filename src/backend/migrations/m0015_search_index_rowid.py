@@ -0,0 +1,12 @@
+"""
+products_fts entries stored under the product's rowid (product_id is kept for the
+search join), so the sync triggers delete by key rather than scanning the index (SQLite only)
+"""
+from search_index import init_search_index
+
+
+def upgrade(ctx):
+    if ctx.bind.dialect.name != "sqlite":
+        print(f"ℹ️  {ctx.bind.dialect.name}: FTS5 is SQLite only, nothing to convert")
+        return
+    init_search_index(bind=ctx.bind, rebuild=True)
@@ -0,0 +1,113 @@
+"""
+Keyset (cursor) pagination helpers
+The cursor is an opaque token with the sort key of the last row of the page,
+so the next page is a range scan instead of OFFSET
+"""
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, literal
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(sort: str, values: list) -> str:
+    """Pack the sort name and the last row's key into a URL-safe token"""
+    payload = json.dumps({"s": sort, "k": [_encode_value(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, size: int) -> list:
+    """Unpack a cursor made by encode_cursor for the same sort (400 otherwise)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = [_decode_value(v) for v in payload["k"]]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if payload.get("s") != sort or len(values) != size:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sort")
+    return values
+
+
+def order_columns(columns: list, descending: bool) -> list:
+    """
+    ORDER BY clauses, all columns in the same direction.
+    NULL placement is spelled out (SQLite order: NULL lowest) so PostgreSQL,
+    whose default is the opposite, pages the same way.
+    """
+    return [c.desc().nulls_last() if descending else c.asc().nulls_first() for c in columns]
+
+
+def keyset_filter(columns: list, values: list, descending: bool):
+    """
+    Rows strictly after `values` in ORDER BY order.
+    Written out column by column (not a row-value compare) so NULLs keep
+    SQLite ordering: NULL is lower than any value.
+    """
+    # Values go through literal() so booleans can be range-compared too
+    def after(column, value):
+        if value is None:
+            return None if descending else column.isnot(None)
+        bound = literal(value, column.type)
+        return or_(column < bound, column.is_(None)) if descending else column > bound
+
+    def same(column, value):
+        return column.is_(None) if value is None else column == literal(value, column.type)
+
+    branches = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        step = after(column, value)
+        if step is not None:
+            branches.append(and_(*[same(c, v) for c, v in zip(columns[:i], values[:i])], step))
+    return or_(*branches)
+
+
+def paginate_keyset(query, sort: str, columns: list, descending: bool, cursor: str, limit: int):
+    """
+    One page of `query` ordered by `columns`, starting after `cursor` ("" = first page).
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        values = decode_cursor(cursor, sort, len(columns))
+        query = query.filter(keyset_filter(columns, values, descending))
+
+    rows = query.order_by(*order_columns(columns, descending)).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(sort, [getattr(last, c.key) for c in columns])
+
+
+def offset_pagination(page: int, limit: int, total) -> dict:
+    """`pagination` block of a page-mode response (total may be skipped)"""
+    return {
+        "page": page,
+        "limit": limit,
+        "total": total,
+        "totalPages": (total + limit - 1) // limit if total is not None else None,
+    }
+
+
+def cursor_pagination(limit: int, next_cursor, total=None) -> dict:
+    """`pagination` block of a cursor-mode response"""
+    return {
+        "limit": limit,
+        "nextCursor": next_cursor,
+        "hasMore": next_cursor is not None,
+        "total": total,
+    }
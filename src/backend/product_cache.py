@@ -0,0 +1,82 @@
+"""
+Pre-serialized product JSON
+LRU of encoded product representations keyed by (kind, id, updated_at);
+list responses are assembled by splicing the cached bytes
+"""
+import os
+import threading
+from collections import OrderedDict
+from fastapi.responses import Response
+
+from fast_json import dumps as encode_json
+
+
+class ProductJSONCache:
+    """Thread-safe LRU: (kind, product id, updated_at) -> JSON bytes"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, product, kind: str, build) -> bytes:
+        """Cached bytes of build(product), encoded on first use"""
+        key = (kind, product.id, product.updated_at)
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+                return data
+
+        data = encode_json(build(product))
+        with self._lock:
+            self._items[key] = data
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return data
+
+    def invalidate(self, product_id: str):
+        """Drop every representation of one product"""
+        with self._lock:
+            for key in [k for k in self._items if k[1] == product_id]:
+                del self._items[key]
+
+    def clear(self):
+        """Drop everything (bulk writes)"""
+        with self._lock:
+            self._items.clear()
+
+
+product_cache = ProductJSONCache(int(os.getenv("PRODUCT_CACHE_SIZE", "10000")))
+
+
+def product_json(product, fields: tuple = None) -> bytes:
+    """Product.to_dict(fields) as JSON bytes"""
+    if fields is None:
+        return product_cache.get(product, "dict", lambda p: p.to_dict())
+    return product_cache.get(product, ",".join(fields), lambda p: p.to_dict(fields))
+
+
+def product_feed_json(product) -> bytes:
+    """
+    Product.to_feed_dict() as JSON bytes, not cached: the feed is rendered to static
+    files (product_feed.py) and a pass over the catalog would evict the list/detail entries
+    """
+    return encode_json(product.to_feed_dict())
+
+
+def splice_array(parts) -> bytes:
+    """JSON array from already encoded items"""
+    return b"[" + b",".join(parts) + b"]"
+
+
+def json_bytes_response(content: bytes, **kwargs) -> Response:
+    return Response(content=content, media_type="application/json", **kwargs)
+
+
+def product_list_response(products, pagination: dict, fields: tuple = None) -> Response:
+    """{"data": [...], "pagination": {...}} built from cached product bytes"""
+    return json_bytes_response(
+        b'{"data":' + splice_array(product_json(p, fields) for p in products)
+        + b',"pagination":' + encode_json(pagination) + b"}"
+    )
@@ -0,0 +1,105 @@
+"""
+Product features relation
+Product.features stays the JSON source of truth, product_features is its
+indexed copy used for filtering and for the unique features list
+"""
+import json
+from sqlalchemy import func, select, true
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, Product, ProductFeature
+
+
+def parse_features(raw) -> list:
+    """Features JSON (or list) -> stripped, de-duplicated list"""
+    if not raw:
+        return []
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            return []
+    if not isinstance(raw, list):
+        return []
+
+    result = []
+    for feature in raw:
+        feature = str(feature).strip()
+        if feature and feature not in result:
+            result.append(feature)
+    return result
+
+
+def sync_features(db: Session, product: Product):
+    """Rewrite product_features rows of a product from its JSON column (caller commits)"""
+    db.flush()  # rows added earlier in the same transaction must be visible to the delete
+    db.query(ProductFeature).filter(ProductFeature.product_id == product.id).delete(synchronize_session=False)
+    db.add_all(ProductFeature(product_id=product.id, feature=f) for f in parse_features(product.features))
+
+
+def delete_features(db: Session, product_id: str):
+    """Drop product_features rows of a deleted product (caller commits)"""
+    db.query(ProductFeature).filter(ProductFeature.product_id == product_id).delete(synchronize_session=False)
+
+
+def features_filter(features: list):
+    """Condition: product has ALL of the given features"""
+    wanted = list(dict.fromkeys(f.strip() for f in features if f.strip()))
+    if not wanted:
+        return true()
+    matching = (
+        select(ProductFeature.product_id)
+        .where(ProductFeature.feature.in_(wanted))
+        .group_by(ProductFeature.product_id)
+        .having(func.count(ProductFeature.feature) == len(wanted))
+    )
+    return Product.id.in_(matching)
+
+
+def unique_features(db: Session) -> list:
+    """Sorted list of all features in use (index-only scan)"""
+    rows = db.query(ProductFeature.feature).distinct().order_by(ProductFeature.feature).all()
+    return [row.feature for row in rows]
+
+
+def sync_features_batch(db: Session, rows):
+    """Rewrite product_features for (id, features) rows in one statement pair (caller commits)"""
+    ids = [row.id for row in rows]
+    db.query(ProductFeature).filter(ProductFeature.product_id.in_(ids)).delete(synchronize_session=False)
+    db.add_all(
+        ProductFeature(product_id=row.id, feature=f)
+        for row in rows
+        for f in parse_features(row.features)
+    )
+
+
+def backfill_features(db: Session, batch_size: int = 500) -> int:
+    """Fill product_features from Product.features in id-ordered batches, returns product count"""
+    done = 0
+    last_id = ""
+    while True:
+        batch = (
+            db.query(Product.id, Product.features)
+            .filter(Product.id > last_id)
+            .order_by(Product.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            return done
+
+        sync_features_batch(db, batch)
+        db.commit()
+        done += len(batch)
+        last_id = batch[-1].id
+
+
+def init_product_features():
+    """One-time backfill on startup when product_features is still empty"""
+    db = SessionLocal()
+    try:
+        if db.query(ProductFeature.product_id).first() is None and \
+                db.query(Product.id).filter(Product.features.isnot(None), Product.features != "[]").first():
+            backfill_features(db)
+    finally:
+        db.close()
@@ -0,0 +1,302 @@
+"""
+Product feed
+Products are read in batches (yield_per) and written out as they come,
+so memory stays flat and the first bytes leave before the whole catalog is read.
+The same stream is pre-rendered to FEED_DIR, stamped with the "products" table
+version it was built from. The route serves those files; when they are missing or
+older than the table (a write in any worker, see change_versions.py) it streams from
+the database and has them rebuilt in the background.
+"""
+import os
+import tempfile
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: builds of several processes are not serialized
+    fcntl = None
+
+from database import ReadSessionLocal, Product
+from change_versions import version_watcher
+from product_cache import product_feed_json, encode_json
+
+FEED_BATCH_SIZE = 500
+
+FEED_DIR = os.getenv("FEED_DIR", "feeds")
+
+# nginx location (internal) mapped to FEED_DIR: files are then sent by nginx with sendfile
+FEED_ACCEL_REDIRECT = os.getenv("FEED_ACCEL_REDIRECT", "")
+
+FEED_MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def feed_meta(total: int) -> dict:
+    return {
+        "total": total,
+        "generated_at": datetime.utcnow().isoformat(),
+        "currency": "RUB",
+        "brand": "Orient Watch"
+    }
+
+
+def iter_feed_batches(batch_size: int = FEED_BATCH_SIZE) -> Iterator[list]:
+    """
+    Lists of encoded in-stock products, `batch_size` at a time.
+    Uses its own session: the stream outlives the request's dependencies.
+    """
+    db = ReadSessionLocal()
+    try:
+        query = (
+            db.query(Product)
+            .filter(Product.in_stock == True)
+            .order_by(Product.id)
+            .execution_options(stream_results=True)
+            .yield_per(batch_size)
+        )
+        batch = []
+        for product in query:
+            batch.append(product_feed_json(product))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        db.close()
+
+
+def count_feed_products() -> int:
+    db = ReadSessionLocal()
+    try:
+        return db.query(Product).filter(Product.in_stock == True).count()
+    finally:
+        db.close()
+
+
+def iter_feed_json(batch_size: int = FEED_BATCH_SIZE) -> Iterator[bytes]:
+    """{"meta": {...}, "products": [...]} in chunks"""
+    yield b'{"meta":' + encode_json(feed_meta(count_feed_products())) + b',"products":['
+    first = True
+    for batch in iter_feed_batches(batch_size):
+        chunk = b",".join(batch)
+        yield chunk if first else b"," + chunk
+        first = False
+    yield b"]}"
+
+
+def iter_feed_ndjson(batch_size: int = FEED_BATCH_SIZE) -> Iterator[bytes]:
+    """One product per line"""
+    for batch in iter_feed_batches(batch_size):
+        yield b"\n".join(batch) + b"\n"
+
+
+FEED_WRITERS = {
+    "json": iter_feed_json,
+    "ndjson": iter_feed_ndjson,
+}
+
+
+def gzip_stream(chunks: Iterator[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip an iterator of byte chunks on the fly"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+# --- Pre-rendered files ---
+
+def feed_path(format: str, gzipped: bool = False) -> str:
+    return os.path.join(FEED_DIR, f"products.{format}" + (".gz" if gzipped else ""))
+
+
+def version_path() -> str:
+    return os.path.join(FEED_DIR, "products.version")
+
+
+def products_version():
+    """Current version of the products table (None before init_table_versions)"""
+    return version_watcher.version("products")
+
+
+def built_version():
+    """Products version the files on disk were rendered from, None if unknown"""
+    try:
+        with open(version_path(), encoding="utf-8") as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_version(version: int):
+    fd, tmp = tempfile.mkstemp(dir=FEED_DIR, prefix=".products.version.", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(str(version))
+    os.replace(tmp, version_path())
+
+
+def feed_is_current() -> bool:
+    """Whether every feed file exists and includes the latest product writes"""
+    if not all(os.path.exists(feed_path(format)) for format in FEED_WRITERS):
+        return False
+    built = built_version()
+    return built is not None and built == products_version()
+
+
+class _FeedFileWriter:
+    """Writes one feed file and its .gz sibling to temp files, then swaps them in"""
+
+    def __init__(self, format: str):
+        self.format = format
+        self.compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+        self.files = []
+        for gzipped in (False, True):
+            fd, tmp = tempfile.mkstemp(dir=FEED_DIR, prefix=f".products.{format}.", suffix=".tmp")
+            self.files.append((os.fdopen(fd, "wb"), tmp, feed_path(format, gzipped)))
+
+    def write(self, chunk: bytes):
+        self.files[0][0].write(chunk)
+        self.files[1][0].write(self.compressor.compress(chunk))
+
+    def commit(self):
+        self.files[1][0].write(self.compressor.flush())
+        for file, tmp, path in self.files:
+            file.flush()
+            os.fsync(file.fileno())
+            file.close()
+            os.chmod(tmp, 0o644)
+            # Atomic: readers see either the old or the new file, never a partial one
+            os.replace(tmp, path)
+
+    def discard(self):
+        for file, tmp, _ in self.files:
+            file.close()
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+@contextmanager
+def _build_lock():
+    """
+    Exclusive across processes: one build at a time writes the files and then its
+    stamp, so a stamp always sits next to the files of the same build
+    """
+    os.makedirs(FEED_DIR, exist_ok=True)
+    with open(os.path.join(FEED_DIR, ".build.lock"), "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def write_static_feeds(batch_size: int = FEED_BATCH_SIZE, if_stale: bool = False):
+    """
+    Render every feed format (plain + .gz) in a single pass over the products.
+    if_stale=True skips the build when the files are already current (checked under the lock,
+    after any build of another worker has finished).
+    """
+    with _build_lock():
+        if if_stale and feed_is_current():
+            return
+        # Read before the products: a write racing with the build leaves the stamp behind, not ahead
+        version = products_version()
+        writers = {format: _FeedFileWriter(format) for format in FEED_WRITERS}
+        try:
+            json_writer, ndjson_writer = writers["json"], writers["ndjson"]
+            json_writer.write(b'{"meta":' + encode_json(feed_meta(count_feed_products())) + b',"products":[')
+            first = True
+            for batch in iter_feed_batches(batch_size):
+                chunk = b",".join(batch)
+                json_writer.write(chunk if first else b"," + chunk)
+                ndjson_writer.write(b"\n".join(batch) + b"\n")
+                first = False
+            json_writer.write(b"]}")
+        except BaseException:
+            for writer in writers.values():
+                writer.discard()
+            raise
+        for writer in writers.values():
+            writer.commit()
+        if version is not None:
+            _write_version(version)
+        elif os.path.exists(version_path()):
+            os.remove(version_path())  # an older build's stamp would vouch for these files
+
+
+class FeedBuilder:
+    """
+    Background regeneration of the static feed.
+    Requests made while a build runs are coalesced into one more build, and a build
+    is skipped when another worker has already brought the files up to date.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = False
+        self._running = False
+
+    def schedule(self):
+        """Rebuild soon"""
+        with self._lock:
+            self._pending = True
+            if self._running:
+                return
+            self._running = True
+        threading.Thread(target=self._run, name="feed-builder", daemon=True).start()
+
+    def refresh(self) -> bool:
+        """Whether the files are current; if not, a rebuild is scheduled"""
+        if feed_is_current():
+            return True
+        self.schedule()
+        return False
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._running = False
+                    return
+                self._pending = False
+            try:
+                write_static_feeds(if_stale=True)
+            except Exception as e:
+                print(f"⚠️ Product feed rebuild failed: {e}")
+
+
+feed_builder = FeedBuilder()
+
+
+def init_static_feed():
+    """Build the static feed at startup if it is missing or out of date"""
+    feed_builder.refresh()
+
+
+def open_static_feed(format: str, gzipped: bool):
+    """
+    Open the pre-rendered file (or None if it is not built yet).
+    The handle is taken before reading so a concurrent swap cannot mix two versions.
+    """
+    try:
+        file = open(feed_path(format, gzipped), "rb")
+    except FileNotFoundError:
+        return None
+    return file, os.fstat(file.fileno())
+
+
+def iter_file(file, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    with file:
+        while chunk := file.read(chunk_size):
+            yield chunk
@@ -0,0 +1,49 @@
+"""
+Sparse fieldsets for product lists (?fields=)
+A profile name or a comma-separated list of to_dict() keys limits both the
+loaded columns and the serialized output
+"""
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import load_only
+
+from database import Product, PRODUCT_FIELD_ATTRS
+
+PROFILES = {
+    # Карточка каталога / карусели
+    "card": ("id", "name", "collection", "price", "image", "imageVariants"),
+    # Таблица товаров в админке
+    "admin-grid": ("id", "name", "collection", "price", "image", "inStock", "stockQuantity",
+                   "sku", "isFeatured", "brand", "createdAt", "updatedAt"),
+    # Страница товара - все поля
+    "detail": tuple(PRODUCT_FIELD_ATTRS),
+}
+
+
+def resolve_fields(fields: Optional[str]) -> Optional[tuple]:
+    """?fields= value -> tuple of keys, None when everything is requested"""
+    if not fields or fields == "detail":
+        return None
+    if fields in PROFILES:
+        return PROFILES[fields]
+
+    keys = tuple(dict.fromkeys(k.strip() for k in fields.split(",") if k.strip()))
+    unknown = [k for k in keys if k not in PRODUCT_FIELD_ATTRS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Profiles: {', '.join(PROFILES)}"
+        )
+    return keys
+
+
+# Always loaded: the cache key (id, updated_at) and the sort keys a cursor is built from
+BASE_ATTRS = {"id", "updated_at", "price", "name", "created_at", "is_featured"}
+
+
+def load_options(keys: Optional[tuple]) -> list:
+    """Query options loading only the columns the fieldset needs"""
+    if keys is None:
+        return []
+    attrs = BASE_ATTRS | {PRODUCT_FIELD_ATTRS[k] for k in keys}
+    return [load_only(*[getattr(Product, a) for a in sorted(attrs)])]
@@ -6,14 +6,14 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 import json
 
-from database import get_db, User, Product, Order
+from database import get_db, get_read_db, User, Product, Order
 from schemas import LoginRequest, LoginResponse
 from auth import verify_password, create_access_token, require_admin
 
 router = APIRouter()
 
 @router.post("/api/admin/login", response_model=LoginResponse)
-async def admin_login(request: LoginRequest, db: Session = Depends(get_db)):
+def admin_login(request: LoginRequest, db: Session = Depends(get_db)):
     """Admin login"""
     # Find user
     user = db.query(User).filter(
@@ -45,8 +45,8 @@ async def admin_login(request: LoginRequest, db: Session = Depends(get_db)):
     }
 
 @router.get("/api/admin/stats")
-async def get_stats(
-    db: Session = Depends(get_db),
+def get_stats(
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_admin)
 ):
     """Get dashboard statistics"""
@@ -80,9 +80,9 @@ async def get_stats(
     }
 
 @router.get("/api/admin/orders/recent")
-async def get_recent_orders(
+def get_recent_orders(
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_admin)
 ):
     """Get recent orders"""
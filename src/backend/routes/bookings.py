@@ -5,9 +5,10 @@ from datetime import datetime
 import random
 import string
 
-from database import get_db, Booking
+from database import get_db, get_read_db, Booking
 from schemas import BookingCreate, BookingResponse, BookingUpdate
 from auth import require_admin
+from write_queue import db_writer
 
 router = APIRouter()
 
@@ -19,16 +20,10 @@ def generate_booking_number():
 
 # Public endpoint - create booking
 @router.post("/api/bookings", response_model=BookingResponse)
-def create_booking(booking: BookingCreate, db: Session = Depends(get_db)):
-    """Create new boutique booking"""
-    
-    # Generate unique booking number
-    booking_number = generate_booking_number()
-    while db.query(Booking).filter(Booking.booking_number == booking_number).first():
-        booking_number = generate_booking_number()
-    
-    db_booking = Booking(
-        booking_number=booking_number,
+def create_booking(booking: BookingCreate):
+    """Create new boutique booking (committed in a group by the writer thread)"""
+    # Booking columns (the row itself is built in the writer, a retried job starts clean)
+    values = dict(
         name=booking.name,
         phone=booking.phone,
         email=booking.email,
@@ -38,12 +33,18 @@ def create_booking(booking: BookingCreate, db: Session = Depends(get_db)):
         boutique=booking.boutique or "Orient Ташкент",
         status="pending"
     )
-    
-    db.add(db_booking)
-    db.commit()
-    db.refresh(db_booking)
-    
-    return db_booking
+
+    def insert(db: Session):
+        # Generate unique booking number
+        booking_number = generate_booking_number()
+        while db.query(Booking.id).filter(Booking.booking_number == booking_number).first():
+            booking_number = generate_booking_number()
+        db_booking = Booking(booking_number=booking_number, **values)
+        db.add(db_booking)
+        db.flush()
+        return db_booking
+
+    return db_writer.run(insert)
 
 # Admin endpoints
 @router.get("/api/admin/bookings", response_model=List[BookingResponse])
@@ -114,7 +115,7 @@ def delete_booking(
 @router.get("/api/admin/bookings/stats/summary")
 def get_bookings_stats(
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get booking statistics (admin only)"""
     total = db.query(Booking).count()
@@ -5,31 +5,31 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from database import get_db, Collection, Product
+from database import get_db, get_read_db, Collection, Product
 from schemas import CollectionCreate, CollectionUpdate
 from auth import require_admin
+from facet_index import facet_index, catalog_sort, CATALOG_SORTS
+from product_cache import product_list_response
+from product_fields import resolve_fields, load_options
+from pagination import order_columns, paginate_keyset, cursor_pagination, offset_pagination
+from collection_links import link_orphan_products, rename_collection_products, unlink_collection_products
 
 router = APIRouter()
 
 # Public endpoints
 @router.get("/api/collections")
-async def get_collections(db: Session = Depends(get_db)):
+def get_collections(db: Session = Depends(get_read_db)):
     """Get all active collections (public)"""
     collections = db.query(Collection).filter(Collection.active == True).all()
     
     result = []
     for col in collections:
-        # Count products in collection
-        watch_count = db.query(Product).filter(
-            Product.collection == col.name
-        ).count()
-        
         result.append({
             "id": col.id,
             "name": col.name,
             "description": col.description,
             "image": col.image,
-            "watchCount": watch_count,
+            "watchCount": col.product_count,
             "number": col.number,
             "active": col.active,
             "createdAt": col.created_at.isoformat() if col.created_at else None
@@ -38,77 +38,79 @@ async def get_collections(db: Session = Depends(get_db)):
     return result
 
 @router.get("/api/collections/{collection_id}")
-async def get_collection(collection_id: str, db: Session = Depends(get_db)):
+def get_collection(collection_id: str, db: Session = Depends(get_read_db)):
     """Get collection by ID (public)"""
     collection = db.query(Collection).filter(Collection.id == collection_id).first()
     
     if not collection:
         raise HTTPException(status_code=404, detail="Collection not found")
     
-    # Count products
-    watch_count = db.query(Product).filter(
-        Product.collection == collection.name
-    ).count()
-    
     return {
         "id": collection.id,
         "name": collection.name,
         "description": collection.description,
         "image": collection.image,
-        "watchCount": watch_count,
+        "watchCount": collection.product_count,
         "number": collection.number,
         "active": collection.active
     }
 
 @router.get("/api/collections/{collection_id}/products")
-async def get_collection_products(
+def get_collection_products(
     collection_id: str,
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db)
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = Query(None, alias="includeTotal"),
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
-    """Get products in collection (public)"""
+    """Get products in collection (public, page or cursor pagination)"""
+    field_keys = resolve_fields(fields)
     collection = db.query(Collection).filter(Collection.id == collection_id).first()
     
     if not collection:
         raise HTTPException(status_code=404, detail="Collection not found")
     
     # Get products
-    query = db.query(Product).filter(Product.collection == collection.name)
-    
-    total = query.count()
-    offset = (page - 1) * limit
-    products = query.offset(offset).limit(limit).all()
-    
-    data = [product.to_dict() for product in products]
-    
-    return {
-        "data": data,
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "totalPages": (total + limit - 1) // limit
-        }
-    }
+    query = db.query(Product).options(*load_options(field_keys)).filter(Product.collection_id == collection.id)
+    with_total = include_total if include_total is not None else cursor is None
+    # Same filter as the maintained counter, no COUNT(*) needed
+    total = collection.product_count if with_total else None
+
+    if cursor is not None:
+        # Keyset needs a stable order, default to the catalog "popular" sort
+        if sort not in CATALOG_SORTS:
+            sort = 'popular'
+        columns, descending = catalog_sort(sort)
+        products, next_cursor = paginate_keyset(query, sort, columns, descending, cursor, limit)
+        pagination = cursor_pagination(limit, next_cursor, total)
+    else:
+        if sort:
+            query = query.order_by(*order_columns(*catalog_sort(sort)))
+        offset = (page - 1) * limit
+        products = query.offset(offset).limit(limit).all()
+        pagination = offset_pagination(page, limit, total)
+    
+    return product_list_response(products, pagination, field_keys)
 
 # Admin endpoints
 @router.get("/api/admin/collections")
 @router.get("/api/admin/collections")
-async def get_all_collections_admin(
-    db: Session = Depends(get_db),
+def get_all_collections_admin(
+    db: Session = Depends(get_read_db),
     current_user = Depends(require_admin)
 ):
     collections = db.query(Collection).all()
     result = []
     for col in collections:
-        watch_count = db.query(Product).filter(Product.collection == col.name).count()
         result.append({
             "id": col.id,
             "name": col.name,
             "description": col.description,
             "image": col.image,
-            "watchCount": watch_count,
+            "watchCount": col.product_count,
             "number": col.number,
             "active": col.active,
             "brand": col.brand, # <--- ДОБАВЛЕНО
@@ -117,9 +119,9 @@ async def get_all_collections_admin(
     return result
 
 @router.get("/api/admin/collections/{collection_id}")
-async def get_collection_admin(
+def get_collection_admin(
     collection_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user = Depends(require_admin)
 ):
     """Get collection by ID (admin)"""
@@ -128,17 +130,12 @@ async def get_collection_admin(
     if not collection:
         raise HTTPException(status_code=404, detail="Collection not found")
     
-    # Count products
-    watch_count = db.query(Product).filter(
-        Product.collection == collection.name
-    ).count()
-    
     return {
         "id": collection.id,
         "name": collection.name,
         "description": collection.description,
         "image": collection.image,
-        "watchCount": watch_count,
+        "watchCount": collection.product_count,
         "number": collection.number,
         "active": collection.active,
         "brand": collection.brand,
@@ -146,7 +143,7 @@ async def get_collection_admin(
     }
 
 @router.post("/api/admin/collections")
-async def create_collection(
+def create_collection(
     collection: CollectionCreate,
     db: Session = Depends(get_db),
     current_user = Depends(require_admin)
@@ -159,13 +156,15 @@ async def create_collection(
     
     db_collection = Collection(**collection.dict())
     db.add(db_collection)
+    db.flush()
+    link_orphan_products(db, db_collection)
     db.commit()
     db.refresh(db_collection)
     
     return {"message": "Collection created", "id": db_collection.id}
 
 @router.put("/api/admin/collections/{collection_id}")
-async def update_collection(
+def update_collection(
     collection_id: str,
     collection: CollectionUpdate,
     db: Session = Depends(get_db),
@@ -178,15 +177,23 @@ async def update_collection(
         raise HTTPException(status_code=404, detail="Collection not found")
     
     update_data = collection.dict(exclude_unset=True)
+    renamed = "name" in update_data and update_data["name"] != db_collection.name
     for key, value in update_data.items():
         setattr(db_collection, key, value)
-    
+
+    if renamed:
+        # Products stay linked by id, only their display name follows
+        db.flush()
+        rename_collection_products(db, db_collection)
     db.commit()
+
+    if renamed:
+        facet_index.invalidate()
     
     return {"message": "Collection updated"}
 
 @router.delete("/api/admin/collections/{collection_id}")
-async def delete_collection(
+def delete_collection(
     collection_id: str,
     db: Session = Depends(get_db),
     current_user = Depends(require_admin)
@@ -197,6 +204,7 @@ async def delete_collection(
     if not db_collection:
         raise HTTPException(status_code=404, detail="Collection not found")
     
+    unlink_collection_products(db, db_collection)
     db.delete(db_collection)
     db.commit()
     
@@ -7,11 +7,18 @@ from pydantic import BaseModel
 import json
 from database import ContentBoutique
 from schemas import BoutiquePageData
-from database import get_db, ContentHero, ContentPromoBanner, ContentHeritage, ContentSiteLogo, ContentHistoryEvent, Product
+from database import get_db, get_read_db, ContentHero, ContentPromoBanner, ContentHeritage, ContentSiteLogo, ContentHistoryEvent, Product
 from schemas import HeroContent, PromoBanner, HeritageSection, HistoryEventCreate, HistoryEventUpdate
 from auth import require_admin
+from facet_index import facet_index
+from product_cache import product_cache
 from database import ContentPolicy
 from schemas import PolicyData
+from product_cache import json_bytes_response
+from content_cache import VersionedSnapshot, HOMEPAGE_TABLES
+from image_variants import collect_variants
+from routes.collections import get_collections
+from routes.settings import build_currency, build_site_info, build_social_links, build_shipping_info
 router = APIRouter()
 
 # Pydantic model for logo
@@ -20,8 +27,7 @@ class SiteLogo(BaseModel):
     logoDarkUrl: str | None = None
 
 # Public endpoints
-@router.get("/api/content/logo")
-async def get_site_logo(db: Session = Depends(get_db)):
+def build_site_logo(db: Session) -> dict:
     """Get site logo (public)"""
     logo = db.query(ContentSiteLogo).filter(ContentSiteLogo.id == 1).first()
     
@@ -36,8 +42,14 @@ async def get_site_logo(db: Session = Depends(get_db)):
         "logoDarkUrl": logo.logo_dark_url
     }
 
-@router.get("/api/content/hero")
-async def get_hero_content(db: Session = Depends(get_db)):
+site_logo_snapshot = VersionedSnapshot(["content_site_logo"], build_site_logo)
+
+@router.get("/api/content/logo")
+def get_site_logo():
+    """Get site logo (public, served from memory)"""
+    return json_bytes_response(site_logo_snapshot.get())
+
+def build_hero_content(db: Session) -> dict:
     """Get hero content (public)"""
     hero = db.query(ContentHero).filter(ContentHero.id == 1).first()
     
@@ -49,10 +61,10 @@ async def get_hero_content(db: Session = Depends(get_db)):
             "image": "https://images.unsplash.com/photo-1587836374828-4dbafa94cf0e?w=800&q=80",
             "ctaText": "Смотреть коллекцию",
             "ctaLink": "/catalog",
-            "buttonTextColor": hero.button_text_color or "#FFFFFF",
-            "buttonBgColor": hero.button_bg_color or "transparent",
-            "buttonHoverTextColor": hero.button_hover_text_color or "#000000",
-            "buttonHoverBgColor": hero.button_hover_bg_color or "#FFFFFF"
+            "buttonTextColor": "#FFFFFF",
+            "buttonBgColor": "transparent",
+            "buttonHoverTextColor": "#000000",
+            "buttonHoverBgColor": "#FFFFFF"
         }
     
     return {
@@ -60,12 +72,19 @@ async def get_hero_content(db: Session = Depends(get_db)):
         "subtitle": hero.subtitle,
         "image": hero.image,
         "mobileImage": hero.mobile_image or "",
+        "imageVariants": json.loads(hero.image_variants) if hero.image_variants else {},
         "ctaText": hero.cta_text,
         "ctaLink": hero.cta_link
     }
 
-@router.get("/api/content/promo-banner")
-async def get_promo_banner(db: Session = Depends(get_db)):
+hero_content_snapshot = VersionedSnapshot(["content_hero"], build_hero_content)
+
+@router.get("/api/content/hero")
+def get_hero_content():
+    """Get hero content (public, served from memory)"""
+    return json_bytes_response(hero_content_snapshot.get())
+
+def build_promo_banner(db: Session) -> dict:
     """Get promo banner (public)"""
     banner = db.query(ContentPromoBanner).filter(ContentPromoBanner.id == 1).first()
     
@@ -88,8 +107,15 @@ async def get_promo_banner(db: Session = Depends(get_db)):
         "highlightColor": banner.highlight_color
     }
 
+promo_banner_snapshot = VersionedSnapshot(["content_promo_banner"], build_promo_banner)
+
+@router.get("/api/content/promo-banner")
+def get_promo_banner():
+    """Get promo banner (public, served from memory)"""
+    return json_bytes_response(promo_banner_snapshot.get())
+
 @router.get("/api/content/featured-watches")
-async def get_featured_watches(db: Session = Depends(get_db)):
+def get_featured_watches(db: Session = Depends(get_read_db)):
     """Get featured watches (public)"""
     # Return featured products (is_featured = True)
     products = db.query(Product).filter(Product.is_featured == True).limit(6).all()
@@ -107,8 +133,7 @@ async def get_featured_watches(db: Session = Depends(get_db)):
     
     return result
 
-@router.get("/api/content/heritage")
-async def get_heritage_section(db: Session = Depends(get_db)):
+def build_heritage_section(db: Session) -> dict:
     """Get heritage section (public)"""
     heritage = db.query(ContentHeritage).filter(ContentHeritage.id == 1).first()
     
@@ -131,10 +156,41 @@ async def get_heritage_section(db: Session = Depends(get_db)):
         "yearsText": heritage.years_text
     }
 
+heritage_section_snapshot = VersionedSnapshot(["content_heritage"], build_heritage_section)
+
+@router.get("/api/content/heritage")
+def get_heritage_section():
+    """Get heritage section (public, served from memory)"""
+    return json_bytes_response(heritage_section_snapshot.get())
+
+def build_homepage(db: Session) -> dict:
+    """Everything the home page and header load, same shapes as the single endpoints"""
+    return {
+        "logo": build_site_logo(db),
+        "hero": build_hero_content(db),
+        "promoBanner": build_promo_banner(db),
+        "featuredWatches": get_featured_watches(db),
+        "heritage": build_heritage_section(db),
+        "collections": get_collections(db),
+        "settings": {
+            "currency": build_currency(db),
+            "site": build_site_info(db),
+            "social": build_social_links(db),
+            "shipping": build_shipping_info(db),
+        },
+    }
+
+homepage_snapshot = VersionedSnapshot(HOMEPAGE_TABLES, build_homepage)
+
+@router.get("/api/content/homepage")
+def get_homepage():
+    """Home page payload in one request (public, served from the in-memory snapshot)"""
+    return json_bytes_response(homepage_snapshot.get())
+
 # Admin endpoints
 @router.get("/api/admin/content/logo")
-async def get_site_logo_admin(
-    db: Session = Depends(get_db),
+def get_site_logo_admin(
+    db: Session = Depends(get_read_db),
     current_user = Depends(require_admin)
 ):
     """Get site logo (admin)"""
@@ -152,7 +208,7 @@ async def get_site_logo_admin(
     }
 
 @router.put("/api/admin/content/logo")
-async def update_site_logo(
+def update_site_logo(
     logo: SiteLogo,
     db: Session = Depends(get_db),
     current_user = Depends(require_admin)
@@ -172,8 +228,8 @@ async def update_site_logo(
     return {"message": "Logo updated"}
 
 @router.get("/api/admin/content/hero")
-async def get_hero_content_admin(
-    db: Session = Depends(get_db),
+def get_hero_content_admin(
+    db: Session = Depends(get_read_db),
     current_user = Depends(require_admin)
 ):
     """Get hero content (admin)"""
@@ -194,13 +250,14 @@ async def get_hero_content_admin(
         "subtitle": hero.subtitle,
         "image": hero.image,
         "mobileImage": hero.mobile_image or "",
+        "imageVariants": json.loads(hero.image_variants) if hero.image_variants else {},
         "ctaText": hero.cta_text,
         "ctaLink": hero.cta_link
     }
 
 
 @router.get("/api/content/history")
-async def get_history_events(db: Session = Depends(get_db)):
+def get_history_events(db: Session = Depends(get_read_db)):
     """Get history timeline events (public)"""
     events = db.query(ContentHistoryEvent).order_by(ContentHistoryEvent.order.asc()).all()
 
@@ -219,7 +276,7 @@ async def get_history_events(db: Session = Depends(get_db)):
 
 
 @router.post("/api/admin/content/history")
-async def create_history_event(
+def create_history_event(
         event: HistoryEventCreate,
         db: Session = Depends(get_db),
         current_user=Depends(require_admin)
@@ -240,7 +297,7 @@ async def create_history_event(
 
 
 @router.put("/api/admin/content/history/{event_id}")
-async def update_history_event(
+def update_history_event(
         event_id: int,
         event: HistoryEventUpdate,
         db: Session = Depends(get_db),
@@ -264,7 +321,7 @@ async def update_history_event(
 
 
 @router.delete("/api/admin/content/history/{event_id}")
-async def delete_history_event(
+def delete_history_event(
         event_id: int,
         db: Session = Depends(get_db),
         current_user=Depends(require_admin)
@@ -282,7 +339,7 @@ async def delete_history_event(
 
 
 @router.put("/api/admin/content/hero")
-async def update_hero_content(
+def update_hero_content(
         content: HeroContent,
         db: Session = Depends(get_db),
         current_user=Depends(require_admin)
@@ -305,12 +362,18 @@ async def update_hero_content(
     hero.button_hover_text_color = content.buttonHoverTextColor
     hero.button_hover_bg_color = content.buttonHoverBgColor
 
+    # Resized variants of both images (recorded at upload, or sent by the client)
+    stored = json.loads(hero.image_variants) if hero.image_variants else {}
+    hero.image_variants = json.dumps(collect_variants(
+        [hero.image, hero.mobile_image], {**stored, **(content.imageVariants or {})}
+    ))
+
     db.commit()
     return {"message": "Hero content updated"}
 
 @router.get("/api/admin/content/promo-banner")
-async def get_promo_banner_admin(
-    db: Session = Depends(get_db),
+def get_promo_banner_admin(
+    db: Session = Depends(get_read_db),
     current_user = Depends(require_admin)
 ):
     """Get promo banner (admin)"""
@@ -336,7 +399,7 @@ async def get_promo_banner_admin(
     }
 
 @router.put("/api/admin/content/promo-banner")
-async def update_promo_banner(
+def update_promo_banner(
     banner: PromoBanner,
     db: Session = Depends(get_db),
     current_user = Depends(require_admin)
@@ -360,8 +423,8 @@ async def update_promo_banner(
     return {"message": "Promo banner updated"}
 
 @router.get("/api/admin/content/featured-watches")
-async def get_featured_watches_admin(
-    db: Session = Depends(get_db),
+def get_featured_watches_admin(
+    db: Session = Depends(get_read_db),
     current_user = Depends(require_admin)
 ):
     """Get featured watches (admin)"""
@@ -382,7 +445,7 @@ async def get_featured_watches_admin(
     return result
 
 @router.put("/api/admin/content/featured-watches")
-async def update_featured_watches(
+def update_featured_watches(
     product_ids: list[str],
     db: Session = Depends(get_db),
     current_user = Depends(require_admin)
@@ -398,12 +461,14 @@ async def update_featured_watches(
             product.is_featured = True
     
     db.commit()
+    facet_index.invalidate()
+    product_cache.clear()
     
     return {"message": "Featured watches updated"}
 
 @router.get("/api/admin/content/heritage")
-async def get_heritage_section_admin(
-    db: Session = Depends(get_db),
+def get_heritage_section_admin(
+    db: Session = Depends(get_read_db),
     current_user = Depends(require_admin)
 ):
     """Get heritage section (admin)"""
@@ -429,7 +494,7 @@ async def get_heritage_section_admin(
     }
 
 @router.put("/api/admin/content/heritage")
-async def update_heritage_section(
+def update_heritage_section(
     heritage: HeritageSection,
     db: Session = Depends(get_db),
     current_user = Depends(require_admin)
@@ -455,8 +520,7 @@ async def update_heritage_section(
 
 # --- Public Endpoints ---
 
-@router.get("/api/content/boutique")
-async def get_boutique_content(db: Session = Depends(get_db)):
+def build_boutique_content(db: Session) -> dict:
     """Get boutique page content (public)"""
     content = db.query(ContentBoutique).filter(ContentBoutique.id == 1).first()
 
@@ -483,23 +547,30 @@ async def get_boutique_content(db: Session = Depends(get_db)):
             "imagePosition": content.info_image_position
         },
         "services": json.loads(content.services) if content.services else [],
-        "gallery": json.loads(content.gallery) if content.gallery else []
+        "gallery": json.loads(content.gallery) if content.gallery else [],
+        "imageVariants": json.loads(content.image_variants) if content.image_variants else {}
     }
 
+boutique_content_snapshot = VersionedSnapshot(["content_boutique"], build_boutique_content)
+
+@router.get("/api/content/boutique")
+def get_boutique_content():
+    """Get boutique page content (public, served from memory)"""
+    return json_bytes_response(boutique_content_snapshot.get())
 
 # --- Admin Endpoints ---
 
 @router.get("/api/admin/content/boutique")
-async def get_boutique_content_admin(
-        db: Session = Depends(get_db),
+def get_boutique_content_admin(
+        db: Session = Depends(get_read_db),
         current_user=Depends(require_admin)
 ):
     # Re-use logic or call the same handler
-    return await get_boutique_content(db)
+    return build_boutique_content(db)
 
 
 @router.put("/api/admin/content/boutique")
-async def update_boutique_content(
+def update_boutique_content(
         data: BoutiquePageData,
         db: Session = Depends(get_db),
         current_user=Depends(require_admin)
@@ -527,6 +598,13 @@ async def update_boutique_content(
     content.services = json.dumps([s.dict() for s in data.services], ensure_ascii=False)
     content.gallery = json.dumps([g.dict() for g in data.gallery], ensure_ascii=False)
 
+    # Resized variants of the hero, info and gallery images
+    stored = json.loads(content.image_variants) if content.image_variants else {}
+    content.image_variants = json.dumps(collect_variants(
+        [content.hero_image, content.info_image, *(g.url for g in data.gallery)],
+        {**stored, **(data.imageVariants or {})}
+    ))
+
     db.commit()
 
     return {"message": "Boutique content updated"}
@@ -535,7 +613,7 @@ async def update_boutique_content(
 # --- Public Endpoints ---
 
 @router.get("/api/content/policy/{slug}")
-async def get_policy(slug: str, db: Session = Depends(get_db)):
+def get_policy(slug: str, db: Session = Depends(get_read_db)):
     """Get policy content by slug (public)"""
     policy = db.query(ContentPolicy).filter(ContentPolicy.slug == slug).first()
 
@@ -561,16 +639,16 @@ async def get_policy(slug: str, db: Session = Depends(get_db)):
 # --- Admin Endpoints ---
 
 @router.get("/api/admin/content/policy/{slug}")
-async def get_policy_admin(
+def get_policy_admin(
         slug: str,
-        db: Session = Depends(get_db),
+        db: Session = Depends(get_read_db),
         current_user=Depends(require_admin)
 ):
-    return await get_policy(slug, db)
+    return get_policy(slug, db)
 
 
 @router.put("/api/admin/content/policy/{slug}")
-async def update_policy(
+def update_policy(
         slug: str,
         data: PolicyData,
         db: Session = Depends(get_db),
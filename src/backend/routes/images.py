@@ -0,0 +1,72 @@
+"""
+Resized images - GET /img/{w}x{h}/{fmt}/{filename}
+Any upload in a size the page renders, e.g. /img/600x0/webp/ab/cd/<hash>.jpg (0 = follow
+the aspect ratio). Rendered on first request, then served from the disk cache (image_cache.py).
+Sizes outside IMAGE_SIZES are not found.
+"""
+import os
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+
+from image_cache import ALLOWED_SIZES, image_cache, parse_size
+from product_feed import iter_file
+from image_variants import UPLOAD_DIR, available_formats, is_upload_path
+from routes.upload import ALLOWED_EXTENSIONS
+
+router = APIRouter()
+
+# Uploads never change under the same name, so neither does a resize of one
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+FORMAT_ALIASES = {"jpg": "jpeg"}
+
+
+class UploadStaticFiles(StaticFiles):
+    """/uploads: content-addressed names (upload_stream.py), cached by clients for good"""
+
+    def lookup_path(self, path: str):
+        # Not the temp files of uploads in progress (.incoming) or other hidden files
+        if not is_upload_path(path.replace(os.sep, "/")):
+            return "", None
+        return super().lookup_path(path)
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = IMMUTABLE
+        return response
+
+
+@router.get("/img/{size}/{fmt}/{filename:path}")
+async def get_resized_image(size: str, fmt: str, filename: str):
+    """Upload scaled down to fit {w}x{h}, as webp / avif / jpeg (public)"""
+    try:
+        width, height = parse_size(size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if (width, height) not in ALLOWED_SIZES:
+        raise HTTPException(status_code=404, detail="Image size not available")
+
+    fmt = FORMAT_ALIASES.get(fmt.lower(), fmt.lower())
+    formats = available_formats()
+    if fmt not in formats:
+        raise HTTPException(status_code=400, detail=f"Unsupported format. Allowed: {', '.join(formats) or 'none'}")
+
+    if not is_upload_path(filename) or Path(filename).suffix.lower() not in ALLOWED_EXTENSIONS \
+            or not await run_in_threadpool(os.path.isfile, os.path.join(UPLOAD_DIR, filename)):
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    try:
+        file, stat = await image_cache.open(filename, width, height, fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    return StreamingResponse(iter_file(file), media_type=f"image/{fmt}", headers={
+        "Cache-Control": IMMUTABLE,
+        "Content-Length": str(stat.st_size),
+    })
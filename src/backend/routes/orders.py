@@ -5,28 +5,32 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import Optional
 import json
+import random
+import string
 from datetime import datetime
 
-from database import get_db, Order
+from database import get_db, get_read_db, Order
 from schemas import OrderCreate, OrderStatusUpdate
 from auth import require_admin
+from pagination import order_columns, paginate_keyset, cursor_pagination, offset_pagination
+from write_queue import db_writer
 
 router = APIRouter()
 
+# Admin list order: newest first, id breaks ties
+ORDER_SORT_COLUMNS = [Order.created_at, Order.id]
+
 def generate_order_number():
-    """Generate unique order number"""
+    """Generate unique order number (timestamp alone repeats within a second)"""
     timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    return f"ORD-{timestamp}"
+    random_part = ''.join(random.choices(string.digits, k=4))
+    return f"ORD-{timestamp}{random_part}"
 
 @router.post("/api/orders")
-async def create_order(order: OrderCreate, db: Session = Depends(get_db)):
-    """Create new order (public endpoint)"""
-    # Generate order number
-    order_number = generate_order_number()
-    
-    # Create order
-    db_order = Order(
-        order_number=order_number,
+def create_order(order: OrderCreate):
+    """Create new order (public endpoint, committed in a group by the writer thread)"""
+    # Order columns (the row itself is built in the writer, a retried job starts clean)
+    values = dict(
         customer_data=json.dumps(order.customer.dict()),
         items=json.dumps([item.dict() for item in order.items]),
         subtotal=order.subtotal,
@@ -38,34 +42,49 @@ async def create_order(order: OrderCreate, db: Session = Depends(get_db)):
         notes=order.notes,
         status="pending"
     )
-    
-    db.add(db_order)
-    db.commit()
-    db.refresh(db_order)
-    
+
+    def insert(db: Session):
+        # Generate order number
+        order_number = generate_order_number()
+        while db.query(Order.id).filter(Order.order_number == order_number).first():
+            order_number = generate_order_number()
+        # Create order
+        db_order = Order(order_number=order_number, **values)
+        db.add(db_order)
+        db.flush()
+        return db_order.id, order_number
+
+    order_id, order_number = db_writer.run(insert)
+
     return {
         "message": "Order created successfully",
         "orderNumber": order_number,
-        "id": db_order.id
+        "id": order_id
     }
 
 @router.get("/api/admin/orders")
-async def get_orders(
+def get_orders(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = Query(None, alias="includeTotal"),
+    db: Session = Depends(get_read_db),
     current_user = Depends(require_admin)
 ):
-    """Get all orders"""
+    """Get all orders (page or cursor pagination, newest first)"""
     query = db.query(Order)
     
     if status:
         query = query.filter(Order.status == status)
     
-    total = query.count()
-    offset = (page - 1) * limit
-    orders = query.order_by(Order.created_at.desc()).offset(offset).limit(limit).all()
+    with_total = include_total if include_total is not None else cursor is None
+    total = query.count() if with_total else None
+    if cursor is not None:
+        orders, next_cursor = paginate_keyset(query, "newest", ORDER_SORT_COLUMNS, True, cursor, limit)
+    else:
+        offset = (page - 1) * limit
+        orders = query.order_by(*order_columns(ORDER_SORT_COLUMNS, True)).offset(offset).limit(limit).all()
     
     data = []
     for order in orders:
@@ -88,18 +107,14 @@ async def get_orders(
     
     return {
         "data": data,
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "totalPages": (total + limit - 1) // limit
-        }
+        "pagination": cursor_pagination(limit, next_cursor, total) if cursor is not None
+        else offset_pagination(page, limit, total)
     }
 
 @router.get("/api/admin/orders/{order_id}")
-async def get_order(
+def get_order(
     order_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user = Depends(require_admin)
 ):
     """Get order by ID"""
@@ -130,7 +145,7 @@ async def get_order(
     }
 
 @router.put("/api/admin/orders/{order_id}/status")
-async def update_order_status(
+def update_order_status(
     order_id: str,
     status_update: OrderStatusUpdate,
     db: Session = Depends(get_db),
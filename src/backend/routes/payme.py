@@ -12,8 +12,9 @@ import json
 import sys
 import os
 
-from database import get_db, Order, Transaction
+from database import get_db, get_read_db, Order, Transaction
 from auth import require_admin
+from write_queue import db_writer
 
 router = APIRouter()
 
@@ -23,6 +24,9 @@ PAYME_TEST_KEY = os.getenv("PAYME_TEST_KEY")
 PAYME_KEY = os.getenv("PAYME_KEY") # Боевой ключ
 # Читаем URL из env, если нет — ставим боевой по умолчанию
 PAYME_CHECKOUT_URL = os.getenv("PAYME_CHECKOUT_URL", "https://checkout.paycom.uz")
+# Методы, которые меняют данные (выполняются через db_writer)
+WRITE_METHODS = {"CreateTransaction", "PerformTransaction", "CancelTransaction"}
+
 # --- Хелперы для работы с данными транзакции в Notes ---
 
 def get_transaction_data(order_notes: str) -> dict:
@@ -105,7 +109,7 @@ class PaymeInitResponse(BaseModel):
     checkout_url: str
 
 @router.post("/api/payme/init")
-async def init_payme_payment(data: PaymeInitRequest, db: Session = Depends(get_db)):
+def init_payme_payment(data: PaymeInitRequest, db: Session = Depends(get_db)):
     order = db.query(Order).filter(Order.order_number == data.order_id).first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
@@ -137,14 +141,20 @@ async def init_payme_payment(data: PaymeInitRequest, db: Session = Depends(get_d
     sys.stdout.flush()
     return PaymeInitResponse(checkout_url=checkout_url)
 
+async def read_json_body(request: Request):
+    """Parsed request body or None (read here so the handler itself can run in the threadpool)"""
+    try:
+        return await request.json()
+    except Exception:
+        return None
+
 @router.post("/api/payme/callback")
-async def payme_callback(request: Request, db: Session = Depends(get_db)):
+def payme_callback(request: Request, body=Depends(read_json_body), db: Session = Depends(get_db)):
     auth_header = request.headers.get("Authorization")
     if not auth_header or not verify_payme_auth(auth_header):
         return {"error": {"code": -32504, "message": "Insufficient privilege"}}
 
     try:
-        body = await request.json()
         method = body.get("method")
         params = body.get("params", {})
         request_id = body.get("id")
@@ -161,6 +171,12 @@ async def payme_callback(request: Request, db: Session = Depends(get_db)):
         "ChangePassword": lambda p, i, d: {"result": {"success": True}, "id": i}
     }
 
+    if method in WRITE_METHODS:
+        # Changes go through the group-commit writer (committed there, serialized with other writes)
+        try:
+            return db_writer.run(lambda writer_db: handlers[method](params, request_id, writer_db))
+        except Exception:
+            return {"error": {"code": -31008, "message": "Internal error"}, "id": request_id}
     if method in handlers:
         return handlers[method](params, request_id, db)
     else:
@@ -214,7 +230,7 @@ def handle_create_transaction(params: dict, request_id: int, db: Session):
         if int(time.time() * 1000) - transaction.create_time > 43200000:
              transaction.state = -1
              transaction.reason = 4
-             db.commit()
+             db.flush()
              return {"error": {"code": -31008, "message": "Transaction expired"}, "id": request_id}
 
         return {
@@ -259,7 +275,7 @@ def handle_create_transaction(params: dict, request_id: int, db: Session):
                 "state": 1
             })
 
-        db.commit()
+        db.flush()
         db.refresh(new_tx)
 
         return {
@@ -271,8 +287,9 @@ def handle_create_transaction(params: dict, request_id: int, db: Session):
             "id": request_id
         }
     except Exception as e:
+        # The writer rolls the job back, payme_callback answers "Internal error"
         print(f"Error creating transaction: {e}")
-        return {"error": {"code": -31008, "message": "Internal error"}, "id": request_id}
+        raise
 
 def handle_perform_transaction(params: dict, request_id: int, db: Session):
     transaction_id = params.get("id")
@@ -287,14 +304,14 @@ def handle_perform_transaction(params: dict, request_id: int, db: Session):
         if int(time.time() * 1000) - transaction.create_time > 43200000:
              transaction.state = -1
              transaction.reason = 4
-             db.commit()
+             db.flush()
              return {"error": {"code": -31008, "message": "Timeout"}, "id": request_id}
 
         # Выполняем
         perform_time = int(time.time() * 1000)
         transaction.state = 2
         transaction.perform_time = perform_time
-        db.commit()
+        db.flush()
 
         # Обновляем заказ
         order = db.query(Order).filter(Order.order_number == transaction.order_id).first()
@@ -307,7 +324,7 @@ def handle_perform_transaction(params: dict, request_id: int, db: Session):
                 "perform_time": perform_time,
                 "state": 2
             })
-            db.commit()
+            db.flush()
 
         return {
             "result": {
@@ -344,13 +361,13 @@ def handle_cancel_transaction(params: dict, request_id: int, db: Session):
         transaction.state = -1
         transaction.cancel_time = cancel_time
         transaction.reason = reason
-        db.commit()
+        db.flush()
 
         # Обновляем заказ
         order = db.query(Order).filter(Order.order_number == transaction.order_id).first()
         if order:
             order.status = "cancelled"
-            db.commit()
+            db.flush()
 
         return {
             "result": {
@@ -366,13 +383,13 @@ def handle_cancel_transaction(params: dict, request_id: int, db: Session):
         transaction.state = -2
         transaction.cancel_time = cancel_time
         transaction.reason = reason
-        db.commit()
+        db.flush()
 
         # Обновляем заказ (возврат средств)
         order = db.query(Order).filter(Order.order_number == transaction.order_id).first()
         if order:
             order.status = "cancelled"
-            db.commit()
+            db.flush()
 
         return {
             "result": {
@@ -448,9 +465,9 @@ def handle_get_statement(params: dict, request_id: int, db: Session):
 
 # Admin endpoint (оставляем для админки)
 @router.get("/api/admin/payme/status/{order_id}")
-async def get_payme_status(
+def get_payme_status(
     order_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user = Depends(require_admin)
 ):
     order = db.query(Order).filter(Order.order_number == order_id).first()
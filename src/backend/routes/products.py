@@ -1,77 +1,121 @@
 """
 Products routes - CRUD operations
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func, or_
 from typing import Optional, List
 import json
-from datetime import datetime
-from database import get_db, Product
-from schemas import ProductCreate, ProductUpdate
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from database import get_db, get_read_db, Product
+from schemas import ProductCreate, ProductUpdate, ProductBatchRequest
 from auth import require_admin
+from facet_index import facet_index, catalog_sort, CATALOG_SORTS
+from search_index import apply_search
+from product_features import features_filter, sync_features, delete_features, unique_features
+from product_cache import product_cache, product_json, product_list_response, json_bytes_response, \
+    encode_json, splice_array
+from product_fields import resolve_fields, load_options
+from product_feed import FEED_WRITERS, FEED_MEDIA_TYPES, FEED_ACCEL_REDIRECT, gzip_stream, feed_builder, \
+    open_static_feed, iter_file
+from conditional_get import is_not_modified
+from pagination import order_columns, paginate_keyset, decode_cursor, encode_cursor, cursor_pagination, offset_pagination
+from image_variants import collect_variants
 from sqlalchemy import func, or_, asc, desc
 
 router = APIRouter()
 
+# Max ids per /api/products/batch request
+MAX_BATCH_IDS = 100
+
+
+def apply_sort(query, sort: str):
+    """ORDER BY for catalog sorts (id is the tiebreaker, keeps pages stable)"""
+    columns, descending = catalog_sort(sort)
+    return query.order_by(*order_columns(columns, descending))
+
+
+def facet_selection(**values) -> dict:
+    """Facet index selection from single-value query params (empty values are skipped)"""
+    return {facet: [value] for facet, value in values.items() if value}
+
+
+def apply_text_filters(query, db: Session, search: Optional[str], features: Optional[List[str]],
+                       ranked: bool = False):
+    """
+    Search (FTS5, see search_index.py) and features filters - not covered by the facet index.
+    Returns (query, ranked_applied): whether the query is already ordered by relevance.
+    """
+    if search:
+        query, ranked = apply_search(query, db, search, ranked=ranked)
+    else:
+        ranked = False
+    if features:
+        query = query.filter(features_filter(features))
+    return query, ranked
+
+
+def load_products_in_order(db: Session, product_ids: list, options: list = ()) -> list:
+    """Load products by id with one IN query, keeping the given order"""
+    if not product_ids:
+        return []
+    query = db.query(Product).options(*options).filter(Product.id.in_(product_ids))
+    by_id = {p.id: p for p in query.all()}
+    return [by_id[pid] for pid in product_ids if pid in by_id]
+
 # Public endpoints
 
 @router.get("/api/products/feed")
-async def get_products_feed(db: Session = Depends(get_db)):
+def get_products_feed(
+        request: Request,
+        format: str = Query("json", pattern="^(json|ndjson)$"),
+):
     """
-    Public product feed - returns all products with full information in JSON format
+    Public product feed - all in-stock products with full information.
+    JSON ({"meta", "products"}) or NDJSON (one product per line), gzip when the client accepts it.
+    Served from the pre-rendered files (product_feed.py); streamed from the database while
+    they are missing or behind the products table (rebuilt meanwhile).
     """
-    products = db.query(Product).filter(Product.in_stock == True).all()
-
-    feed_data = {
-        "meta": {
-            "total": len(products),
-            "generated_at": datetime.utcnow().isoformat(),
-            "currency": "RUB",
-            "brand": "Orient Watch"
-        },
-        "products": [
-            {
-                "id": product.id,
-                "name": product.name,
-                "collection": product.collection,
-                "price": product.price,
-                "currency": "RUB",
-                "image": product.image,
-                "images": json.loads(product.images) if product.images else [],
-                "description": product.description,
-                "features": json.loads(product.features) if product.features else [],
-                "specs": json.loads(product.specs) if product.specs else {},
-                "inStock": product.in_stock,
-                "stockQuantity": product.stock_quantity,
-                "sku": product.sku,
-                "isFeatured": product.is_featured,
-                "movement": product.movement,
-                "caseMaterial": product.case_material,
-                "dialColor": product.dial_color,
-                "waterResistance": product.water_resistance,
-                "seo": {
-                    "title": product.seo_title,
-                    "description": product.seo_description,
-                    "keywords": product.seo_keywords
-                },
-                "social": {
-                    "fbTitle": product.fb_title,
-                    "fbDescription": product.fb_description
-                },
-                "url": f"/product/{product.id}",
-                "createdAt": product.created_at.isoformat() if product.created_at else None,
-                "updatedAt": product.updated_at.isoformat() if product.updated_at else None
-            }
-            for product in products
-        ]
-    }
-
-    return feed_data
+    gzipped = "gzip" in request.headers.get("accept-encoding", "")
+    media_type = FEED_MEDIA_TYPES[format]
+    headers = {"Vary": "Accept-Encoding"}
+
+    static = open_static_feed(format, gzipped) if feed_builder.refresh() else None
+    if static is None:
+        chunks = FEED_WRITERS[format]()
+        if gzipped:
+            chunks = gzip_stream(chunks)
+            headers["Content-Encoding"] = "gzip"
+        return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
+    file, stat = static
+    last_modified = datetime.fromtimestamp(int(stat.st_mtime), timezone.utc)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers.update({
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    })
+    if is_not_modified(request, etag, last_modified):
+        file.close()
+        return Response(status_code=304, headers=headers)
+
+    if FEED_ACCEL_REDIRECT:
+        # nginx picks the .gz sibling itself (gzip_static)
+        file.close()
+        headers["X-Accel-Redirect"] = f"{FEED_ACCEL_REDIRECT.rstrip('/')}/products.{format}"
+        return Response(media_type=media_type, headers=headers)
+
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+    headers["Content-Length"] = str(stat.st_size)
+    return StreamingResponse(iter_file(file), media_type=media_type, headers=headers)
 
 
 @router.get("/api/products")
-async def get_products(
+def get_products(
         page: int = Query(1, ge=1),
         limit: int = Query(20, ge=1, le=100),
         search: Optional[str] = None,
@@ -95,81 +139,108 @@ async def get_products(
         water_resistance: Optional[str] = Query(None, alias="waterResistance"),
 
         features: Optional[List[str]] = Query(None),
-        sort: str = Query('popular'),
-        db: Session = Depends(get_db)
-):
-    """Get all products with filters"""
-    query = db.query(Product)
-
-    # --- Search & Collection ---
-    if search:
-        query = query.filter(or_(Product.name.contains(search), Product.sku.contains(search)))
-    if collection:
-        query = query.filter(Product.collection == collection)
+        # relevance (bm25) - по умолчанию при поиске, только постраничный режим
+        sort: Optional[str] = None,
 
-    # --- Price ---
-    if min_price is not None:
-        query = query.filter(Product.price >= min_price)
-    if max_price is not None:
-        query = query.filter(Product.price <= max_price)
-
-    # --- New Filters ---
-    if brand:
-        query = query.filter(Product.brand == brand)
-    if gender:
-        query = query.filter(Product.gender == gender)
-    if min_diameter is not None:
-        query = query.filter(Product.case_diameter >= min_diameter)
-    if max_diameter is not None:
-        query = query.filter(Product.case_diameter <= max_diameter)
-    if strap_material:
-        query = query.filter(Product.strap_material == strap_material)
-
-    # --- Existing Filters ---
-    if movement:
-        query = query.filter(Product.movement == movement)
-    if case_material:
-        query = query.filter(Product.case_material == case_material)
-    if dial_color:
-        query = query.filter(Product.dial_color == dial_color)
-    if water_resistance:
-        query = query.filter(Product.water_resistance == water_resistance)
-
-    # --- Features ---
-    if features:
-        for feature in features:
-            query = query.filter(Product.features.contains(feature))
-
-    # --- Sorting ---
-    if sort == 'price-asc':
-        query = query.order_by(Product.price.asc())
-    elif sort == 'price-desc':
-        query = query.order_by(Product.price.desc())
-    elif sort == 'newest':
-        query = query.order_by(Product.created_at.desc())
-    elif sort == 'name':
-        query = query.order_by(Product.name.asc())
-    else:
-        query = query.order_by(Product.is_featured.desc(), Product.created_at.desc())
+        # Keyset-пагинация: cursor="" - первая страница, дальше nextCursor из ответа
+        cursor: Optional[str] = None,
+        include_total: Optional[bool] = Query(None, alias="includeTotal"),
 
-    # --- Pagination ---
-    total = query.count()
+        # Sparse fieldsets: card | detail | admin-grid или список полей через запятую
+        fields: Optional[str] = None,
+        db: Session = Depends(get_read_db)
+):
+    """Get all products with filters (page or cursor pagination)"""
     offset = (page - 1) * limit
-    products = query.offset(offset).limit(limit).all()
-
-    return {
-        "data": [product.to_dict() for product in products],
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "totalPages": (total + limit - 1) // limit
-        }
-    }
+    field_keys = resolve_fields(fields)
+    options = load_options(field_keys)
+    if not sort:
+        sort = 'relevance' if search else 'popular'
+    ranked = sort == 'relevance' and bool(search) and cursor is None
+    if sort not in CATALOG_SORTS:
+        sort = 'popular'
+    # Total is on by default in page mode and opt-in in cursor mode
+    with_total = include_total if include_total is not None else cursor is None
+    next_cursor = None
+
+    # --- Facet index (search and features still go through SQL) ---
+    if not search and not features:
+        selection = facet_selection(
+            collection=collection, brand=brand, gender=gender, strap_material=strap_material,
+            movement=movement, case_material=case_material, dial_color=dial_color,
+            water_resistance=water_resistance,
+        )
+        facet_index.ensure(db)
+        bitmap = facet_index.match(selection, min_price, max_price, min_diameter, max_diameter)
+        total = bitmap.bit_count() if with_total else None
+
+        if cursor is not None:
+            after = decode_cursor(cursor, sort, len(catalog_sort(sort)[0])) if cursor else None
+            product_ids = facet_index.sorted_ids(bitmap, sort, after)
+            if len(product_ids) > limit:
+                product_ids = product_ids[:limit]
+                next_cursor = encode_cursor(sort, facet_index.sort_values(product_ids[-1], sort))
+        else:
+            product_ids = facet_index.sorted_ids(bitmap, sort)[offset:offset + limit]
+        products = load_products_in_order(db, product_ids, options)
+    else:
+        # --- Search & Features ---
+        query, ranked = apply_text_filters(db.query(Product).options(*options), db, search, features,
+                                           ranked=ranked)
+
+        # --- Collection ---
+        if collection:
+            query = query.filter(Product.collection == collection)
+
+        # --- Price ---
+        if min_price is not None:
+            query = query.filter(Product.price >= min_price)
+        if max_price is not None:
+            query = query.filter(Product.price <= max_price)
+
+        # --- New Filters ---
+        if brand:
+            query = query.filter(Product.brand == brand)
+        if gender:
+            query = query.filter(Product.gender == gender)
+        if min_diameter is not None:
+            query = query.filter(Product.case_diameter >= min_diameter)
+        if max_diameter is not None:
+            query = query.filter(Product.case_diameter <= max_diameter)
+        if strap_material:
+            query = query.filter(Product.strap_material == strap_material)
+
+        # --- Existing Filters ---
+        if movement:
+            query = query.filter(Product.movement == movement)
+        if case_material:
+            query = query.filter(Product.case_material == case_material)
+        if dial_color:
+            query = query.filter(Product.dial_color == dial_color)
+        if water_resistance:
+            query = query.filter(Product.water_resistance == water_resistance)
+
+        # --- Sorting & Pagination ---
+        total = query.count() if with_total else None
+        if cursor is not None:
+            columns, descending = catalog_sort(sort)
+            products, next_cursor = paginate_keyset(query, sort, columns, descending, cursor, limit)
+        else:
+            # No relevance order (LIKE fallback or no FTS terms): popular, so pages stay stable
+            if not ranked:
+                query = apply_sort(query, sort)
+            products = query.offset(offset).limit(limit).all()
+
+    return product_list_response(
+        products,
+        cursor_pagination(limit, next_cursor, total) if cursor is not None
+        else offset_pagination(page, limit, total),
+        field_keys
+    )
 
 
 @router.get("/api/products/filters")
-async def get_available_filters(db: Session = Depends(get_db)):
+def get_available_filters(db: Session = Depends(get_read_db)):
     """Get available filter options"""
 
     def get_options(column):
@@ -191,57 +262,133 @@ async def get_available_filters(db: Session = Depends(get_db)):
         "waterResistances": get_options(Product.water_resistance)
     }
 
+# Response key -> facet, same keys as /api/products/filters plus collections
+FACET_GROUPS = {
+    "brands": "brand",
+    "genders": "gender",
+    "strapMaterials": "strap_material",
+    "movements": "movement",
+    "caseMaterials": "case_material",
+    "dialColors": "dial_color",
+    "waterResistances": "water_resistance",
+    "collections": "collection",
+}
+
+
+@router.get("/api/products/facets")
+def get_facet_counts(
+        search: Optional[str] = None,
+        collection: Optional[str] = None,
+        min_price: Optional[float] = Query(None, alias="minPrice"),
+        max_price: Optional[float] = Query(None, alias="maxPrice"),
+        brand: Optional[str] = None,
+        gender: Optional[str] = None,
+        min_diameter: Optional[float] = Query(None, alias="minDiameter"),
+        max_diameter: Optional[float] = Query(None, alias="maxDiameter"),
+        strap_material: Optional[str] = Query(None, alias="strapMaterial"),
+        movement: Optional[str] = None,
+        case_material: Optional[str] = Query(None, alias="caseMaterial"),
+        dial_color: Optional[str] = Query(None, alias="dialColor"),
+        water_resistance: Optional[str] = Query(None, alias="waterResistance"),
+        features: Optional[List[str]] = Query(None),
+        db: Session = Depends(get_read_db)
+):
+    """
+    Filter options with counts for the current selection (same params as /api/products).
+    Each facet is counted with every other facet's filter applied, all from one index pass.
+    """
+    facet_index.ensure(db)
+
+    # Non-facet filters narrow the base set
+    base = facet_index.match({}, min_price, max_price, min_diameter, max_diameter)
+    if search or features:
+        matched, _ = apply_text_filters(db.query(Product.id), db, search, features)
+        base &= facet_index.bitmap_of_ids(row.id for row in matched.all())
+
+    selection = facet_selection(
+        collection=collection, brand=brand, gender=gender, strap_material=strap_material,
+        movement=movement, case_material=case_material, dial_color=dial_color,
+        water_resistance=water_resistance,
+    )
+    counts = facet_index.facet_counts(base, selection, FACET_GROUPS.values())
+
+    def get_options(values: dict):
+        opts = [{"label": str(v), "value": str(v), "count": c} for v, c in values.items() if v]
+        return sorted(opts, key=lambda x: x['label'])
+
+    result = {key: get_options(counts[facet]) for key, facet in FACET_GROUPS.items()}
+    result["total"] = (facet_index.match(selection) & base).bit_count()
+    return result
+
 # <--- НОВЫЙ ЭНДПОИНТ ДЛЯ АДМИНКИ (ПОЛУЧЕНИЕ ВСЕХ ОСОБЕННОСТЕЙ) --->
 @router.get("/api/products/features/unique")
-async def get_unique_features(db: Session = Depends(get_db)):
+def get_unique_features(db: Session = Depends(get_read_db)):
     """Get all unique features from all products (for admin setup)"""
-    products = db.query(Product.features).all()
-
-    unique_set = set()
-    for p in products:
-        if p.features:
-            try:
-                # Пытаемся распарсить JSON
-                feats = json.loads(p.features)
-                if isinstance(feats, list):
-                    for f in feats:
-                        unique_set.add(f.strip())
-            except:
-                pass
-
-    return sorted(list(unique_set))
+    return unique_features(db)
+
+def product_batch_response(db: Session, ids: List[str], fields: Optional[str]):
+    """{"data": [...], "missing": [...]} for ids in request order (one IN query)"""
+    ids = list(dict.fromkeys(i.strip() for i in ids if i.strip()))
+    if len(ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"Too many ids (max {MAX_BATCH_IDS})")
+
+    field_keys = resolve_fields(fields)
+    products = load_products_in_order(db, ids, load_options(field_keys))
+    found = {p.id for p in products}
+
+    return json_bytes_response(
+        b'{"data":' + splice_array(product_json(p, field_keys) for p in products)
+        + b',"missing":' + encode_json([i for i in ids if i not in found]) + b"}"
+    )
+
+
+@router.get("/api/products/batch")
+def get_products_batch(
+    ids: List[str] = Query([]),
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Several products by id: ?ids=a,b,c or ?ids=a&ids=b (public, cart / wishlist)"""
+    return product_batch_response(db, [i for value in ids for i in value.split(",")], fields)
+
+
+@router.post("/api/products/batch")
+def post_products_batch(request: ProductBatchRequest, db: Session = Depends(get_read_db)):
+    """Same as GET /api/products/batch for long id lists"""
+    return product_batch_response(db, request.ids, request.fields)
+
 
 @router.get("/api/products/{product_id}")
-async def get_product(product_id: str, db: Session = Depends(get_db)):
+def get_product(product_id: str, db: Session = Depends(get_read_db)):
     """Get product by ID (public)"""
     product = db.query(Product).filter(Product.id == product_id).first()
 
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
-    return product.to_dict()
+    return json_bytes_response(product_json(product))
 
 # Admin endpoints
 @router.get("/api/admin/products")
-async def get_all_products_admin(
+def get_all_products_admin(
     page: int = Query(1, ge=1),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = None,
     collection: Optional[str] = None,
     brand: Optional[str] = None,  # <--- ДОБАВЛЕНО
-    db: Session = Depends(get_db),
+    sort: str = Query('newest'),
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = Query(None, alias="includeTotal"),
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_user = Depends(require_admin)
 ):
-    """Get all products with filters (admin)"""
-    query = db.query(Product)
+    """Get all products with filters (admin, page or cursor pagination)"""
+    field_keys = resolve_fields(fields)
+    query = db.query(Product).options(*load_options(field_keys))
 
     if search:
-        query = query.filter(
-            or_(
-                Product.name.contains(search),
-                Product.sku.contains(search)
-            )
-        )
+        query, _ = apply_search(query, db, search)
 
     if collection:
         query = query.filter(Product.collection == collection)
@@ -250,29 +397,27 @@ async def get_all_products_admin(
     if brand:
         query = query.filter(Product.brand == brand)
 
-    # Сортировка по дате создания (новые сверху)
-    query = query.order_by(Product.created_at.desc())
-
-    total = query.count()
-    offset = (page - 1) * limit
-    products = query.offset(offset).limit(limit).all()
+    # Сортировка по умолчанию - по дате создания (новые сверху)
+    if sort not in CATALOG_SORTS:
+        sort = 'newest'
+    with_total = include_total if include_total is not None else cursor is None
+    total = query.count() if with_total else None
 
-    data = [product.to_dict() for product in products]
+    if cursor is not None:
+        columns, descending = catalog_sort(sort)
+        products, next_cursor = paginate_keyset(query, sort, columns, descending, cursor, limit)
+        pagination = cursor_pagination(limit, next_cursor, total)
+    else:
+        offset = (page - 1) * limit
+        products = apply_sort(query, sort).offset(offset).limit(limit).all()
+        pagination = offset_pagination(page, limit, total)
 
-    return {
-        "data": data,
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "totalPages": (total + limit - 1) // limit
-        }
-    }
+    return product_list_response(products, pagination, field_keys)
 
 @router.get("/api/admin/products/{product_id}")
-async def get_product_admin(
+def get_product_admin(
     product_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user = Depends(require_admin)
 ):
     """Get product by ID (admin)"""
@@ -281,10 +426,10 @@ async def get_product_admin(
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
-    return product.to_dict()
+    return json_bytes_response(product_json(product))
 
 @router.post("/api/admin/products")
-async def create_product(
+def create_product(
     product: ProductCreate,
     db: Session = Depends(get_db),
     current_user = Depends(require_admin)
@@ -307,6 +452,7 @@ async def create_product(
         price=product.price,
         image=product.image,
         images=json.dumps(product.images),
+        image_variants=json.dumps(collect_variants([product.image, *product.images], product.imageVariants)),
         description=product.description,
         features=json.dumps(product.features),
         specs=json.dumps(product.specs),
@@ -332,12 +478,14 @@ async def create_product(
     )
 
     db.add(db_product)
+    sync_features(db, db_product)
     db.commit()
     db.refresh(db_product)
+    facet_index.upsert(db_product)
     return db_product.to_dict()
 
 @router.put("/api/admin/products/{product_id}")
-async def update_product(
+def update_product(
     product_id: str,
     product: ProductUpdate,
     db: Session = Depends(get_db),
@@ -353,6 +501,7 @@ async def update_product(
         # Special mappings
         if key in ["images", "features", "specs"] and value is not None:
             setattr(db_product, key, json.dumps(value))
+        elif key == "imageVariants": continue  # merged below
         # CamelCase to snake_case mappings
         elif key == "inStock": setattr(db_product, "in_stock", value)
         elif key == "stockQuantity": setattr(db_product, "stock_quantity", value)
@@ -372,12 +521,22 @@ async def update_product(
         else:
             setattr(db_product, key, value)
 
+    if "features" in update_data:
+        sync_features(db, db_product)
+    if {"image", "images", "imageVariants"} & update_data.keys():
+        stored = json.loads(db_product.image_variants) if db_product.image_variants else {}
+        images = json.loads(db_product.images) if db_product.images else []
+        db_product.image_variants = json.dumps(collect_variants(
+            [db_product.image, *images], {**stored, **(product.imageVariants or {})}
+        ))
     db.commit()
     db.refresh(db_product)
+    facet_index.upsert(db_product)
+    product_cache.invalidate(product_id)
     return db_product.to_dict()
 
 @router.delete("/api/admin/products/{product_id}")
-async def delete_product(
+def delete_product(
     product_id: str,
     db: Session = Depends(get_db),
     current_user = Depends(require_admin)
@@ -388,7 +547,10 @@ async def delete_product(
     if not db_product:
         raise HTTPException(status_code=404, detail="Product not found")
 
+    delete_features(db, product_id)
     db.delete(db_product)
     db.commit()
+    facet_index.remove(product_id)
+    product_cache.invalidate(product_id)
 
     return {"message": "Product deleted", "id": product_id}
\ No newline at end of file
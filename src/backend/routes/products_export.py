@@ -10,8 +10,11 @@ from io import BytesIO
 import json
 from datetime import datetime
 
-from database import get_db, Product
+from database import get_db, get_read_db, Product
 from auth import require_admin
+from facet_index import facet_index
+from product_features import sync_features
+from product_cache import product_cache
 
 router = APIRouter()
 
@@ -28,8 +31,8 @@ SPEC_FIELDS = [
 ]
 
 @router.get("/api/admin/products/export")
-async def export_products(
-    db: Session = Depends(get_db),
+def export_products(
+    db: Session = Depends(get_read_db),
     current_user = Depends(require_admin)
 ):
     """Export all products to Excel file"""
@@ -138,7 +141,7 @@ async def export_products(
     )
 
 @router.post("/api/admin/products/import")
-async def import_products(
+def import_products(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user = Depends(require_admin)
@@ -148,7 +151,7 @@ async def import_products(
         raise HTTPException(status_code=400, detail="File must be Excel format (.xlsx or .xls)")
 
     try:
-        contents = await file.read()
+        contents = file.file.read()
         wb = load_workbook(BytesIO(contents))
         ws = wb.active
 
@@ -235,6 +238,7 @@ async def import_products(
                     for key, value in product_data.items():
                         if value is not None: setattr(existing_product, key, value)
                     existing_product.updated_at = datetime.utcnow()
+                    sync_features(db, existing_product)
                     updated_count += 1
                 else:
                     product_id = row_data.get("id")
@@ -247,6 +251,7 @@ async def import_products(
 
                     new_product = Product(id=product_id, **product_data)
                     db.add(new_product)
+                    sync_features(db, new_product)
                     created_count += 1
 
             except Exception as e:
@@ -254,6 +259,8 @@ async def import_products(
                 continue
 
         db.commit()
+        facet_index.invalidate()
+        product_cache.clear()
         return {
             "success": True,
             "created": created_count,
@@ -7,7 +7,7 @@ import json
 from io import BytesIO
 from openpyxl import Workbook, load_workbook
 from fastapi import Query
-from database import get_db, PromoCode
+from database import get_db, get_read_db, PromoCode
 from schemas import PromoCodeCreate, PromoCodeUpdate, PromoCodeResponse
 from auth import require_admin
 
@@ -27,7 +27,7 @@ def get_promocodes(db: Session = Depends(get_db), current_user=Depends(require_a
 
 
 @router.get("/api/promocodes/validate")
-def validate_promocode(code: str = Query(...), db: Session = Depends(get_db)):
+def validate_promocode(code: str = Query(...), db: Session = Depends(get_read_db)):
     """Check if promo code is valid and return its details"""
     promo = db.query(PromoCode).filter(PromoCode.code == code).first()
 
@@ -119,7 +119,7 @@ def delete_promocode(id: int, db: Session = Depends(get_db), current_user=Depend
 # --- Excel Import/Export ---
 
 @router.get("/api/admin/promocodes/export/excel")
-def export_promocodes(db: Session = Depends(get_db), current_user=Depends(require_admin)):
+def export_promocodes(db: Session = Depends(get_read_db), current_user=Depends(require_admin)):
     promos = db.query(PromoCode).all()
 
     wb = Workbook()
@@ -157,10 +157,10 @@ def export_promocodes(db: Session = Depends(get_db), current_user=Depends(requir
 
 
 @router.post("/api/admin/promocodes/import/excel")
-async def import_promocodes(file: UploadFile = File(...), db: Session = Depends(get_db),
+def import_promocodes(file: UploadFile = File(...), db: Session = Depends(get_db),
                             current_user=Depends(require_admin)):
     try:
-        contents = await file.read()
+        contents = file.file.read()
         wb = load_workbook(BytesIO(contents))
         ws = wb.active
 
@@ -8,6 +8,8 @@ import json
 
 from database import get_db, Settings
 from auth import require_admin
+from content_cache import VersionedSnapshot
+from product_cache import json_bytes_response
 
 router = APIRouter()
 
@@ -52,7 +54,7 @@ class SettingsData(BaseModel):
 
 # Admin endpoints
 @router.get("/api/admin/settings")
-async def get_settings(
+def get_settings(
     db: Session = Depends(get_db),
     current_user = Depends(require_admin)
 ):
@@ -98,7 +100,7 @@ async def get_settings(
     }
 
 @router.put("/api/admin/settings")
-async def update_settings(
+def update_settings(
     data: SettingsData,
     db: Session = Depends(get_db),
     current_user = Depends(require_admin)
@@ -138,8 +140,7 @@ async def update_settings(
     return {"message": "Settings updated successfully"}
 
 # Public endpoints
-@router.get("/api/settings/currency")
-async def get_currency(db: Session = Depends(get_db)):
+def build_currency(db: Session) -> dict:
     """Get currency settings (public)"""
     settings = db.query(Settings).filter(Settings.id == 1).first()
 
@@ -154,8 +155,14 @@ async def get_currency(db: Session = Depends(get_db)):
         "symbol": settings.currency_symbol
     }
 
-@router.get("/api/settings/site")
-async def get_site_info(db: Session = Depends(get_db)):
+currency_snapshot = VersionedSnapshot(["settings"], build_currency)
+
+@router.get("/api/settings/currency")
+def get_currency():
+    """Get currency settings (public, served from memory)"""
+    return json_bytes_response(currency_snapshot.get())
+
+def build_site_info(db: Session) -> dict:
     """Get site information (public)"""
     settings = db.query(Settings).filter(Settings.id == 1).first()
 
@@ -174,8 +181,14 @@ async def get_site_info(db: Session = Depends(get_db)):
         "address": settings.site_address
     }
 
-@router.get("/api/settings/social")
-async def get_social_links(db: Session = Depends(get_db)):
+site_info_snapshot = VersionedSnapshot(["settings"], build_site_info)
+
+@router.get("/api/settings/site")
+def get_site_info():
+    """Get site information (public, served from memory)"""
+    return json_bytes_response(site_info_snapshot.get())
+
+def build_social_links(db: Session) -> dict:
     """Get social media links (public)"""
     settings = db.query(Settings).filter(Settings.id == 1).first()
 
@@ -192,8 +205,14 @@ async def get_social_links(db: Session = Depends(get_db)):
         "twitter": settings.twitter_url or ""
     }
 
-@router.get("/api/settings/shipping")
-async def get_shipping_info(db: Session = Depends(get_db)):
+social_links_snapshot = VersionedSnapshot(["settings"], build_social_links)
+
+@router.get("/api/settings/social")
+def get_social_links():
+    """Get social media links (public, served from memory)"""
+    return json_bytes_response(social_links_snapshot.get())
+
+def build_shipping_info(db: Session) -> dict:
     """Get shipping settings (public)"""
     settings = db.query(Settings).filter(Settings.id == 1).first()
 
@@ -210,8 +229,14 @@ async def get_shipping_info(db: Session = Depends(get_db)):
         "expressCost": settings.express_shipping_cost
     }
 
-@router.get("/api/settings/filters")
-async def get_filter_settings(db: Session = Depends(get_db)):
+shipping_info_snapshot = VersionedSnapshot(["settings"], build_shipping_info)
+
+@router.get("/api/settings/shipping")
+def get_shipping_info():
+    """Get shipping settings (public, served from memory)"""
+    return json_bytes_response(shipping_info_snapshot.get())
+
+def build_filter_settings(db: Session) -> dict:
     """Get public filter settings"""
     settings = db.query(Settings).filter(Settings.id == 1).first()
     if not settings or not settings.filter_config:
@@ -223,4 +248,11 @@ async def get_filter_settings(db: Session = Depends(get_db)):
         if "enabledFeatures" not in data: data["enabledFeatures"] = []
         return data
     except:
-        return {"priceRanges": [], "diameterRanges": [], "enabledFeatures": []}
\ No newline at end of file
+        return {"priceRanges": [], "diameterRanges": [], "enabledFeatures": []}
+
+filter_settings_snapshot = VersionedSnapshot(["settings"], build_filter_settings)
+
+@router.get("/api/settings/filters")
+def get_filter_settings():
+    """Get public filter settings (served from memory)"""
+    return json_bytes_response(filter_settings_snapshot.get())
@@ -1,60 +1,98 @@
 """
 File upload routes
 """
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
 from auth import require_admin
+from image_variants import generate_variants, remove_variants, variant_urls
+from upload_stream import UploadReceiver, store
 import os
-import uuid
-from pathlib import Path
 
 router = APIRouter()
 
-UPLOAD_DIR = "uploads"
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+# Files per bulk upload (gallery editing)
+MAX_BULK_FILES = int(os.getenv("UPLOAD_MAX_FILES", "20"))
+
+
+async def receive_uploads(request: Request, max_files: int) -> list:
+    """Stream the multipart body to temp files (see upload_stream.py)"""
+    receiver = UploadReceiver(UPLOAD_DIR, MAX_FILE_SIZE, max_files, ALLOWED_EXTENSIONS)
+    received = await receiver.receive(request)
+    if not received:
+        raise HTTPException(status_code=400, detail="No file uploaded")
+    return received
+
+
+async def save_uploads(request: Request, received: list) -> list:
+    """
+    Store received files under their content hash and generate their variants; all or
+    nothing. A file stored before (same content) is reused as is, with its variants.
+    """
+    saved = []
+    try:
+        for part in received:
+            name, created = await store(part, UPLOAD_DIR)
+            saved.append((part, name, created))
+
+        # Resized WebP / AVIF / JPEG variants (process pool), once per distinct file
+        names = list(dict.fromkeys(name for _, name, _ in saved))
+        results = await asyncio.gather(
+            *(generate_variants(os.path.join(UPLOAD_DIR, name)) for name in names),
+            return_exceptions=True
+        )
+        for name, result in zip(names, results):
+            if isinstance(result, ValueError):
+                filename = next(part.filename for part, saved_name, _ in saved if saved_name == name)
+                raise HTTPException(status_code=400, detail=f"{filename}: {result}")
+            if isinstance(result, BaseException):
+                raise result
+        variants = dict(zip(names, results))
+    except BaseException:
+        # Only files this request added; a reused file belongs to earlier uploads
+        for _, name, created in saved:
+            file_path = os.path.join(UPLOAD_DIR, name)
+            if created and os.path.exists(file_path):
+                await run_in_threadpool(remove_variants, file_path)
+                await run_in_threadpool(os.remove, file_path)
+        for part in received[len(saved):]:
+            if os.path.exists(part.temp_path):
+                await run_in_threadpool(os.remove, part.temp_path)
+        raise
+
+    # Get base URL from request
+    base_url = str(request.base_url).rstrip('/')
+
+    return [
+        {
+            "url": f"{base_url}/uploads/{name}",
+            "filename": name,
+            "size": part.size,
+            "mimeType": part.content_type,
+            "variants": variant_urls(f"{base_url}/uploads", variants[name])
+        }
+        for part, name, _ in saved
+    ]
+
 
 @router.post("/api/admin/upload")
 async def upload_file(
     request: Request,
-    file: UploadFile = File(...),
     current_user = Depends(require_admin)
 ):
-    """Upload image file"""
-    # Check file extension
-    file_ext = Path(file.filename).suffix.lower()
-    if file_ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
-        )
-    
-    # Read file
-    contents = await file.read()
-    
-    # Check file size
-    if len(contents) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=413,
-            detail=f"File too large. Max size: {MAX_FILE_SIZE / 1024 / 1024}MB"
-        )
-    
-    # Generate unique filename
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = os.path.join(UPLOAD_DIR, unique_filename)
-    
-    # Save file
-    with open(file_path, "wb") as f:
-        f.write(contents)
-    
-    # Get base URL from request
-    base_url = str(request.base_url).rstrip('/')
-    
-    # Return full URL
-    file_url = f"{base_url}/uploads/{unique_filename}"
-    
-    return {
-        "url": file_url,
-        "filename": unique_filename,
-        "size": len(contents),
-        "mimeType": file.content_type
-    }
\ No newline at end of file
+    """Upload image file (multipart field "file")"""
+    received = await receive_uploads(request, max_files=1)
+    return (await save_uploads(request, received))[0]
+
+
+@router.post("/api/admin/upload/bulk")
+async def upload_files(
+    request: Request,
+    current_user = Depends(require_admin)
+):
+    """Upload several image files at once (multipart field "files"), e.g. for a gallery"""
+    received = await receive_uploads(request, max_files=MAX_BULK_FILES)
+    return {"files": await save_uploads(request, received)}
@@ -51,6 +51,7 @@ class BoutiquePageData(BaseModel):
     infoBlock: BoutiqueInfoBlock
     services: List[ServiceItem]
     gallery: List[GalleryItem]
+    imageVariants: Optional[Dict[str, dict]] = None  # image URL -> variants (upload response)
 class HistoryEventUpdate(BaseModel):
     year: Optional[str] = None
     title: Optional[str] = None
@@ -64,6 +65,7 @@ class ProductBase(BaseModel):
     price: float
     image: Optional[str] = None
     images: Optional[List[str]] = []
+    imageVariants: Optional[Dict[str, dict]] = None  # image URL -> variants (upload response)
     description: Optional[str] = None
     features: Optional[List[str]] = []
     specs: Optional[Dict[str, str]] = {}
@@ -102,6 +104,7 @@ class ProductUpdate(BaseModel):
     price: Optional[float] = None
     image: Optional[str] = None
     images: Optional[List[str]] = None
+    imageVariants: Optional[Dict[str, dict]] = None
     description: Optional[str] = None
     features: Optional[List[str]] = None
     specs: Optional[Dict[str, str]] = None
@@ -127,6 +130,10 @@ class ProductUpdate(BaseModel):
     fbTitle: Optional[str] = None
     fbDescription: Optional[str] = None
 
+class ProductBatchRequest(BaseModel):
+    ids: List[str]
+    fields: Optional[str] = None  # card | detail | admin-grid или список полей
+
 # Collection schemas
 class CollectionBase(BaseModel):
     id: str
@@ -186,6 +193,7 @@ class HeroContent(BaseModel):
     subtitle: str
     image: str
     mobileImage: Optional[str] = ""
+    imageVariants: Optional[Dict[str, dict]] = None  # image URL -> variants (upload response)
     ctaText: str
     ctaLink: str
     # Цвета (опциональны, чтобы не ломать старые запросы)
@@ -0,0 +1,172 @@
+"""
+Full-text product search (SQLite FTS5)
+products_fts mirrors name, sku, collection, description and seo_keywords,
+kept in sync by triggers on the products table. Entries carry the product id
+(what searches join on) and use the product's rowid as their own, so the triggers
+update and delete by key instead of scanning the index. products has a text
+primary key, so its rowids are not guaranteed stable (VACUUM may renumber them):
+init_search_index checks the index against the table at startup and rebuilds it
+when they disagree.
+"""
+import re
+from sqlalchemy import text, column, or_, Float, String
+from sqlalchemy.orm import Session
+
+from database import engine, Product
+
+SEARCH_COLUMNS = ["name", "sku", "collection", "description", "seo_keywords"]
+
+
+def _folded(prefix: str) -> str:
+    """Column list for the triggers: ё/Ё stored as е/Е (unicode61 strips Latin diacritics only)"""
+    return ", ".join(f"replace(replace({prefix}{c}, 'ё', 'е'), 'Ё', 'Е')" for c in SEARCH_COLUMNS)
+
+
+# unicode61 folds case for Cyrillic too
+FTS_SCHEMA = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        product_id UNINDEXED,
+        {", ".join(SEARCH_COLUMNS)},
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts (rowid, product_id, {", ".join(SEARCH_COLUMNS)})
+        VALUES (new.rowid, new.id, {_folded("new.")});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        DELETE FROM products_fts WHERE rowid = old.rowid;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS products_fts_au
+    AFTER UPDATE OF id, {", ".join(SEARCH_COLUMNS)} ON products BEGIN
+        DELETE FROM products_fts WHERE rowid = old.rowid;
+        INSERT INTO products_fts (rowid, product_id, {", ".join(SEARCH_COLUMNS)})
+        VALUES (new.rowid, new.id, {_folded("new.")});
+    END
+    """,
+]
+
+DROP_SCHEMA = [
+    "DROP TRIGGER IF EXISTS products_fts_ai",
+    "DROP TRIGGER IF EXISTS products_fts_ad",
+    "DROP TRIGGER IF EXISTS products_fts_au",
+    "DROP TABLE IF EXISTS products_fts",
+]
+
+# bm25 column weights: product_id (unindexed), name, sku, collection, description, seo_keywords
+BM25_WEIGHTS = "0.0, 10.0, 8.0, 4.0, 1.0, 2.0"
+
+_fts_ready = None
+
+
+def _fts_state(conn) -> str:
+    """
+    missing; legacy (before m0015: triggers find entries by product_id, still searchable);
+    current; or broken (no product_id column, rebuilt)
+    """
+    rows = dict(conn.execute(text(
+        "SELECT name, sql FROM sqlite_master WHERE name IN ('products_fts', 'products_fts_ad')"
+    )).all())
+    if "products_fts" not in rows:
+        return "missing"
+    if "product_id" not in rows["products_fts"]:
+        return "broken"
+    return "current" if "old.rowid" in (rows.get("products_fts_ad") or "") else "legacy"
+
+
+def _in_sync(conn) -> bool:
+    """Every product has exactly one entry, under its current rowid and id"""
+    return not conn.execute(text(
+        "SELECT (SELECT count(*) FROM products) != (SELECT count(*) FROM products_fts) "
+        "OR EXISTS (SELECT 1 FROM products_fts f LEFT JOIN products p ON p.rowid = f.rowid "
+        "WHERE p.id IS NULL OR p.id != f.product_id)"
+    )).scalar()
+
+
+def init_search_index(bind=None, rebuild: bool = False):
+    """
+    Create products_fts + triggers (SQLite only) and fill it if it is new.
+    rebuild=True recreates it from scratch (also converts the legacy layout, see m0015).
+    The current layout is rebuilt when it no longer matches products (renumbered rowids).
+    """
+    global _fts_ready
+    bind = bind or engine
+    if bind.dialect.name != "sqlite":
+        _fts_ready = False
+        return
+
+    with bind.begin() as conn:
+        state = _fts_state(conn)
+        if state == "current" and not rebuild and not _in_sync(conn):
+            print("⚠️  products_fts does not match products (renumbered rowids?), rebuilding")
+            rebuild = True
+        if state == "legacy" and not rebuild:
+            # Its own triggers keep it correct until m0015 converts it
+            _fts_ready = True
+            return
+        if rebuild or state == "broken":
+            for statement in DROP_SCHEMA:
+                conn.execute(text(statement))
+        for statement in FTS_SCHEMA:
+            conn.execute(text(statement))
+        if rebuild or state != "current":
+            conn.execute(text(
+                f"INSERT INTO products_fts (rowid, product_id, {', '.join(SEARCH_COLUMNS)}) "
+                f"SELECT rowid, id, {_folded('')} FROM products"
+            ))
+    _fts_ready = True
+
+
+def fts_ready(db: Session) -> bool:
+    """Whether products_fts exists and can be searched (checked once per process)"""
+    global _fts_ready
+    if _fts_ready is None:
+        bind = db.get_bind()
+        _fts_ready = bind.dialect.name == "sqlite" and _fts_state(db) in ("current", "legacy")
+    return _fts_ready
+
+
+def build_match_query(search: str):
+    """
+    User input -> FTS5 MATCH expression: every word is a quoted prefix term, all must match.
+    None if the input has no searchable words.
+    """
+    words = re.findall(r"\w+", search.lower().replace("ё", "е"))
+    if not words:
+        return None
+    return " ".join(f'"{w}"*' for w in words)
+
+
+def fts_matches(match: str):
+    """Subquery of (product_id, rank) for a MATCH expression, lower rank = better"""
+    return text(
+        f"SELECT product_id, bm25(products_fts, {BM25_WEIGHTS}) AS rank "
+        "FROM products_fts WHERE products_fts MATCH :match"
+    ).bindparams(match=match).columns(
+        column("product_id", String), column("rank", Float)
+    ).subquery("fts")
+
+
+def apply_search(query, db: Session, search: str, ranked: bool = False):
+    """
+    Filter a Product query by search text, returns (query, ranked_applied).
+    FTS5 when available (ranked=True also orders by bm25), otherwise a case-insensitive LIKE scan
+    (SQLite LIKE already ignored case, PostgreSQL LIKE does not). ranked_applied is False when
+    no rank order was added (LIKE fallback, nothing to match): the caller must sort.
+    """
+    match = build_match_query(search) if fts_ready(db) else None
+    if match is None:
+        return query.filter(or_(Product.name.icontains(search), Product.sku.icontains(search))), False
+
+    fts = fts_matches(match)
+    query = query.join(fts, fts.c.product_id == Product.id)
+    if ranked:
+        query = query.order_by(fts.c.rank, Product.id)
+    return query, ranked
@@ -0,0 +1,103 @@
+"""
+Shared fixtures: every test gets its own SQLite database (both session factories
+are pointed at it) and its own upload / feed directories
+"""
+import json
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+# Before the app modules read them at import
+_scratch = tempfile.mkdtemp(prefix="orient_tests_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_scratch, 'unused.db')}")
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_scratch, "uploads"))
+os.environ.setdefault("FEED_DIR", os.path.join(_scratch, "feeds"))
+os.environ.setdefault("IMAGE_CACHE_DIR", os.path.join(_scratch, "image_cache"))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import database
+import change_versions  # registers the table_versions listeners
+import collection_links  # and the collection_id listener
+from database import Base, Product, Collection
+from change_versions import init_table_versions, version_watcher
+from collection_counts import init_collection_counts
+from search_index import init_search_index
+from facet_index import facet_index
+from product_cache import product_cache
+
+COLLECTIONS = ["SPORTS", "CLASSIC", "CONTEMPORARY", "STAR"]
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    """Fresh SQLite database with the schema, triggers and table_versions rows"""
+    database.configure_engines(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=database.engine)
+    init_search_index(bind=database.engine)
+    init_collection_counts(bind=database.engine)
+    init_table_versions(bind=database.engine)
+    version_watcher.mark_stale()
+    facet_index.invalidate()
+    product_cache.clear()
+    yield database.engine
+    database.engine.dispose()
+    database.read_engine.dispose()
+
+
+@pytest.fixture
+def upload_dir():
+    """Empty UPLOAD_DIR"""
+    path = os.environ["UPLOAD_DIR"]
+    if os.path.isdir(path):
+        import shutil
+        shutil.rmtree(path)
+    os.makedirs(path)
+    return path
+
+
+def seed_products(count: int, seed: int = 7):
+    """Random products with ties and NULLs in the sort and facet columns"""
+    rnd = random.Random(seed)
+    started = datetime(2024, 1, 1)
+    db = database.SessionLocal()
+    try:
+        for name in COLLECTIONS:
+            db.add(Collection(id=name.lower(), name=name))
+        db.flush()
+        for i in range(count):
+            db.add(Product(
+                id=f"p{i:04d}",
+                name=rnd.choice(["Alpha", "Bambino", "Kamasu", "Star"]) + f" {rnd.randint(1, 9)}",
+                collection=rnd.choice(COLLECTIONS),
+                price=float(rnd.choice([100, 250, 250, 400, 1000])),
+                images=json.dumps([]),
+                in_stock=rnd.random() > 0.2,
+                is_featured=rnd.random() > 0.7,
+                brand=rnd.choice(["Orient", "Orient Star", None]),
+                gender=rnd.choice(["male", "female", None]),
+                case_diameter=rnd.choice([38.0, 40.5, 42.0, None]),
+                strap_material=rnd.choice(["steel", "leather"]),
+                movement=rnd.choice(["automatic", "quartz", None]),
+                case_material=rnd.choice(["steel", "titanium"]),
+                dial_color=rnd.choice(["black", "blue", "white"]),
+                water_resistance=rnd.choice(["50m", "100m", "200m"]),
+                created_at=started + timedelta(days=rnd.randint(0, 20)),
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def make_client(*routers, admin: bool = True) -> TestClient:
+    """TestClient over the given routers; admin routes pass without a token unless admin=False"""
+    app = FastAPI()
+    for router in routers:
+        app.include_router(router)
+    if admin:
+        import auth
+        app.dependency_overrides[auth.require_admin] = lambda: object()
+    return TestClient(app)
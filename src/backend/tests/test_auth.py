@@ -0,0 +1,46 @@
+"""Authentication does not keep a database connection for the rest of the request"""
+from fastapi import APIRouter, Depends
+
+import database
+from auth import create_access_token, get_password_hash, require_admin
+from database import User
+from conftest import make_client
+
+
+def add_user(role: str) -> str:
+    db = database.SessionLocal()
+    try:
+        user = User(email=f"{role}@example.com", password_hash=get_password_hash("x"), name=role, role=role)
+        db.add(user)
+        db.commit()
+        return create_access_token({"user_id": user.id, "email": user.email})
+    finally:
+        db.close()
+
+
+def test_admin_request_holds_no_connection(db_engine):
+    router = APIRouter()
+    seen = {}
+
+    @router.get("/api/admin/probe")
+    def probe(current_user=Depends(require_admin)):
+        seen["writer"] = database.engine.pool.checkedout()
+        seen["reader"] = database.read_engine.pool.checkedout()
+        return {"email": current_user.email}
+
+    client = make_client(router, admin=False)
+    token = add_user("admin")
+    response = client.get("/api/admin/probe", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200 and response.json() == {"email": "admin@example.com"}
+    assert seen == {"writer": 0, "reader": 0}
+
+
+def test_non_admin_and_unknown_users_are_rejected(db_engine):
+    router = APIRouter()
+    router.get("/api/admin/probe")(lambda current_user=Depends(require_admin): {})
+    client = make_client(router, admin=False)
+
+    token = add_user("viewer")
+    assert client.get("/api/admin/probe", headers={"Authorization": f"Bearer {token}"}).status_code == 403
+    ghost = create_access_token({"user_id": 999, "email": "ghost@example.com"})
+    assert client.get("/api/admin/probe", headers={"Authorization": f"Bearer {ghost}"}).status_code == 401
@@ -0,0 +1,39 @@
+"""No endpoint holding the sync DB session runs on the event loop"""
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy.orm import Session
+
+import auth
+from blocking_routes import blocking_async_routes, check_blocking_routes
+from database import get_db, get_read_db
+
+
+def test_app_routes_pass():
+    import main
+    assert blocking_async_routes(main.app) == []
+
+
+def test_async_route_with_session_is_refused():
+    app = FastAPI()
+
+    @app.get("/sync")
+    def sync_endpoint(db: Session = Depends(get_read_db)):
+        return {}
+
+    @app.get("/no-db")
+    async def async_without_db():
+        return {}
+
+    @app.get("/admin")
+    async def async_behind_admin(user=Depends(auth.require_admin)):
+        return {}
+
+    check_blocking_routes(app)
+
+    @app.post("/blocking")
+    async def blocking(db: Session = Depends(get_db)):
+        return {}
+
+    assert blocking_async_routes(app) == ["POST /blocking"]
+    with pytest.raises(RuntimeError, match="POST /blocking"):
+        check_blocking_routes(app)
@@ -0,0 +1,66 @@
+"""collections.product_count follows every write path to products"""
+from sqlalchemy import text
+
+import database
+from collection_counts import init_collection_counts
+from database import Product
+from routes import collections, products
+from conftest import make_client, seed_products
+
+
+def stored_and_actual() -> tuple:
+    with database.engine.connect() as conn:
+        stored = dict(conn.execute(text("SELECT id, product_count FROM collections")).all())
+        actual = dict(conn.execute(text(
+            "SELECT collections.id, count(products.id) FROM collections "
+            "LEFT JOIN products ON products.collection_id = collections.id GROUP BY collections.id"
+        )).all())
+    return stored, actual
+
+
+def assert_counts_exact():
+    stored, actual = stored_and_actual()
+    assert stored == actual
+
+
+def test_orm_and_route_writes(db_engine):
+    seed_products(30)
+    assert_counts_exact()
+    client = make_client(collections.router, products.router)
+
+    created = client.post("/api/admin/products", json={"name": "New", "collection": "STAR", "price": 1.0}).json()
+    assert client.put(f"/api/admin/products/{created['id']}", json={"collection": "CLASSIC"}).status_code == 200
+    assert client.delete("/api/admin/products/p0001").status_code == 200
+    assert_counts_exact()
+
+    watch_counts = {c["id"]: c["watchCount"] for c in client.get("/api/collections").json()}
+    assert watch_counts == stored_and_actual()[1]
+    assert client.get("/api/collections/classic").json()["watchCount"] == watch_counts["classic"]
+
+
+def test_bulk_sql_and_late_collection(db_engine):
+    seed_products(30)
+    with database.engine.begin() as conn:
+        conn.execute(text("UPDATE products SET collection_id = 'sports' WHERE collection_id = 'star'"))
+        conn.execute(text("DELETE FROM products WHERE collection_id = 'classic' AND price > 300"))
+    assert_counts_exact()
+
+    # Products that name a collection created later are linked and counted
+    db = database.SessionLocal()
+    db.add(Product(id="orphan", name="O", collection="DIVER", price=1.0, images="[]"))
+    db.commit()
+    db.close()
+    client = make_client(collections.router)
+    assert client.post("/api/admin/collections", json={"id": "diver", "name": "DIVER"}).status_code == 200
+    assert client.get("/api/collections/diver").json()["watchCount"] == 1
+    assert_counts_exact()
+
+
+def test_rebuild_recounts(db_engine):
+    seed_products(10)
+    with database.engine.begin() as conn:
+        conn.execute(text("UPDATE collections SET product_count = 99"))
+    init_collection_counts(bind=database.engine)
+    assert stored_and_actual()[0]["star"] == 99  # triggers exist, nothing to do
+    init_collection_counts(bind=database.engine, rebuild=True)
+    assert_counts_exact()
@@ -0,0 +1,57 @@
+"""Products follow their collection: duplicate names, rename and delete, seen by every worker"""
+from sqlalchemy import text
+
+import database
+from collection_links import rename_collection_products
+from database import Collection, Product
+from routes import collections, products
+from conftest import make_client, seed_products
+
+
+def collection_facet(client) -> dict:
+    body = client.get("/api/products/facets").json()
+    return {o["value"]: o["count"] for o in body["collections"]}
+
+
+def test_duplicate_collection_names_link_to_one(db_engine):
+    with db_engine.begin() as conn:
+        # Tables created before names were unique
+        conn.execute(text("DROP INDEX ix_collections_name"))
+    db = database.SessionLocal()
+    db.add_all([Collection(id="b-sports", name="SPORTS"), Collection(id="a-sports", name="SPORTS")])
+    db.commit()
+    db.add(Product(id="p1", name="P", collection="SPORTS", price=1, images="[]"))
+    db.commit()
+    assert db.get(Product, "p1").collection_id == "a-sports"
+    db.close()
+
+
+def test_deleted_collection_leaves_no_name_behind(db_engine):
+    seed_products(30)
+    client = make_client(collections.router, products.router)
+    assert "STAR" in collection_facet(client)
+
+    assert client.delete("/api/admin/collections/star").status_code == 200
+    assert "STAR" not in collection_facet(client)
+    db = database.ReadSessionLocal()
+    assert db.query(Product).filter(Product.collection == "STAR").count() == 0
+    db.close()
+
+
+def test_rename_reaches_facets_without_local_invalidation(db_engine):
+    seed_products(30)
+    client = make_client(products.router)
+    before = collection_facet(client)
+
+    # As another worker would: nothing tells this worker's facet index
+    db = database.SessionLocal()
+    collection = db.get(Collection, "classic")
+    collection.name = "CLASSIC II"
+    db.flush()
+    rename_collection_products(db, collection)
+    db.commit()
+    db.close()
+
+    after = collection_facet(client)
+    assert "CLASSIC" not in after
+    assert after["CLASSIC II"] == before["CLASSIC"]
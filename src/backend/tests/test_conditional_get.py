@@ -0,0 +1,72 @@
+"""ETag / Last-Modified / 304 follow the table versions, whichever worker wrote"""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+import auth
+from change_versions import bump_versions
+from conditional_get import ConditionalGetMiddleware
+from database import Product
+from routes import content, products
+from conftest import seed_products
+
+
+def make_app_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(products.router)
+    app.include_router(content.router)
+    app.add_middleware(ConditionalGetMiddleware)
+    app.dependency_overrides[auth.require_admin] = lambda: object()
+    return TestClient(app)
+
+
+def test_matching_etag_gets_304(db_engine):
+    seed_products(5)
+    client = make_app_client()
+    first = client.get("/api/products")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and first.headers["Cache-Control"] == "no-cache"
+
+    again = client.get("/api/products", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["ETag"] == etag
+    # Weak comparison, lists and the query string
+    assert client.get("/api/products", headers={"If-None-Match": f'"x", {etag.removeprefix("W/")}'}).status_code == 304
+    assert client.get("/api/products?page=2", headers={"If-None-Match": etag}).status_code == 200
+    assert client.get("/api/products", headers={"If-Modified-Since": first.headers["Last-Modified"]}).status_code == 304
+
+
+def test_admin_put_changes_etag(db_engine):
+    client = make_app_client()
+    etag = client.get("/api/content/homepage").headers["ETag"]
+    assert client.get("/api/content/logo").headers["ETag"] != etag
+
+    response = client.put("/api/admin/content/logo", json={"logoUrl": "/uploads/new.png"})
+    assert response.status_code == 200 and "ETag" not in response.headers
+
+    changed = client.get("/api/content/homepage", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["logo"]["logoUrl"] == "/uploads/new.png"
+
+
+def test_write_from_another_worker_changes_etag(db_engine):
+    seed_products(5)
+    client = make_app_client()
+    etag = client.get("/api/products/p0001").headers["ETag"]
+
+    other = create_engine(str(db_engine.url))
+    with other.begin() as conn:
+        conn.execute(Product.__table__.update().where(Product.id == "p0001").values(price=1.0))
+        bump_versions(conn, ["products"])
+    other.dispose()
+
+    response = client.get("/api/products/p0001", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["price"] == 1.0
+
+
+def test_admin_routes_are_not_conditional(db_engine):
+    seed_products(2)
+    client = make_app_client()
+    assert "ETag" not in client.get("/api/admin/products").headers
@@ -0,0 +1,72 @@
+"""Content snapshots are built once per table version, whichever worker wrote"""
+import json
+import threading
+import time
+
+from sqlalchemy import create_engine
+
+from change_versions import bump_versions
+from content_cache import VersionedSnapshot
+from database import ContentSiteLogo
+from routes import content
+from conftest import make_client
+
+
+def counting_snapshot(tables=("content_site_logo",)):
+    builds = []
+
+    def build(db):
+        builds.append(1)
+        return {"logo": content.build_site_logo(db), "build": len(builds)}
+
+    return VersionedSnapshot(list(tables), build), builds
+
+
+def test_unchanged_versions_reuse_snapshot(db_engine):
+    snapshot, builds = counting_snapshot()
+    first = snapshot.get()
+    assert snapshot.get() is first and len(builds) == 1
+
+    snapshot.invalidate()
+    assert json.loads(snapshot.get())["build"] == 2
+
+
+def test_write_from_another_worker_rebuilds(db_engine):
+    snapshot, builds = counting_snapshot()
+    assert json.loads(snapshot.get())["logo"]["logoDarkUrl"] is None
+
+    other = create_engine(str(db_engine.url))
+    with other.begin() as conn:
+        conn.execute(ContentSiteLogo.__table__.insert(), {"id": 1, "logo_url": "/a.png", "logo_dark_url": "/b.png"})
+        bump_versions(conn, ["content_site_logo"])
+    other.dispose()
+
+    assert json.loads(snapshot.get())["logo"] == {"logoUrl": "/a.png", "logoDarkUrl": "/b.png"}
+    assert len(builds) == 2
+
+
+def test_unrelated_table_keeps_snapshot(db_engine):
+    snapshot, builds = counting_snapshot()
+    snapshot.get()
+    client = make_client(content.router)
+    assert client.put("/api/admin/content/hero", json={
+        "title": "T", "subtitle": "S", "image": "/h.png", "ctaText": "Go", "ctaLink": "/"}).status_code == 200
+    snapshot.get()
+    assert len(builds) == 1
+
+
+def test_concurrent_misses_build_once(db_engine):
+    builds = []
+
+    def slow_build(db):
+        builds.append(1)
+        time.sleep(0.1)
+        return {}
+
+    snapshot = VersionedSnapshot(["content_site_logo"], slow_build)
+    threads = [threading.Thread(target=snapshot.get) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert builds == [1]
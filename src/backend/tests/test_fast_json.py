@@ -0,0 +1,64 @@
+"""orjson and the stdlib fallback give the same bytes for what the routes return"""
+import importlib
+import json
+import sys
+from datetime import date, datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import fast_json
+
+PAYLOAD = {
+    "name": "Часы Orient",
+    "price": 1250.5,
+    "createdAt": datetime(2024, 3, 1, 12, 30, 5, 123456),
+    "day": date(2024, 3, 1),
+    "sizes": {600: "a.webp"},
+    "tags": [None, True, 0],
+}
+EXPECTED = {
+    "name": "Часы Orient",
+    "price": 1250.5,
+    "createdAt": "2024-03-01T12:30:05.123456",
+    "day": "2024-03-01",
+    "sizes": {"600": "a.webp"},
+    "tags": [None, True, 0],
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setitem(sys.modules, "orjson", None)
+    module = importlib.reload(fast_json)
+    assert module.BACKEND == request.param
+    yield module
+    monkeypatch.undo()
+    importlib.reload(fast_json)
+
+
+def test_dumps(backend):
+    body = backend.dumps(PAYLOAD)
+    assert "Часы".encode() in body  # not \u-escaped
+    assert json.loads(body) == EXPECTED
+
+
+def test_dumps_rejects_unknown_types(backend):
+    with pytest.raises(TypeError):
+        backend.dumps({"value": object()})
+
+
+def test_default_response_class(backend):
+    app = FastAPI(default_response_class=backend.FastJSONResponse)
+
+    @app.get("/probe")
+    def probe():
+        return PAYLOAD
+
+    response = TestClient(app).get("/probe")
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == EXPECTED
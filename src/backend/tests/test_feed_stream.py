@@ -0,0 +1,65 @@
+"""The streamed feed holds every in-stock product once, whatever the batch size and encoding"""
+import gzip
+import json
+
+import pytest
+
+import database
+from database import Product
+from product_feed import FEED_WRITERS, gzip_stream, write_static_feeds
+from routes import products
+from conftest import make_client, seed_products
+
+
+def in_stock_feed() -> list:
+    db = database.ReadSessionLocal()
+    try:
+        rows = db.query(Product).filter(Product.in_stock == True).order_by(Product.id).all()
+        return [json.loads(json.dumps(p.to_feed_dict(), default=str)) for p in rows]
+    finally:
+        db.close()
+
+
+def parse(format: str, body: bytes) -> list:
+    if format == "json":
+        feed = json.loads(body)
+        assert feed["meta"]["total"] == len(feed["products"])
+        return feed["products"]
+    assert body.endswith(b"\n")
+    return [json.loads(line) for line in body.splitlines()]
+
+
+@pytest.mark.parametrize("format", ["json", "ndjson"])
+@pytest.mark.parametrize("batch_size", [1, 3, 500])
+def test_stream_matches_products(db_engine, format, batch_size):
+    seed_products(10)
+    expected = in_stock_feed()
+    assert 0 < len(expected) < 10
+
+    body = b"".join(FEED_WRITERS[format](batch_size))
+    assert parse(format, body) == expected
+    zipped = b"".join(gzip_stream(FEED_WRITERS[format](batch_size)))
+    assert parse(format, gzip.decompress(zipped)) == expected
+
+
+def test_empty_feed(db_engine):
+    assert parse("json", b"".join(FEED_WRITERS["json"]())) == []
+    assert b"".join(FEED_WRITERS["ndjson"]()) == b""
+
+
+@pytest.mark.parametrize("format", ["json", "ndjson"])
+def test_route_encodings(db_engine, format):
+    seed_products(10)
+    write_static_feeds(batch_size=4)
+    client = make_client(products.router)
+
+    plain = client.get("/api/products/feed", params={"format": format}, headers={"Accept-Encoding": "identity"})
+    assert plain.status_code == 200 and "Content-Encoding" not in plain.headers
+    assert plain.headers["content-type"].startswith(
+        "application/json" if format == "json" else "application/x-ndjson")
+    assert parse(format, plain.content) == in_stock_feed()
+
+    # httpx decodes the gzip body for us
+    zipped = client.get("/api/products/feed", params={"format": format}, headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert parse(format, zipped.content) == in_stock_feed()
@@ -0,0 +1,25 @@
+"""/api/content/homepage carries what Header and SettingsProvider would otherwise fetch one by one"""
+from routes import content, settings
+from conftest import make_client, seed_products
+
+
+def test_homepage_matches_single_endpoints(db_engine):
+    seed_products(5)
+    client = make_client(content.router, settings.router)
+    home = client.get("/api/content/homepage").json()
+
+    assert home["logo"] == client.get("/api/content/logo").json()
+    assert home["promoBanner"] == client.get("/api/content/promo-banner").json()
+    for key in ("currency", "site", "social", "shipping"):
+        assert home["settings"][key] == client.get(f"/api/settings/{key}").json()
+
+
+def test_homepage_follows_admin_logo_update(db_engine):
+    client = make_client(content.router)
+    assert client.get("/api/content/homepage").json()["logo"]["logoDarkUrl"] is None
+
+    response = client.put("/api/admin/content/logo", json={"logoUrl": "/uploads/logo.png",
+                                                          "logoDarkUrl": "/uploads/logo-dark.png"})
+    assert response.status_code == 200
+    assert client.get("/api/content/homepage").json()["logo"] == {
+        "logoUrl": "/uploads/logo.png", "logoDarkUrl": "/uploads/logo-dark.png"}
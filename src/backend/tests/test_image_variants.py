@@ -0,0 +1,80 @@
+"""Upload variants: written atomically, reused for the same content, rejected for non-images"""
+import asyncio
+import json
+import os
+
+import pytest
+from PIL import Image
+
+import image_variants
+from image_variants import MANIFEST, VARIANTS, available_formats, generate_variants, render_variant, \
+    shutdown_image_pool
+
+
+def write_jpeg(path: str, size=(1600, 1200)):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    Image.new("RGB", size, "teal").save(path, "JPEG")
+
+
+@pytest.fixture
+def pool():
+    yield
+    shutdown_image_pool()
+
+
+def test_failed_write_leaves_no_partial_file(upload_dir, monkeypatch):
+    source = os.path.join(upload_dir, "ab", "cd", "abcd.jpg")
+    write_jpeg(source)
+    target_dir = os.path.join(upload_dir, "ab", "cd", "abcd")
+    os.makedirs(target_dir)
+    save = image_variants._save
+
+    def crash_midway(image, path, fmt):
+        with open(path, "wb") as f:
+            f.write(b"truncated")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(image_variants, "_save", crash_midway)
+    with pytest.raises(OSError):
+        render_variant(source, target_dir, "ab/cd/abcd", "card", VARIANTS["card"], ["jpeg"])
+    assert os.listdir(target_dir) == []
+
+    monkeypatch.setattr(image_variants, "_save", save)
+    variant = render_variant(source, target_dir, "ab/cd/abcd", "card", VARIANTS["card"], ["jpeg"])
+    assert os.listdir(target_dir) == ["card.jpeg"]
+    assert variant == {"width": 600, "height": 450, "jpeg": "ab/cd/abcd/card.jpeg"}
+
+
+def test_variants_and_manifest(upload_dir, pool):
+    source = os.path.join(upload_dir, "ab", "cd", "abcd.jpg")
+    write_jpeg(source)
+    variants = asyncio.run(generate_variants(source))
+
+    assert set(variants) == set(VARIANTS)
+    for name, variant in variants.items():
+        box = VARIANTS[name]
+        assert variant["width"] <= box[0] and variant["height"] <= box[1]
+        for fmt in available_formats():
+            with Image.open(os.path.join(upload_dir, variant[fmt])) as image:
+                assert image.size == (variant["width"], variant["height"])
+    with open(os.path.join(upload_dir, "ab", "cd", "abcd", MANIFEST)) as f:
+        assert json.load(f) == variants
+    assert not [name for name in os.listdir(os.path.join(upload_dir, "ab", "cd", "abcd")) if name.endswith(".tmp")]
+
+
+def test_existing_manifest_is_reused(upload_dir, pool, monkeypatch):
+    source = os.path.join(upload_dir, "ab", "cd", "abcd.jpg")
+    write_jpeg(source)
+    first = asyncio.run(generate_variants(source))
+    monkeypatch.setattr(image_variants, "render_variant", None)  # any render would fail
+    assert asyncio.run(generate_variants(source)) == first
+
+
+def test_not_an_image_is_rejected_and_cleaned_up(upload_dir, pool):
+    source = os.path.join(upload_dir, "ab", "cd", "abcd.jpg")
+    os.makedirs(os.path.dirname(source))
+    with open(source, "wb") as f:
+        f.write(b"not a jpeg")
+    with pytest.raises(ValueError):
+        asyncio.run(generate_variants(source))
+    assert not os.path.exists(os.path.join(upload_dir, "ab", "cd", "abcd"))
@@ -0,0 +1,81 @@
+"""/img resizes: only allowed sizes, served from the disk cache, survive eviction"""
+import io
+import os
+
+import pytest
+from PIL import Image
+
+import image_cache
+from image_variants import shutdown_image_pool
+from routes import images
+from upload_stream import stored_name
+from conftest import make_client
+
+NAME = stored_name("ab" * 16, ".jpg")
+
+
+@pytest.fixture
+def client(upload_dir, tmp_path, monkeypatch):
+    path = os.path.join(upload_dir, NAME)
+    os.makedirs(os.path.dirname(path))
+    buffer = io.BytesIO()
+    Image.new("RGB", (1600, 900), "navy").save(buffer, "JPEG")
+    with open(path, "wb") as f:
+        f.write(buffer.getvalue())
+    monkeypatch.setattr(images, "image_cache", image_cache.ImageCache(str(tmp_path / "cache")))
+    yield make_client(images.router)
+    shutdown_image_pool()
+
+
+def test_allowed_size_is_rendered_once(client):
+    response = client.get(f"/img/600x0/webp/{NAME}")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    assert response.headers["cache-control"] == images.IMMUTABLE
+    assert Image.open(io.BytesIO(response.content)).size == (600, 338)
+
+    cached = images.image_cache.path(NAME, 600, 0, "webp")
+    mtime = os.stat(cached).st_mtime_ns
+    assert client.get(f"/img/600x0/webp/{NAME}").content == response.content
+    assert os.stat(cached).st_mtime_ns >= mtime
+
+
+@pytest.mark.parametrize("size, status", [
+    ("601x0", 404), ("600x1", 404), ("2560x2560", 404), ("0x0", 400), ("big", 400),
+])
+def test_other_sizes_are_refused(client, size, status):
+    assert client.get(f"/img/{size}/webp/{NAME}").status_code == status
+    assert not os.path.exists(images.image_cache.directory)
+
+
+def test_file_evicted_before_it_is_opened_is_rendered_again(client, monkeypatch):
+    get = images.image_cache.get
+    evicted = []
+
+    async def get_then_evict(*args):
+        path = await get(*args)
+        if not evicted:
+            os.remove(path)
+            evicted.append(path)
+        return path
+
+    monkeypatch.setattr(images.image_cache, "get", get_then_evict)
+    response = client.get(f"/img/800x0/jpeg/{NAME}")
+    assert response.status_code == 200 and evicted
+    assert Image.open(io.BytesIO(response.content)).size == (800, 450)
+
+
+def test_least_recently_used_is_evicted(client):
+    cache = images.image_cache
+    paths = {}
+    for age, width in enumerate([600, 800, 1000], start=1):
+        assert client.get(f"/img/{width}x0/webp/{NAME}").status_code == 200
+        paths[width] = cache.path(NAME, width, 0, "webp")
+        os.utime(paths[width], (age, age))
+    # A hit makes the oldest file the most recent one
+    assert client.get(f"/img/600x0/webp/{NAME}").status_code == 200
+
+    cache.max_bytes = cache._scan_size() - 1
+    cache._added(0)
+    assert {w for w, p in paths.items() if os.path.exists(p)} == {600, 1000}
+    assert cache._size <= cache.max_bytes
@@ -0,0 +1,121 @@
+"""m0014: flat uploads move to content-addressed names, identical files merge, URLs follow"""
+import gzip
+import json
+import os
+import importlib
+
+import database
+import migrate
+from database import Product, Collection, ContentHero, SchemaVersion, TableVersion
+from product_cache import product_json
+from product_feed import feed_path, write_static_feeds
+from upload_stream import file_digest, stored_name
+
+m0014 = importlib.import_module("migrations.m0014_content_addressed_uploads")
+
+
+def write_upload(upload_dir: str, name: str, data: bytes, variants: bool = True):
+    """Old layout: <uuid>.jpg plus <uuid>/card.webp and a manifest relative to UPLOAD_DIR"""
+    with open(os.path.join(upload_dir, name), "wb") as f:
+        f.write(data)
+    if variants:
+        stem = os.path.splitext(name)[0]
+        os.makedirs(os.path.join(upload_dir, stem))
+        with open(os.path.join(upload_dir, stem, "card.webp"), "wb") as f:
+            f.write(b"webp " + data)
+        with open(os.path.join(upload_dir, stem, "variants.json"), "w") as f:
+            json.dump({"card": {"width": 600, "height": 400, "webp": f"{stem}/card.webp"}}, f)
+
+
+def run_m0014():
+    migration = migrate.Migration(14, "content_addressed_uploads", m0014)
+    SchemaVersion.__table__.create(bind=database.engine, checkfirst=True)
+    migrate._start(migration, database.engine)
+    m0014.upgrade(migrate.MigrationContext(migration, database.engine, pause_ms=0))
+    migrate._finish(migration, database.engine)
+
+
+def test_rewrites_urls_and_deduplicates(db_engine, upload_dir):
+    a, b, c = "aaaa-1.jpg", "bbbb-2.jpg", "cccc-3.png"
+    write_upload(upload_dir, a, b"same bytes")
+    write_upload(upload_dir, b, b"same bytes")
+    write_upload(upload_dir, c, b"other bytes", variants=False)
+    new_a = stored_name(file_digest(os.path.join(upload_dir, a)), ".jpg")
+    new_c = stored_name(file_digest(os.path.join(upload_dir, c)), ".png")
+
+    base = "https://shop.example/uploads/"
+    db = database.SessionLocal()
+    db.add(Collection(id="sports", name="SPORTS", image=base + c))
+    db.add(Product(
+        id="p1", name="P", collection="SPORTS", price=1,
+        image=base + a,
+        images=json.dumps([base + b, "https://cdn.example/x.jpg", base + c]),
+        image_variants=json.dumps({base + a: {"card": {"webp": f"{base}aaaa-1/card.webp"}}}),
+        description=f'<img src="/uploads/{c}">',
+    ))
+    db.add(ContentHero(id=1, title="t", subtitle="s", image=base + b, mobile_image="",
+                       image_variants="{}", cta_text="Go", cta_link="/catalog"))
+    db.commit()
+    db.close()
+
+    write_static_feeds()
+    db = database.ReadSessionLocal()
+    product_json(db.get(Product, "p1"))  # cached with the old URLs
+    versions = {row.table_name: row.version for row in db.query(TableVersion)}
+    db.close()
+
+    run_m0014()
+
+    db = database.ReadSessionLocal()
+    product = db.get(Product, "p1")
+    assert product.image == base + new_a
+    assert json.loads(product.images) == [base + new_a, "https://cdn.example/x.jpg", base + new_c]
+    new_stem = os.path.splitext(new_a)[0]
+    assert json.loads(product.image_variants) == {base + new_a: {"card": {"webp": f"{base}{new_stem}/card.webp"}}}
+    assert product.description == f'<img src="/uploads/{new_c}">'
+    assert db.get(Collection, "sports").image == base + new_c
+    assert db.get(ContentHero, 1).image == base + new_a
+    # Snapshots and ETags see the change
+    changed = {row.table_name for row in db.query(TableVersion) if row.version != versions[row.table_name]}
+    assert {"products", "collections", "content_hero"} <= changed
+    assert b"aaaa-1" not in product_json(product)
+    db.close()
+
+    # The static feed was rebuilt before the old files went away
+    for gzipped in (False, True):
+        feed = open(feed_path("json", gzipped), "rb").read()
+        if gzipped:
+            feed = gzip.decompress(feed)
+        products = json.loads(feed)["products"]
+        assert [p["image"] for p in products] == [base + new_a]
+
+    # Two identical uploads became one file; old names and the plan are gone
+    assert sorted(os.listdir(upload_dir)) == sorted({new_a[:2], new_c[:2]})
+    assert open(os.path.join(upload_dir, new_a), "rb").read() == b"same bytes"
+    manifest = json.load(open(os.path.join(upload_dir, new_stem, "variants.json")))
+    assert manifest["card"]["webp"] == f"{new_stem}/card.webp"
+    assert os.path.isfile(os.path.join(upload_dir, manifest["card"]["webp"]))
+
+
+def test_resumes_from_saved_plan(db_engine, upload_dir):
+    write_upload(upload_dir, "dddd-4.jpg", b"bytes d")
+    plan = m0014.load_plan()
+    m0014.link_files(plan)
+    # Interrupted before the rows were rewritten: the old name still resolves
+    assert os.path.exists(os.path.join(upload_dir, "dddd-4.jpg"))
+
+    db = database.SessionLocal()
+    db.add(Product(id="p1", name="P", collection="X", price=1, image="/uploads/dddd-4.jpg", images="[]"))
+    db.commit()
+    db.close()
+
+    run_m0014()
+    db = database.ReadSessionLocal()
+    assert db.get(Product, "p1").image == "/uploads/" + plan["dddd-4.jpg"]
+    db.close()
+    assert not os.path.exists(m0014.PLAN_FILE)
+
+    # Nothing left to move on a second run
+    run_m0014()
+    assert os.listdir(upload_dir) == [plan["dddd-4.jpg"][:2]]
+
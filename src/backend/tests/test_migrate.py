@@ -0,0 +1,86 @@
+"""Versioned migrations: chunked backfills resume where an interrupted run stopped"""
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import func
+
+import database
+import migrate
+from database import Product, SchemaVersion
+from conftest import seed_products
+
+
+class Interrupted(Exception):
+    pass
+
+
+def backfill_migration(version: int, seen: list, fail_after: int = None):
+    """Migration that uppercases product names in chunks, raising after `fail_after` chunks"""
+    chunks = []
+
+    def apply(db, rows):
+        if fail_after is not None and len(chunks) == fail_after:
+            raise Interrupted()
+        chunks.append(len(rows))
+        seen.extend(row.id for row in rows)
+        for row in rows:
+            db.query(Product).filter(Product.id == row.id).update(
+                {"name": row.name.upper()}, synchronize_session=False
+            )
+
+    def upgrade(ctx):
+        ctx.backfill(Product.id, [Product.id, Product.name], apply, where=Product.name != func.upper(Product.name))
+
+    return migrate.Migration(version, "uppercase_names", SimpleNamespace(upgrade=upgrade, __doc__="test"))
+
+
+def run(migration, batch_size: int = 10):
+    migrate._start(migration, database.engine)
+    migration.module.upgrade(migrate.MigrationContext(migration, database.engine, batch_size, pause_ms=0))
+    migrate._finish(migration, database.engine)
+
+
+def schema_row(version: int):
+    db = database.SessionLocal()
+    try:
+        return db.get(SchemaVersion, version)
+    finally:
+        db.close()
+
+
+def test_backfill_resumes_after_interruption(db_engine):
+    seed_products(95)
+    SchemaVersion.__table__.create(bind=database.engine, checkfirst=True)
+    seen = []
+
+    with pytest.raises(Interrupted):
+        run(backfill_migration(900, seen, fail_after=3))
+    row = schema_row(900)
+    assert row.applied_at is None
+    assert row.rows_done == 30 and row.cursor == seen[-1]
+
+    # The failed chunk was rolled back, the committed ones are not redone
+    resumed = []
+    run(backfill_migration(900, resumed))
+    assert not set(resumed) & set(seen)
+    assert sorted(seen + resumed) == [f"p{i:04d}" for i in range(95)]
+
+    row = schema_row(900)
+    assert row.applied_at is not None and row.rows_done == 95
+    db = database.ReadSessionLocal()
+    try:
+        assert all(name == name.upper() for (name,) in db.query(Product.name))
+    finally:
+        db.close()
+
+
+def test_applied_migration_is_not_pending(db_engine):
+    SchemaVersion.__table__.create(bind=database.engine, checkfirst=True)
+    pending = migrate.pending_migrations(database.engine)
+    assert [m.version for m in pending] == sorted(m.version for m in pending)
+
+    first = pending[0]
+    migrate._start(first, database.engine)
+    migrate._finish(first, database.engine)
+    assert first.version in migrate.applied_versions(database.engine)
+    assert first.version not in [m.version for m in migrate.pending_migrations(database.engine)]
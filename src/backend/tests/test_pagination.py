@@ -0,0 +1,68 @@
+"""Cursor pagination returns the same rows in the same order as the SQL ORDER BY"""
+import pytest
+
+import database
+from database import Product
+from facet_index import CATALOG_SORTS
+from pagination import paginate_keyset, order_columns
+from routes import products
+from conftest import seed_products, make_client
+
+
+def sql_order(sort: str, **filters) -> list:
+    columns, descending = CATALOG_SORTS[sort]
+    db = database.ReadSessionLocal()
+    try:
+        query = db.query(Product.id).filter_by(**filters).order_by(*order_columns(columns, descending))
+        return [row.id for row in query]
+    finally:
+        db.close()
+
+
+def walk(client, params: dict) -> list:
+    ids, cursor = [], ""
+    while cursor is not None:
+        body = client.get("/api/products", params={**params, "cursor": cursor}).json()
+        ids += [p["id"] for p in body["data"]]
+        cursor = body["pagination"]["nextCursor"]
+    return ids
+
+
+@pytest.mark.parametrize("sort", sorted(CATALOG_SORTS))
+def test_keyset_pages_match_sql_order(db_engine, sort):
+    seed_products(120)
+    columns, descending = CATALOG_SORTS[sort]
+    db = database.ReadSessionLocal()
+    try:
+        ids, cursor = [], ""
+        while cursor is not None:
+            rows, cursor = paginate_keyset(db.query(Product), sort, columns, descending, cursor, 7)
+            ids += [row.id for row in rows]
+    finally:
+        db.close()
+    assert ids == sql_order(sort)
+
+
+@pytest.mark.parametrize("sort", sorted(CATALOG_SORTS))
+def test_catalog_cursor_matches_sql_order(db_engine, sort):
+    """Facet index path of /api/products"""
+    seed_products(120)
+    client = make_client(products.router)
+    assert walk(client, {"sort": sort, "limit": 9}) == sql_order(sort)
+    assert walk(client, {"sort": sort, "limit": 5, "brand": "Orient"}) == sql_order(sort, brand="Orient")
+
+
+def test_catalog_cursor_matches_page_mode(db_engine):
+    seed_products(60)
+    client = make_client(products.router)
+    pages = []
+    for page in range(1, 8):
+        pages += [p["id"] for p in client.get("/api/products", params={"sort": "price-desc", "limit": 10, "page": page}).json()["data"]]
+    assert walk(client, {"sort": "price-desc", "limit": 10}) == pages
+
+
+def test_cursor_of_another_sort_is_rejected(db_engine):
+    seed_products(20)
+    client = make_client(products.router)
+    cursor = client.get("/api/products", params={"sort": "name", "limit": 5, "cursor": ""}).json()["pagination"]["nextCursor"]
+    assert client.get("/api/products", params={"sort": "newest", "cursor": cursor}).status_code == 400
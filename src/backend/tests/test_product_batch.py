@@ -0,0 +1,35 @@
+"""/api/products/batch keeps the request order and reports unknown ids"""
+from routes import products
+from routes.products import MAX_BATCH_IDS
+from conftest import make_client, seed_products
+
+
+def test_order_duplicates_and_missing(db_engine):
+    seed_products(10)
+    client = make_client(products.router)
+    response = client.get("/api/products/batch", params={"ids": "p0007, p0002,gone,p0007", "fields": "card"})
+    assert response.status_code == 200
+    body = response.json()
+    assert [p["id"] for p in body["data"]] == ["p0007", "p0002"]
+    assert body["missing"] == ["gone"]
+    listed = {p["id"]: p for p in client.get("/api/products", params={"fields": "card", "limit": 100}).json()["data"]}
+    assert body["data"] == [listed["p0007"], listed["p0002"]]
+
+
+def test_get_and_post_agree(db_engine):
+    seed_products(10)
+    client = make_client(products.router)
+    ids = ["p0003", "p0001", "p0009"]
+    by_get = client.get("/api/products/batch", params=[("ids", "p0003"), ("ids", "p0001,p0009")]).json()
+    by_post = client.post("/api/products/batch", json={"ids": ids}).json()
+    assert by_get == by_post
+    assert [p["id"] for p in by_post["data"]] == ids
+    assert by_post["data"][1] == client.get("/api/products/p0001").json()
+
+
+def test_limits(db_engine):
+    client = make_client(products.router)
+    assert client.get("/api/products/batch").json() == {"data": [], "missing": []}
+    too_many = [f"p{i}" for i in range(MAX_BATCH_IDS + 1)]
+    assert client.post("/api/products/batch", json={"ids": too_many}).status_code == 400
+    assert client.post("/api/products/batch", json={"ids": ["p1"], "fields": "nope"}).status_code == 400
@@ -0,0 +1,25 @@
+"""Rendering the feed leaves the product list/detail cache alone"""
+import database
+from database import Product
+from product_cache import ProductJSONCache, product_json
+from product_feed import write_static_feeds
+from conftest import seed_products
+
+
+def test_feed_does_not_evict_list_entries(db_engine, monkeypatch):
+    seed_products(40)
+    small = ProductJSONCache(maxsize=10)
+    monkeypatch.setattr("product_cache.product_cache", small)
+
+    db = database.ReadSessionLocal()
+    try:
+        page = db.query(Product).order_by(Product.id).limit(10).all()
+        for product in page:
+            product_json(product)
+        cached = set(small._items)
+
+        write_static_feeds()
+        assert set(small._items) == cached
+        assert all(kind != "feed" for kind, _, _ in small._items)
+    finally:
+        db.close()
@@ -0,0 +1,62 @@
+"""The features filter and the unique list go through product_features, kept in step by the admin routes"""
+import json
+
+import database
+from database import Product
+from product_features import backfill_features
+from routes import products
+from conftest import make_client
+
+
+def create(client, name: str, features: list) -> str:
+    response = client.post("/api/admin/products", json={"name": name, "collection": "SPORTS",
+                                                        "price": 100.0, "features": features})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def filtered(client, *features) -> set:
+    response = client.get("/api/products", params={"features": list(features), "limit": 50})
+    assert response.status_code == 200
+    return {p["id"] for p in response.json()["data"]}
+
+
+def test_filter_needs_every_feature_exactly(db_engine):
+    client = make_client(products.router)
+    lit = create(client, "Lit", ["Подсветка", "Сапфир"])
+    screen = create(client, "Screen", ["Подсветка экрана"])
+    create(client, "Plain", [])
+
+    assert filtered(client, "Подсветка") == {lit}
+    assert filtered(client, "Подсветка", "Сапфир") == {lit}
+    assert filtered(client, "Подсветка", "Подсветка экрана") == set()
+    assert filtered(client, " Подсветка экрана ") == {screen}
+    assert client.get("/api/products/features/unique").json() == ["Подсветка", "Подсветка экрана", "Сапфир"]
+
+
+def test_update_and_delete_rewrite_rows(db_engine):
+    client = make_client(products.router)
+    product_id = create(client, "Lit", ["Подсветка"])
+
+    assert client.put(f"/api/admin/products/{product_id}", json={"features": ["Сапфир"]}).status_code == 200
+    assert filtered(client, "Подсветка") == set()
+    assert filtered(client, "Сапфир") == {product_id}
+
+    assert client.delete(f"/api/admin/products/{product_id}").status_code == 200
+    assert client.get("/api/products/features/unique").json() == []
+
+
+def test_backfill_from_json_column(db_engine):
+    db = database.SessionLocal()
+    try:
+        for i in range(5):
+            db.add(Product(id=f"p{i}", name="P", collection="SPORTS", price=1.0, images="[]",
+                           features=json.dumps(["A", " A ", "B"] if i % 2 else ["A"])))
+        db.commit()
+        assert backfill_features(db, batch_size=2) == 5
+    finally:
+        db.close()
+
+    client = make_client(products.router)
+    assert filtered(client, "A") == {f"p{i}" for i in range(5)}
+    assert filtered(client, "A", "B") == {"p1", "p3"}
@@ -0,0 +1,103 @@
+"""The static feed follows the products table version, whichever worker wrote"""
+import json
+import threading
+import time
+
+from sqlalchemy import create_engine
+
+import product_feed
+from change_versions import bump_versions
+from database import Product
+from product_feed import feed_builder, feed_is_current, write_static_feeds
+from routes import products
+from conftest import make_client, seed_products
+
+
+def wait_until_current(timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not feed_is_current():
+        assert time.monotonic() < deadline, "feed was not rebuilt"
+        time.sleep(0.02)
+
+
+def add_product_elsewhere(db_engine, product_id: str):
+    """Insert as another process would: its own engine, no hooks of this one involved"""
+    other = create_engine(str(db_engine.url))
+    with other.begin() as conn:
+        conn.execute(Product.__table__.insert(), {"id": product_id, "name": "New", "collection": "SPORTS",
+                                                  "price": 1.0, "images": "[]", "in_stock": True})
+        bump_versions(conn, ["products"])
+    other.dispose()
+
+
+def feed_ids(client) -> list:
+    response = client.get("/api/products/feed", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    return [p["id"] for p in json.loads(response.content)["products"]]
+
+
+def test_write_from_another_worker_rebuilds_feed(db_engine):
+    seed_products(5)
+    write_static_feeds()
+    assert feed_is_current()
+    client = make_client(products.router)
+    before = feed_ids(client)
+
+    add_product_elsewhere(db_engine, "zz-new")
+
+    assert not feed_is_current()
+    # Served fresh from the database while the files are rebuilt
+    assert feed_ids(client) == before + ["zz-new"]
+    wait_until_current()
+    assert feed_ids(client) == before + ["zz-new"]
+
+
+def wait_for_builder():
+    deadline = time.monotonic() + 5
+    while feed_builder._running and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_build_skipped_when_already_current(db_engine, monkeypatch):
+    seed_products(3)
+    write_static_feeds()
+    builds = []
+    count = product_feed.count_feed_products
+    monkeypatch.setattr(product_feed, "count_feed_products", lambda: builds.append(1) or count())
+    assert feed_builder.refresh()
+    feed_builder.schedule()
+    wait_for_builder()
+    assert builds == []
+
+
+def test_builds_and_stamps_are_serialized(db_engine, monkeypatch):
+    seed_products(5)
+    release, started = threading.Event(), []
+    count = product_feed.count_feed_products
+
+    def first_build_waits():
+        started.append(threading.current_thread().name)
+        if len(started) == 1:
+            release.wait(5)
+        return count()
+
+    monkeypatch.setattr(product_feed, "count_feed_products", first_build_waits)
+    first = threading.Thread(target=write_static_feeds, name="first")
+    first.start()
+    while not started:
+        time.sleep(0.01)
+
+    # A write, then a second worker's build: it must wait for the first one to finish
+    add_product_elsewhere(db_engine, "zz-new")
+    second = threading.Thread(target=write_static_feeds, name="second")
+    second.start()
+    time.sleep(0.2)
+    assert started == ["first"] and second.is_alive()
+
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert started == ["first", "second"]
+    assert feed_is_current()
+    client = make_client(products.router)
+    assert "zz-new" in feed_ids(client)
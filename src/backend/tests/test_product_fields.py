@@ -0,0 +1,44 @@
+"""?fields= limits the keys of every product list, whatever was requested before"""
+from sqlalchemy import event
+
+import database
+from product_fields import PROFILES
+from routes import collections, products
+from conftest import make_client, seed_products
+
+
+def test_profiles_and_field_lists(db_engine):
+    seed_products(20)
+    client = make_client(products.router, collections.router)
+    full = client.get("/api/products", params={"limit": 3}).json()["data"]
+
+    for fields, keys in [("card", set(PROFILES["card"])), ("admin-grid", set(PROFILES["admin-grid"])),
+                         ("id, price ,id", {"id", "price"})]:
+        for url in ("/api/products", "/api/admin/products", "/api/collections/star/products"):
+            data = client.get(url, params={"fields": fields, "limit": 3}).json()["data"]
+            assert data and all(set(p) == keys for p in data), (url, fields)
+
+    # Served from the same cache, the full rows are still whole after a sparse request
+    assert client.get("/api/products", params={"limit": 3, "fields": "detail"}).json()["data"] == full
+    assert client.get("/api/products", params={"limit": 3}).json()["data"] == full
+
+
+def test_unknown_field_is_rejected(db_engine):
+    client = make_client(products.router)
+    response = client.get("/api/products", params={"fields": "id,password"})
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+
+
+def test_card_does_not_load_description(db_engine):
+    seed_products(5)
+    client = make_client(products.router)
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(database.read_engine, "before_cursor_execute", listener)
+    try:
+        assert client.get("/api/products", params={"fields": "card", "search": "alpha"}).status_code == 200
+    finally:
+        event.remove(database.read_engine, "before_cursor_execute", listener)
+    rows = [s for s in statements if s.lstrip().startswith("SELECT products.id")]
+    assert rows and not any("products.description" in s for s in rows)
@@ -0,0 +1,141 @@
+"""products_fts follows products by rowid, notices renumbered rowids; m0015 converts the legacy layout"""
+import importlib
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+import database
+import migrate
+import search_index
+from database import Product
+from routes import products
+from search_index import apply_search, init_search_index
+from conftest import make_client
+
+m0015 = importlib.import_module("migrations.m0015_search_index_rowid")
+
+# Before m0015: entries found by product_id
+LEGACY_LAYOUT = [
+    "CREATE VIRTUAL TABLE products_fts USING fts5(product_id UNINDEXED, name, sku, collection, "
+    "description, seo_keywords)",
+    "CREATE TRIGGER products_fts_ai AFTER INSERT ON products BEGIN "
+    "INSERT INTO products_fts (product_id, name, sku, collection, description, seo_keywords) "
+    "VALUES (new.id, new.name, new.sku, new.collection, new.description, new.seo_keywords); END",
+    "CREATE TRIGGER products_fts_ad AFTER DELETE ON products BEGIN "
+    "DELETE FROM products_fts WHERE product_id = old.id; END",
+]
+
+
+def add(*products):
+    db = database.SessionLocal()
+    try:
+        for product_id, name in products:
+            db.add(Product(id=product_id, name=name, collection="SPORTS", price=1, images="[]"))
+        db.commit()
+    finally:
+        db.close()
+
+
+def search(words: str) -> list:
+    db = database.ReadSessionLocal()
+    try:
+        query, _ = apply_search(db.query(Product.id), db, words, ranked=True)
+        return [row.id for row in query]
+    finally:
+        db.close()
+
+
+def fts_rows() -> int:
+    with database.engine.connect() as conn:
+        return conn.execute(text("SELECT count(*) FROM products_fts")).scalar()
+
+
+def test_triggers_follow_writes(db_engine):
+    add(("p1", "Kamasu Diver"), ("p2", "Bambino"), ("p3", "Kamasu Classic"))
+    assert sorted(search("kamasu")) == ["p1", "p3"]
+
+    db = database.SessionLocal()
+    db.query(Product).filter(Product.id == "p1").update({"name": "Mako"})
+    db.query(Product).filter(Product.id == "p2").update({"id": "p2-renamed"})
+    db.query(Product).filter(Product.id == "p3").delete()
+    db.commit()
+    db.close()
+
+    assert search("kamasu") == []
+    assert search("mako") == ["p1"]
+    assert search("bambino") == ["p2-renamed"]
+    assert fts_rows() == 2
+
+
+def delete(product_id: str):
+    db = database.SessionLocal()
+    db.query(Product).filter(Product.id == product_id).delete()
+    db.commit()
+    db.close()
+
+
+@pytest.fixture
+def legacy_layout(db_engine):
+    with db_engine.begin() as conn:
+        for statement in search_index.DROP_SCHEMA:
+            conn.execute(text(statement))
+        for statement in LEGACY_LAYOUT:
+            conn.execute(text(statement))
+    yield
+    search_index._fts_ready = None
+
+
+def test_legacy_layout_is_searched_until_migrated(legacy_layout):
+    add(("p1", "Kamasu Diver"), ("p2", "Bambino"))
+    init_search_index(bind=database.engine)
+    with database.engine.connect() as conn:
+        assert search_index._fts_state(conn) == "legacy"
+    assert search("kamas") == ["p1"]
+
+    migration = migrate.Migration(15, "search_index_rowid", m0015)
+    m0015.upgrade(migrate.MigrationContext(migration, database.engine, pause_ms=0))
+    with database.engine.connect() as conn:
+        assert search_index._fts_state(conn) == "current"
+    assert search("kamas") == ["p1"]
+    delete("p1")
+    assert search("kamas") == [] and fts_rows() == 1
+
+
+def test_renumbered_rowids_are_rebuilt_at_startup(db_engine):
+    add(("p1", "Kamasu Diver"), ("p2", "Bambino"), ("p3", "Mako"))
+    with db_engine.begin() as conn:
+        # What a VACUUM may do to a table without an INTEGER PRIMARY KEY
+        conn.execute(text("UPDATE products SET rowid = rowid + 100"))
+        assert not search_index._in_sync(conn)
+
+    init_search_index(bind=db_engine)
+    with db_engine.connect() as conn:
+        assert search_index._in_sync(conn)
+    delete("p2")
+    assert search("kamasu") == ["p1"] and search("mako") == ["p3"] and search("bambino") == []
+    assert fts_rows() == 2
+
+
+@pytest.mark.parametrize("fts, words", [
+    (False, "star"),  # PostgreSQL: LIKE scan
+    (True, "-"),      # no FTS terms in the input: LIKE scan too
+])
+def test_unranked_search_pages_follow_popular_order(db_engine, monkeypatch, fts, words):
+    created = datetime(2024, 1, 1)
+    db = database.SessionLocal()
+    for i in range(25):
+        # Same popular sort key for all: only the id tiebreak orders them
+        db.add(Product(id=f"p{i:02d}", name=f"Star-{i}", collection="SPORTS", price=1, images="[]",
+                       is_featured=False, created_at=created))
+    db.commit()
+    db.close()
+    if not fts:
+        monkeypatch.setattr(search_index, "_fts_ready", False)
+    client = make_client(products.router)
+
+    ids = []
+    for page in (1, 2, 3):
+        body = client.get("/api/products", params={"search": words, "limit": 10, "page": page}).json()
+        ids += [p["id"] for p in body["data"]]
+    assert ids == [f"p{i:02d}" for i in reversed(range(25))]
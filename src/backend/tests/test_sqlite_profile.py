@@ -0,0 +1,31 @@
+"""Every SQLite connection gets the pragma profile, read connections cannot write"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+import database
+
+
+def pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_pragmas(db_engine):
+    for engine in (database.engine, database.read_engine):
+        assert pragma(engine, "journal_mode") == "wal"
+        assert pragma(engine, "synchronous") == 1  # NORMAL
+        assert pragma(engine, "busy_timeout") == database.SQLITE_PRAGMAS["busy_timeout"]
+        assert pragma(engine, "temp_store") == 2  # MEMORY
+        assert pragma(engine, "cache_size") == database.SQLITE_PRAGMAS["cache_size"]
+    assert pragma(database.engine, "query_only") == 0
+    assert pragma(database.read_engine, "query_only") == 1
+
+
+def test_read_sessions_are_read_only(db_engine):
+    db = database.ReadSessionLocal()
+    try:
+        with pytest.raises(OperationalError, match="readonly"):
+            db.execute(text("UPDATE table_versions SET version = version + 1"))
+    finally:
+        db.close()
@@ -0,0 +1,59 @@
+"""Streamed uploads and variant rendering run without a database connection"""
+import io
+
+import pytest
+from PIL import Image
+
+import database
+import upload_stream
+from image_variants import shutdown_image_pool
+from routes import upload
+from conftest import make_client
+from test_auth import add_user
+
+
+def jpeg(color: str) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 48), color).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def checked_out() -> dict:
+    return {"writer": database.engine.pool.checkedout(), "reader": database.read_engine.pool.checkedout()}
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Connections in use while the body is read and while variants are generated"""
+    seen = {"stream": [], "variants": []}
+    write_pending = upload_stream.UploadReceiver._write_pending
+    generate_variants = upload.generate_variants
+
+    async def recording_write_pending(self):
+        seen["stream"].append(checked_out())
+        await write_pending(self)
+
+    async def recording_generate_variants(source):
+        seen["variants"].append(checked_out())
+        return await generate_variants(source)
+
+    monkeypatch.setattr(upload_stream.UploadReceiver, "_write_pending", recording_write_pending)
+    monkeypatch.setattr(upload, "generate_variants", recording_generate_variants)
+    yield seen
+    shutdown_image_pool()
+
+
+@pytest.mark.parametrize("path, field, count", [
+    ("/api/admin/upload", "file", 1),
+    ("/api/admin/upload/bulk", "files", 2),
+])
+def test_upload_holds_no_connection(db_engine, upload_dir, connections, path, field, count):
+    client = make_client(upload.router, admin=False)
+    token = add_user("admin")
+    files = [(field, (f"{i}.jpg", jpeg(color), "image/jpeg")) for i, color in enumerate(["red", "blue"][:count])]
+
+    response = client.post(path, files=files, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert connections["stream"] and connections["variants"]
+    idle = {"writer": 0, "reader": 0}
+    assert all(seen == idle for seen in connections["stream"] + connections["variants"])
@@ -0,0 +1,35 @@
+"""A job whose caller timed out is never written; one already running is waited for"""
+import threading
+import time
+
+import pytest
+
+import database
+from write_queue import GroupCommitWriter
+
+
+def test_timed_out_job_is_skipped(db_engine):
+    writer = GroupCommitWriter(session_factory=database.SessionLocal, max_delay_ms=0)
+    release = threading.Event()
+    ran = []
+
+    blocker = writer.submit(lambda db: release.wait(5))
+    while not blocker.running():  # its batch is taken, the next job waits in the queue
+        time.sleep(0.01)
+    with pytest.raises(TimeoutError):
+        writer.run(lambda db: ran.append("late"), timeout=0.1)
+    release.set()
+    assert blocker.result(5) is True
+    # A later job goes through: the cancelled one was dropped, not left in the way
+    assert writer.run(lambda db: ran.append("next") or "ok", timeout=5) == "ok"
+    assert ran == ["next"]
+
+
+def test_running_job_is_waited_for(db_engine):
+    writer = GroupCommitWriter(session_factory=database.SessionLocal, max_delay_ms=0)
+
+    def slow(db):
+        time.sleep(0.3)
+        return "done"
+
+    assert writer.run(slow, timeout=0.05) == "done"
@@ -0,0 +1,218 @@
+"""
+Streaming multipart uploads
+The request body is parsed while it arrives (python-multipart, as Starlette does) and
+file parts go straight to temp files in UPLOAD_DIR/.incoming, written off the event
+loop in UPLOAD_CHUNK_SIZE pieces. Nothing is buffered whole in memory: a file over the
+limit, a wrong extension or too many files fail the request at that point, without
+reading the rest of the body.
+
+Storage is content-addressed: a file is named after the BLAKE2 hash of its bytes
+(computed while it is written) and sharded two levels deep,
+    uploads/<h[0:2]>/<h[2:4]>/<hash>.<ext>
+so the same image uploaded twice is stored once, and a name never changes content
+(served as immutable). Finished files are moved in with an atomic rename.
+"""
+import hashlib
+import os
+import uuid
+from pathlib import Path
+
+from fastapi import HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+INCOMING_DIR = ".incoming"
+# Multipart boundaries and part headers on top of the file bytes
+MULTIPART_OVERHEAD = 64 * 1024
+# 128-bit BLAKE2b: 32 hex characters per name
+DIGEST_SIZE = 16
+
+
+def new_hasher():
+    return hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+
+def stored_name(digest: str, ext: str) -> str:
+    """Path of a file under UPLOAD_DIR (also its URL under /uploads/): ab/cd/abcd....jpg"""
+    return f"{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+
+def file_digest(path: str) -> str:
+    """Content hash of a file on disk, as used by stored_name"""
+    hasher = new_hasher()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class ReceivedFile:
+    """A file part written to a temp file"""
+
+    def __init__(self, filename: str, content_type: str, temp_path: str):
+        self.filename = filename
+        self.content_type = content_type
+        self.temp_path = temp_path
+        self.size = 0
+        self.handle = None
+        self.buffer = bytearray()
+        self.hasher = new_hasher()
+
+    def write(self, data: bytes):
+        self.hasher.update(data)
+        self.handle.write(data)
+
+
+class UploadReceiver:
+    def __init__(self, upload_dir: str, max_file_size: int, max_files: int, allowed_extensions: set):
+        self.incoming_dir = os.path.join(upload_dir, INCOMING_DIR)
+        self.max_file_size = max_file_size
+        self.max_files = max_files
+        self.allowed_extensions = allowed_extensions
+        self.files = []
+        self._current = None  # ReceivedFile of the part being read, None for form fields
+        self._disposition = b""
+        self._header_name = b""
+        self._header_value = b""
+        self._content_type = b""
+        self._to_open = []
+        self._to_flush = []
+
+    # python-multipart callbacks: plain functions, file I/O is left to receive()
+
+    def on_part_begin(self):
+        self._current = None
+        self._disposition = b""
+        self._content_type = b""
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        name = self._header_name.lower()
+        if name == b"content-disposition":
+            self._disposition = self._header_value
+        elif name == b"content-type":
+            self._content_type = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self._disposition)
+        if b"filename" not in options:
+            return  # form field, its data is ignored
+        if len(self.files) >= self.max_files:
+            raise HTTPException(status_code=400, detail=f"Too many files. Max: {self.max_files}")
+        filename = options[b"filename"].decode("utf-8", errors="replace")
+        if Path(filename).suffix.lower() not in self.allowed_extensions:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid file type. Allowed: {', '.join(self.allowed_extensions)}"
+            )
+        temp_path = os.path.join(self.incoming_dir, f"{uuid.uuid4()}.part")
+        self._current = ReceivedFile(filename, self._content_type.decode("latin-1"), temp_path)
+        self.files.append(self._current)
+        self._to_open.append(self._current)
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        part = self._current
+        if part is None:
+            return
+        part.size += end - start
+        if part.size > self.max_file_size:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Max size: {self.max_file_size / 1024 / 1024}MB"
+            )
+        part.buffer += data[start:end]
+        if len(part.buffer) >= UPLOAD_CHUNK_SIZE:
+            self._to_flush.append(part)
+
+    def on_part_end(self):
+        if self._current is not None:
+            self._to_flush.append(self._current)
+        self._current = None
+
+    async def _write_pending(self):
+        for part in self._to_open:
+            part.handle = await run_in_threadpool(open, part.temp_path, "wb")
+        self._to_open.clear()
+        for part in self._to_flush:
+            if part.buffer:
+                data, part.buffer = bytes(part.buffer), bytearray()
+                await run_in_threadpool(part.write, data)
+        self._to_flush.clear()
+
+    async def receive(self, request: Request) -> list:
+        """Read the whole body, returns the ReceivedFile list (temp files closed)"""
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+
+        # Declared size over what the limits allow: rejected before reading anything
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() \
+                and int(content_length) > self.max_file_size * self.max_files + MULTIPART_OVERHEAD:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Max size: {self.max_file_size / 1024 / 1024}MB"
+            )
+
+        await run_in_threadpool(os.makedirs, self.incoming_dir, exist_ok=True)
+        parser = MultipartParser(params[b"boundary"], {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        })
+        try:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                await self._write_pending()
+            parser.finalize()
+            await self._write_pending()
+        except BaseException:
+            await self.discard()
+            raise
+        finally:
+            for part in self.files:
+                if part.handle is not None:
+                    await run_in_threadpool(part.handle.close)
+                    part.handle = None
+        return self.files
+
+    async def discard(self):
+        """Delete the temp files"""
+        for part in self.files:
+            if part.handle is not None:
+                await run_in_threadpool(part.handle.close)
+                part.handle = None
+            if os.path.exists(part.temp_path):
+                await run_in_threadpool(os.remove, part.temp_path)
+
+
+def _store(part: ReceivedFile, upload_dir: str) -> tuple:
+    name = stored_name(part.hasher.hexdigest(), Path(part.filename).suffix.lower())
+    path = os.path.join(upload_dir, name)
+    if os.path.exists(path):
+        os.remove(part.temp_path)
+        return name, False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(part.temp_path, path)
+    return name, True
+
+
+async def store(part: ReceivedFile, upload_dir: str) -> tuple:
+    """
+    Move a received temp file to its content-addressed name in upload_dir.
+    Returns (name, created); created is False when the same file was already stored.
+    """
+    return await run_in_threadpool(_store, part, upload_dir)
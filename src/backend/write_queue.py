@@ -0,0 +1,127 @@
+"""
+Group commit for hot write paths (orders, bookings, Payme transactions)
+Request threads hand small write jobs to one writer thread, which runs every
+job queued within a few milliseconds in a single transaction and commit
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from database import SessionLocal
+
+WRITE_BATCH_SIZE = int(os.getenv("WRITE_BATCH_SIZE", "64"))
+WRITE_BATCH_DELAY_MS = float(os.getenv("WRITE_BATCH_DELAY_MS", "2"))
+
+
+class GroupCommitWriter:
+    """
+    Single writer thread with batched commits.
+
+    A job is a callable job(db) -> result. It runs on the writer's session inside
+    the shared transaction: it may add/query/flush but must not commit, and it
+    should return plain data or objects it loaded (they are detached, fully loaded).
+    If a job raises or the batch commit fails, the batch is rolled back and its
+    jobs are re-run one transaction each, so one bad job fails only its own caller.
+
+    Do not call run() while holding a SessionLocal connection in the same thread:
+    the writer needs one from the same (single-connection) pool.
+    """
+
+    def __init__(self, session_factory=SessionLocal, max_batch: int = WRITE_BATCH_SIZE,
+                 max_delay_ms: float = WRITE_BATCH_DELAY_MS):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, job) -> Future:
+        """Queue a job, the future resolves after its transaction commits"""
+        self._ensure_thread()
+        future = Future()
+        self._queue.put((job, future))
+        return future
+
+    def run(self, job, timeout: float = 30):
+        """
+        submit() and wait for the result (re-raises the job's exception).
+        TimeoutError means the job never started and never will, so retrying cannot
+        write twice; a job the writer already started is waited for to the end.
+        """
+        future = self.submit(job)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            if future.cancel():
+                raise
+            return future.result()
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="db-writer", daemon=True)
+                self._thread.start()
+
+    def _loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            # Jobs whose caller gave up (run() timed out) are dropped; the rest can no longer be cancelled
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                self._commit_batch(batch, single=len(batch) == 1)
+            except Exception:
+                # Something in the batch failed: every job gets its own transaction
+                for item in batch:
+                    if item[1].done():
+                        continue
+                    try:
+                        self._commit_batch([item], single=True)
+                    except Exception as e:
+                        if not item[1].done():
+                            item[1].set_exception(e)
+
+    def _commit_batch(self, batch: list, single: bool = False):
+        """Run jobs in one transaction and resolve their futures; raises to ask for a per-job retry"""
+        db = self.session_factory(expire_on_commit=False)
+        try:
+            results = []
+            for job, future in batch:
+                try:
+                    results.append(job(db))
+                except Exception as e:
+                    if not single:
+                        raise
+                    db.rollback()
+                    future.set_exception(e)
+                    return
+            try:
+                db.commit()
+            except Exception as e:
+                if not single:
+                    raise
+                db.rollback()
+                batch[0][1].set_exception(e)
+                return
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+# Shared writer used by the order / booking / Payme routes
+db_writer = GroupCommitWriter()
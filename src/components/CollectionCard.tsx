@@ -1,6 +1,7 @@
 import React from 'react';
 import { Link } from 'react-router-dom';
 import { ArrowRightIcon } from 'lucide-react';
+import { VariantSources, resizedVariant } from './VariantSources';
 
 interface CollectionCardProps {
   id: string;
@@ -19,16 +20,21 @@ export function CollectionCard({
   watchCount,
   number = '01'
 }: CollectionCardProps) {
+  const resized = resizedVariant(image, 1200, 0);
   return (
     <Link to={`/collection/${id}`} className="group block bg-white overflow-hidden reveal-up">
       <div className="relative">
         {/* Image Section - Compact on mobile, similar to product cards */}
         <div className="relative aspect-[4/5] sm:aspect-[4/3] lg:aspect-[16/10] overflow-hidden bg-black">
-          <img
-            src={image}
-            alt={name}
-            className="w-full h-full object-cover group-hover:scale-110 transition-all duration-1500"
-          />
+          <picture className="block w-full h-full">
+            <VariantSources variant={resized} />
+            <img
+              src={resized?.jpeg || image}
+              alt={name}
+              loading="lazy"
+              className="w-full h-full object-cover group-hover:scale-110 transition-all duration-1500"
+            />
+          </picture>
           <div className="absolute inset-0 bg-gradient-to-t from-black via-black/50 to-transparent"></div>
 
           {/* Collection Name on Image */}
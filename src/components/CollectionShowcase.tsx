@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { CollectionCard } from './CollectionCard';
 import { publicApi } from '../services/publicApi';
-interface Collection {
+export interface Collection {
   id: string;
   name: string;
   description: string;
@@ -9,11 +9,11 @@ interface Collection {
   watchCount: number;
   number: string;
 }
-export function CollectionShowcase() {
-  const [loading, setLoading] = useState(true);
-  const [collections, setCollections] = useState<Collection[]>([]);
+export function CollectionShowcase({ initialCollections }: { initialCollections?: Collection[] } = {}) {
+  const [loading, setLoading] = useState(!initialCollections);
+  const [collections, setCollections] = useState<Collection[]>(initialCollections?.slice(0, 3) ?? []);
   useEffect(() => {
-    fetchCollections();
+    if (!initialCollections) fetchCollections();
   }, []);
   const fetchCollections = async () => {
     try {
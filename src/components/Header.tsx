@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import { SearchIcon, ShoppingBagIcon, MenuIcon, XIcon } from 'lucide-react';
-import { Link } from 'react-router-dom';
+import { Link, useLocation } from 'react-router-dom';
 import { useCart } from '../contexts/CartContext';
 import { useSettings } from '../contexts/SettingsContext';
 import { publicApi } from '../services/publicApi';
@@ -40,18 +40,23 @@ export function Header() {
 
   const { totalItems } = useCart();
   const { formatPrice } = useSettings();
+  const isHomepage = useLocation().pathname === '/';
 
   useEffect(() => {
     loadData();
   }, []);
 
   const loadData = async () => {
-    // Загружаем логотип и баннер параллельно
+    // Загружаем логотип и баннер параллельно; на главной они приходят в общем ответе /api/content/homepage
     try {
-      const [logoData, bannerData] = await Promise.all([
-        publicApi.getSiteLogo().catch(() => null),
-        publicApi.getPromoBanner().catch(() => null)
-      ]);
+      const [logoData, bannerData] = isHomepage
+        ? await publicApi.getHomepage()
+            .then((data: any) => [data.logo, data.promoBanner])
+            .catch(() => [null, null])
+        : await Promise.all([
+            publicApi.getSiteLogo().catch(() => null),
+            publicApi.getPromoBanner().catch(() => null)
+          ]);
 
       setLogo(logoData);
       setPromoBanner(bannerData);
@@ -2,12 +2,14 @@ import React, { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import { ArrowRightIcon } from 'lucide-react';
 import { publicApi } from '../services/publicApi';
+import { VariantSources, ImageVariants, getVariant } from './VariantSources';
 
-interface HeroContent {
+export interface HeroContent {
   title: string;
   subtitle: string;
   image: string;
   mobileImage?: string; // <--- Добавлено
+  imageVariants?: ImageVariants;
   ctaText: string;
   ctaLink: string;
   // ... цвета ...
@@ -17,13 +19,18 @@ interface HeroContent {
   buttonHoverBgColor?: string;
 }
 
-export function Hero() {
-  const [loading, setLoading] = useState(true);
-  const [content, setContent] = useState<HeroContent | null>(null);
+interface HeroProps {
+  // Уже загружено страницей (GET /api/content/homepage), тогда свой запрос не нужен
+  initialContent?: HeroContent;
+}
+
+export function Hero({ initialContent }: HeroProps = {}) {
+  const [loading, setLoading] = useState(!initialContent);
+  const [content, setContent] = useState<HeroContent | null>(initialContent ?? null);
   const [isHovered, setIsHovered] = useState(false);
 
   useEffect(() => {
-    fetchHeroContent();
+    if (!initialContent) fetchHeroContent();
   }, []);
 
   const fetchHeroContent = async () => {
@@ -50,6 +57,10 @@ export function Hero() {
   if (loading) return null; // Или спиннер
   if (!content) return null;
 
+  // Уменьшенные копии: мобильное изображение (или десктопное) и десктопное
+  const mobileVariant = getVariant(content.imageVariants, content.mobileImage || content.image, 'hero-mobile');
+  const desktopVariant = getVariant(content.imageVariants, content.image, 'hero-desktop');
+
   // Динамические стили кнопки (как в предыдущем шаге)
   const buttonStyle = {
     color: isHovered
@@ -69,11 +80,14 @@ export function Hero() {
       <div className="absolute inset-0 z-0">
         <picture>
           {/* Если есть мобильное изображение, показываем его на экранах < 768px */}
-          {content.mobileImage && (
+          {mobileVariant ? (
+            <VariantSources variant={mobileVariant} media="(max-width: 768px)" />
+          ) : content.mobileImage && (
             <source media="(max-width: 768px)" srcSet={content.mobileImage} />
           )}
+          <VariantSources variant={desktopVariant} />
           <img
-            src={content.image}
+            src={desktopVariant?.jpeg || content.image}
             alt="Hero Background"
             className="w-full h-full object-cover opacity-70"
           />
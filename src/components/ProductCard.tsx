@@ -2,12 +2,14 @@ import React from 'react';
 import { Link } from 'react-router-dom';
 import { ShoppingBagIcon } from 'lucide-react';
 import { useSettings } from '../contexts/SettingsContext';
+import { VariantSources, ImageVariants, getVariant, resizedVariant } from './VariantSources';
 interface ProductCardProps {
   id: string;
   name: string;
   collection: string;
   price: number;
   image: string;
+  imageVariants?: ImageVariants;
   index?: number;
 }
 export function ProductCard({
@@ -16,17 +18,22 @@ export function ProductCard({
   collection,
   price,
   image,
+  imageVariants,
   index = 0
 }: ProductCardProps) {
   const {
     formatPrice
   } = useSettings();
+  const card = getVariant(imageVariants, image, 'card') ?? resizedVariant(image, 600, 0);
   const staggerClass = `animate-stagger-${Math.min(index % 4 + 1, 4)}`;
   return <div className={`group ${staggerClass}`}>
       <Link to={`/product/${id}`} className="block">
         {/* Image Container - NO grayscale on mobile */}
         <div className="relative aspect-[4/5] bg-white mb-4 sm:mb-6 overflow-hidden">
-          <img src={image} alt={name} className="w-full h-full object-cover transition-all duration-1000 group-hover:scale-105" />
+          <picture className="block w-full h-full">
+            <VariantSources variant={card} />
+            <img src={card?.jpeg || image} alt={name} loading="lazy" className="w-full h-full object-cover transition-all duration-1000 group-hover:scale-105" />
+          </picture>
 
           {/* Gradient Overlay on hover - desktop only */}
           <div className="hidden lg:block absolute inset-0 bg-gradient-to-t from-black/60 via-transparent to-transparent opacity-0 group-hover:opacity-100 transition-all duration-700"></div>
@@ -0,0 +1,52 @@
+import React from 'react';
+
+// Один размер загруженного изображения (см. backend/image_variants.py)
+export interface ImageVariant {
+  width: number;
+  height: number;
+  avif?: string;
+  webp?: string;
+  jpeg?: string;
+}
+
+// URL исходного изображения -> имя размера (thumbnail, card, detail, hero-desktop, hero-mobile) -> файлы
+export type ImageVariants = Record<string, Record<string, ImageVariant>>;
+
+const FORMATS: Array<'avif' | 'webp'> = ['avif', 'webp'];
+
+export function getVariant(variants: ImageVariants | undefined, url: string | undefined, name: string) {
+  return url ? variants?.[url]?.[name] : undefined;
+}
+
+const UPLOAD_PATH = /\/uploads\/([^?#]+)$/;
+
+// Загруженное изображение нужного размера через GET /img/{w}x{h}/{format}/{файл} (0 - по пропорциям)
+// Сервер отдает только размеры из IMAGE_SIZES (600/800/1000/1200 x 0), остальные - 404
+export function resizedUrl(url: string, width: number, height: number, format: 'webp' | 'jpeg') {
+  return url.replace(UPLOAD_PATH, `/img/${width}x${height}/${format}/$1`);
+}
+
+// Как getVariant, но для любых загрузок (в т.ч. без готовых вариантов); внешние URL - undefined
+export function resizedVariant(url: string | undefined, width: number, height: number): ImageVariant | undefined {
+  if (!url || !UPLOAD_PATH.test(url)) return undefined;
+  return {
+    width,
+    height,
+    webp: resizedUrl(url, width, height, 'webp'),
+    jpeg: resizedUrl(url, width, height, 'jpeg')
+  };
+}
+
+interface VariantSourcesProps {
+  variant?: ImageVariant;
+  media?: string;
+}
+
+// <source> для AVIF / WebP внутри <picture>; JPEG остается в <img>
+export function VariantSources({ variant, media }: VariantSourcesProps) {
+  if (!variant) return null;
+  return <>
+      {FORMATS.map(format => variant[format] && <source key={format} type={`image/${format}`} media={media} srcSet={variant[format]} />)}
+      {media && variant.jpeg && <source type="image/jpeg" media={media} srcSet={variant.jpeg} />}
+    </>;
+}
@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { HeroCarousel } from './HeroCarousel';
 import { publicApi } from '../services/publicApi';
-interface FeaturedWatch {
+export interface FeaturedWatch {
   id: string;
   name: string;
   collection: string;
@@ -9,11 +9,11 @@ interface FeaturedWatch {
   image: string;
   isNew?: boolean;
 }
-export function WatchShowcase() {
-  const [loading, setLoading] = useState(true);
-  const [watches, setWatches] = useState<FeaturedWatch[]>([]);
+export function WatchShowcase({ initialWatches }: { initialWatches?: FeaturedWatch[] } = {}) {
+  const [loading, setLoading] = useState(!initialWatches);
+  const [watches, setWatches] = useState<FeaturedWatch[]>(initialWatches ?? []);
   useEffect(() => {
-    fetchFeaturedWatches();
+    if (!initialWatches) fetchFeaturedWatches();
   }, []);
   const fetchFeaturedWatches = async () => {
     try {
@@ -68,13 +68,20 @@ export function SettingsProvider({ children }: { children: React.ReactNode }) {
 
   const fetchSettings = async () => {
     try {
-      // Загружаем все настройки параллельно
-      const [currencyData, siteData, socialData, shippingData] = await Promise.all([
-        publicApi.getCurrency().catch(() => ({ code: 'UZS', symbol: '₽' })),
-        publicApi.getSiteInfo().catch(() => site),
-        publicApi.getSocialLinks().catch(() => social),
-        publicApi.getShippingInfo().catch(() => shipping)
-      ]);
+      // На главной настройки приходят в общем ответе /api/content/homepage (тот же запрос, что у Home)
+      const homepageSettings = window.location.pathname === '/'
+        ? await publicApi.getHomepage().then((data: any) => data.settings).catch(() => null)
+        : null;
+
+      // Иначе загружаем все настройки параллельно
+      const [currencyData, siteData, socialData, shippingData] = homepageSettings
+        ? [homepageSettings.currency, homepageSettings.site, homepageSettings.social, homepageSettings.shipping]
+        : await Promise.all([
+            publicApi.getCurrency().catch(() => ({ code: 'UZS', symbol: '₽' })),
+            publicApi.getSiteInfo().catch(() => site),
+            publicApi.getSocialLinks().catch(() => social),
+            publicApi.getShippingInfo().catch(() => shipping)
+          ]);
 
       setCurrency(currencyData);
       setSite(siteData);
@@ -3,6 +3,7 @@ import { CalendarIcon, ClockIcon, MapPinIcon, PhoneIcon, MailIcon, ArrowRightIco
 import { publicApi } from '../services/publicApi';
 import { useSettings } from '../contexts/SettingsContext';
 import { SEO } from '../components/SEO';
+import { VariantSources, getVariant, resizedVariant } from '../components/VariantSources';
 
 export function Boutique() {
   const { site } = useSettings();
@@ -367,11 +368,17 @@ export function Boutique() {
             </div>
 
             <div className="grid grid-cols-1 md:grid-cols-2 gap-4 sm:gap-6">
-              {content.gallery.map((item: any, index: number) => (
-                <div key={item.id || index} className="relative aspect-[4/3] overflow-hidden group">
-                  <img src={item.url} alt={`Бутик Orient ${index + 1}`} className="w-full h-full object-cover grayscale group-hover:grayscale-0 transition-all duration-1000 group-hover:scale-105" />
-                </div>
-              ))}
+              {content.gallery.map((item: any, index: number) => {
+                const card = getVariant(content.imageVariants, item.url, 'card') ?? resizedVariant(item.url, 800, 0);
+                return (
+                  <div key={item.id || index} className="relative aspect-[4/3] overflow-hidden group">
+                    <picture className="block w-full h-full">
+                      <VariantSources variant={card} />
+                      <img src={card?.jpeg || item.url} alt={`Бутик Orient ${index + 1}`} loading="lazy" className="w-full h-full object-cover grayscale group-hover:grayscale-0 transition-all duration-1000 group-hover:scale-105" />
+                    </picture>
+                  </div>
+                );
+              })}
             </div>
           </div>
         </section>
@@ -1,6 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { publicApi } from '../services/publicApi';
 import { SEO } from '../components/SEO'; // Добавлен импорт
+import { VariantSources, resizedVariant } from '../components/VariantSources';
 
 interface HistoryEvent {
   id: number;
@@ -10,6 +11,14 @@ interface HistoryEvent {
   image: string;
 }
 
+function HistoryImage({ url, alt }: { url: string; alt: string }) {
+  const resized = resizedVariant(url, 1000, 0);
+  return <picture>
+      <VariantSources variant={resized} />
+      <img src={resized?.jpeg || url} alt={alt} loading="lazy" className="w-full rounded-lg shadow-xl hover:scale-105 transition-transform duration-700" />
+    </picture>;
+}
+
 export function BrandHistory() {
   const [events, setEvents] = useState<HistoryEvent[]>([]);
   const [loading, setLoading] = useState(true);
@@ -59,7 +68,7 @@ export function BrandHistory() {
               <div key={event.id || index} className="grid grid-cols-1 md:grid-cols-2 gap-12 items-center">
                 <div className={index % 2 === 0 ? 'order-2 md:order-1' : ''}>
                   {index % 2 === 0 ? (
-                    <img src={event.image} alt={`Orient ${event.year}`} className="w-full rounded-lg shadow-xl hover:scale-105 transition-transform duration-700" />
+                    <HistoryImage url={event.image} alt={`Orient ${event.year}`} />
                   ) : (
                     <div className="space-y-4">
                       <span className="text-6xl font-bold text-gray-200">{event.year}</span>
@@ -76,7 +85,7 @@ export function BrandHistory() {
                       <p className="text-gray-700 leading-relaxed">{event.description}</p>
                     </div>
                   ) : (
-                    <img src={event.image} alt={`Orient ${event.year}`} className="w-full rounded-lg shadow-xl hover:scale-105 transition-transform duration-700" />
+                    <HistoryImage url={event.image} alt={`Orient ${event.year}`} />
                   )}
                 </div>
               </div>
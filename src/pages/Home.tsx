@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
-import { Hero } from '../components/Hero';
-import { WatchShowcase } from '../components/WatchShowcase';
-import { CollectionShowcase } from '../components/CollectionShowcase';
+import { Hero, HeroContent } from '../components/Hero';
+import { WatchShowcase, FeaturedWatch } from '../components/WatchShowcase';
+import { CollectionShowcase, Collection } from '../components/CollectionShowcase';
 import { Link } from 'react-router-dom';
 import { ArrowRightIcon } from 'lucide-react';
 import { publicApi } from '../services/publicApi';
@@ -16,20 +16,31 @@ interface HeritageContent {
   yearsText: string;
 }
 
+// Часть ответа GET /api/content/homepage, которая нужна этой странице
+interface HomepageData {
+  hero: HeroContent;
+  featuredWatches: FeaturedWatch[];
+  collections: Collection[];
+  heritage: HeritageContent;
+}
+
 export function Home() {
   const [loading, setLoading] = useState(true);
   const [heritageContent, setHeritageContent] = useState<HeritageContent | null>(null);
+  // null - главная не загрузилась, секции загружают свои данные сами
+  const [homepage, setHomepage] = useState<HomepageData | null>(null);
 
   useEffect(() => {
-    fetchHeritageContent();
+    fetchHomepage();
   }, []);
 
-  const fetchHeritageContent = async () => {
+  const fetchHomepage = async () => {
     try {
-      const data = await publicApi.getHeritageSection();
-      setHeritageContent(data);
+      const data: HomepageData = await publicApi.getHomepage();
+      setHomepage(data);
+      setHeritageContent(data.heritage);
     } catch (error) {
-      console.error('Error fetching heritage content:', error);
+      console.error('Error fetching homepage content:', error);
       setHeritageContent({
         title: '75 лет\nмастерства',
         subtitle: 'С 1950 года',
@@ -49,9 +60,13 @@ export function Home() {
         title="Orient Watch Uzbekistan. Купить часы Orient в Ташкенте. Официальный дилер Orient Watch в Узбекистане."
         description="Оригинальные японские часы Orient в Узбекистане: коллекции, новинки, гарантия и бесплатная доставка по Ташкенту. Гарантия 2 года. Официальный дилер Orient Watch в Узбекистане."
       />
-      <Hero />
-      <WatchShowcase />
-      <CollectionShowcase />
+      {!loading && (
+        <>
+          <Hero initialContent={homepage?.hero} />
+          <WatchShowcase initialWatches={homepage?.featuredWatches} />
+          <CollectionShowcase initialCollections={homepage?.collections} />
+        </>
+      )}
 
       {/* Heritage Banner */}
       <section className="bg-black text-white py-16 sm:py-24 lg:py-32 relative overflow-hidden">
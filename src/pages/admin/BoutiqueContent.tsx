@@ -1,5 +1,5 @@
 import React, { useEffect, useState } from 'react';
-import { SaveIcon, PlusIcon, TrashIcon, GripVerticalIcon } from 'lucide-react';
+import { SaveIcon, PlusIcon, TrashIcon, GripVerticalIcon, UploadIcon } from 'lucide-react';
 import { api } from '../../services/api';
 import { ImageUpload } from '../../components/admin/ImageUpload';
 
@@ -53,6 +53,7 @@ export function BoutiqueContent() {
 
   const [services, setServices] = useState<ServiceItem[]>([]);
   const [gallery, setGallery] = useState<GalleryItem[]>([]);
+  const [uploadingGallery, setUploadingGallery] = useState(false);
 
   useEffect(() => {
     fetchContent();
@@ -124,6 +125,23 @@ export function BoutiqueContent() {
     setGallery(gallery.map(g => g.id === id ? { ...g, url } : g));
   };
 
+  const uploadGalleryImages = async (e: React.ChangeEvent<HTMLInputElement>) => {
+    const files = Array.from(e.target.files || []);
+    e.target.value = '';
+    if (files.length === 0) return;
+    setUploadingGallery(true);
+    try {
+      const data = await api.uploadImages(files);
+      const added = data.files.map((f: any, i: number) => ({ id: `img-${Date.now()}-${i}`, url: f.url }));
+      setGallery(current => [...current, ...added]);
+    } catch (error) {
+      console.error('Error uploading gallery images:', error);
+      alert('Ошибка загрузки');
+    } finally {
+      setUploadingGallery(false);
+    }
+  };
+
   if (loading) {
     return (
       <div className="flex items-center justify-center min-h-[400px]">
@@ -302,10 +320,17 @@ export function BoutiqueContent() {
           <h2 className="text-2xl font-bold tracking-tight uppercase">
             4. Галерея бутика
           </h2>
-          <button onClick={addGalleryImage} className="flex items-center space-x-2 border-2 border-black hover:bg-black hover:text-white px-4 py-2 text-sm font-semibold uppercase tracking-wider transition-all">
-            <PlusIcon className="w-4 h-4" strokeWidth={2} />
-            <span>Добавить фото</span>
-          </button>
+          <div className="flex items-center space-x-3">
+            <label className={`flex items-center space-x-2 border-2 border-black hover:bg-black hover:text-white px-4 py-2 text-sm font-semibold uppercase tracking-wider transition-all cursor-pointer ${uploadingGallery ? 'opacity-50 pointer-events-none' : ''}`}>
+              <UploadIcon className="w-4 h-4" strokeWidth={2} />
+              <span>{uploadingGallery ? 'Загрузка...' : 'Загрузить несколько'}</span>
+              <input type="file" accept="image/jpeg,image/png,image/webp" multiple onChange={uploadGalleryImages} className="hidden" />
+            </label>
+            <button onClick={addGalleryImage} className="flex items-center space-x-2 border-2 border-black hover:bg-black hover:text-white px-4 py-2 text-sm font-semibold uppercase tracking-wider transition-all">
+              <PlusIcon className="w-4 h-4" strokeWidth={2} />
+              <span>Добавить фото</span>
+            </button>
+          </div>
         </div>
 
         <div className="grid grid-cols-1 sm:grid-cols-2 md:grid-cols-3 gap-6">
@@ -365,6 +365,20 @@ class ApiService {
     if (!response.ok) throw new Error('Upload failed');
     return response.json();
   }
+
+  // Несколько файлов одним запросом (галерея); ответ { files: [...] } в том же порядке
+  async uploadImages(files: File[]) {
+    const token = localStorage.getItem('adminToken');
+    const formData = new FormData();
+    files.forEach(file => formData.append('files', file));
+    const response = await fetch(`${API_BASE_URL}/api/admin/upload/bulk`, {
+      method: 'POST',
+      headers: { Authorization: `Bearer ${token}` },
+      body: formData
+    });
+    if (!response.ok) throw new Error('Upload failed');
+    return response.json();
+  }
 }
 
 export const api = new ApiService();
\ No newline at end of file
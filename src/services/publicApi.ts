@@ -1,6 +1,9 @@
 const API_BASE_URL = import.meta.env?.VITE_API_URL || 'http://localhost:8000';
 
 class PublicApiService {
+  // Запрос главной, который уже в пути: Home, Header и SettingsProvider монтируются вместе и делят один ответ
+  private homepageRequest: Promise<any> | null = null;
+
   private async request(endpoint: string, options: RequestInit = {}) {
     const headers: HeadersInit = {
       'Content-Type': 'application/json',
@@ -80,6 +83,22 @@ class PublicApiService {
     return this.request(`/api/products/${id}`);
   }
 
+  // Несколько товаров одним запросом (корзина, избранное): { data, missing }
+  getProductsBatch(ids: string[], fields: string = 'card') {
+    const queryParams = new URLSearchParams({ ids: ids.join(','), fields });
+    return this.request(`/api/products/batch?${queryParams.toString()}`);
+  }
+
+  // Главная страница одним запросом: logo, hero, promoBanner, featuredWatches, heritage, collections, settings
+  getHomepage() {
+    if (!this.homepageRequest) {
+      this.homepageRequest = this.request('/api/content/homepage').finally(() => {
+        this.homepageRequest = null;
+      });
+    }
+    return this.homepageRequest;
+  }
+
   // Filters
   getFilters() {
     return this.request('/api/products/filters');